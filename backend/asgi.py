@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 import django
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 # Setup Django BEFORE importing socket server
@@ -23,7 +24,29 @@ django.setup()
 django_asgi_app = get_asgi_application()
 
 # Import socket server after Django setup
-from sockets.server import sio
+from sockets.server import sio, startup, shutdown
+from sockets.metrics import metrics_app
+
+# Serve socket layer metrics (Prometheus text format) at /metrics
+METRICS_ENABLED = getattr(settings, "LIVE_METRICS_ENABLED", True)
+
+
+async def lifespan(receive, send):
+    """
+    Handle ASGI lifespan events.
+
+    Starts the socket server's background workers (log writer, persistence
+    queue, session reaper) on startup and drains them on shutdown.
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await startup()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
 
 
 # Create combined ASGI application
@@ -33,15 +56,21 @@ async def application(scope, receive, send):
     Django or Socket.IO based on the path.
 
     Socket.IO requests go to /socket.io/
+    /metrics returns the socket layer metrics
+    Lifespan events start/stop the socket server's background workers
     All other requests go to Django
     """
     if scope["type"] == "http":
         path = scope.get("path", "")
         if path.startswith("/socket.io"):
             await sio.handle_request(scope, receive, send)
+        elif METRICS_ENABLED and path == "/metrics":
+            await metrics_app(scope, receive, send)
         else:
             await django_asgi_app(scope, receive, send)
     elif scope["type"] == "websocket":
         await sio.handle_request(scope, receive, send)
+    elif scope["type"] == "lifespan":
+        await lifespan(receive, send)
     else:
         await django_asgi_app(scope, receive, send)
@@ -141,6 +141,81 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Live quiz session store (sockets/managers/store.py)
+# None keeps live sessions in process memory, which limits the socket server
+# to one worker. A Redis URL (e.g. "redis://localhost:6379/0") shares sessions
+# and Socket.IO rooms between workers; requires `pip install redis`.
+LIVE_SESSION_STORE_URL = None
+
+# Session codes (sockets/managers/codes.py) are LIVE_SESSION_CODE_PREFIX
+# followed by LIVE_SESSION_CODE_LENGTH characters of A-Z0-9, allocated
+# without collisions and reused only after the whole space has been used.
+# With a Redis store the pool is shared by every worker. Give each node its
+# own prefix (e.g. "A", "B") when nodes keep separate stores.
+LIVE_SESSION_CODE_LENGTH = 4
+LIVE_SESSION_CODE_PREFIX = ''
+
+# Session reaper (sockets/managers/reaper.py). Every LIVE_SESSION_REAP_INTERVAL
+# seconds, live sessions unchanged for longer than their TTL are persisted if
+# needed and evicted: finished ones after LIVE_SESSION_FINISHED_TTL, ones whose
+# teacher socket is gone after LIVE_SESSION_TEACHERLESS_TTL (single worker
+# only) and any session after LIVE_SESSION_IDLE_TTL. Seconds.
+LIVE_SESSION_REAP_INTERVAL = 60
+LIVE_SESSION_FINISHED_TTL = 600
+LIVE_SESSION_TEACHERLESS_TTL = 120
+LIVE_SESSION_IDLE_TTL = 3600
+
+# Number of topic snapshots (topic + questions + options) kept in the
+# process-wide cache used by teacher:create_session (quizzes/cache.py)
+LIVE_TOPIC_CACHE_SIZE = 256
+
+# Seconds a cached topic snapshot is served before it is checked against
+# Topic.updated_at, i.e. how long other workers may serve a topic after it
+# was edited through a different worker
+LIVE_TOPIC_CACHE_TTL = 30
+
+# Append-only spool for finished sessions waiting to be written to the
+# database (sockets/managers/persistence.py). Replayed on startup.
+LIVE_PERSISTENCE_SPOOL = BASE_DIR / 'var' / 'persistence-spool.jsonl'
+
+# Records that failed with a non-transient database error, or with a
+# transient one LIVE_PERSISTENCE_MAX_ATTEMPTS times, are moved here (JSON
+# lines with the error) instead of being retried forever
+LIVE_PERSISTENCE_DEAD_LETTER = BASE_DIR / 'var' / 'persistence-dead.jsonl'
+LIVE_PERSISTENCE_MAX_ATTEMPTS = 10
+
+# "finish" writes a session to the database once it ends. "incremental"
+# creates it (status running) at start, writes each question's answers when
+# the question closes and only the final totals at the end, so long quizzes
+# keep no answer history in memory and a crash loses at most one question.
+LIVE_PERSISTENCE_MODE = 'finish'
+
+# Socket.IO wire encoding (sockets/utils/serializers.py). "default" sends JSON
+# text frames. "msgpack" sends smaller binary frames and requires
+# `pip install msgpack` on the server and the msgpack parser on every client
+# (socket.io-msgpack-parser); mixed clients cannot connect.
+LIVE_SOCKET_SERIALIZER = 'default'
+
+# Socket server logging (sockets/utils/logs.py). Records are queued on the
+# event loop and written to stdout by a background thread, started and
+# stopped with the ASGI lifespan. LIVE_LOG_QUEUE = False leaves the
+# livequiz.* loggers to LOGGING instead.
+# LIVE_LOG_FORMAT: "text" ("[TAG] message") or "json" (one object per line).
+# LIVE_LOG_SAMPLING keeps 1 in N calls of busy events, e.g.
+# {"student.answer": 100, "student.answer_recorded": 100}.
+# LIVE_SOCKETIO_LOG adds python-socketio/engineio's own per-packet logs
+# (debugging only: one line per packet to every client).
+LIVE_LOG_QUEUE = True
+LIVE_LOG_LEVEL = 'INFO'
+LIVE_LOG_FORMAT = 'text'
+LIVE_LOG_SAMPLING = {}
+LIVE_SOCKETIO_LOG = False
+
+# Serve socket layer metrics (sessions, handler latency, emits, persistence
+# queue, timers) in the Prometheus text format at /metrics (backend/asgi.py).
+# The endpoint is unauthenticated: block it at the proxy or disable it here.
+LIVE_METRICS_ENABLED = True
+
 # Django REST framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
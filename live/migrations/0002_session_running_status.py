@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('live', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='session',
+            name='status',
+            field=models.CharField(choices=[('running', 'Running'), ('finished', 'Finished'), ('cancelled', 'Cancelled')], default='finished', max_length=20),
+        ),
+    ]
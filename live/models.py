@@ -8,9 +8,11 @@ from quizzes.models import Topic, Question, AnswerOption
 class Session(models.Model):
     """
     Persisted quiz session.
-    Created when teacher finishes a live session.
+    Created when teacher finishes a live session, or when it starts if the
+    socket server persists incrementally (status stays running until finish).
     """
     class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
         FINISHED = 'finished', 'Finished'
         CANCELLED = 'cancelled', 'Cancelled'
 
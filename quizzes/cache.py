@@ -0,0 +1,250 @@
+"""
+Process-wide cache of topic snapshots for the live quiz server.
+
+A snapshot is the topic's fields plus every question with its options,
+exactly what teacher:create_session needs. Snapshots are shared between
+sessions and must be treated as read-only.
+
+The REST editors call invalidate() after changing a topic, its questions
+or their options, which bumps the topic's version so a load that started
+before the edit is not cached, and touches Topic.updated_at. Other worker
+processes notice the edit through that timestamp: a snapshot is trusted
+for `ttl` seconds, then get() compares updated_at with the value it was
+loaded at and reloads the topic if it changed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+
+
+def _topic_stamp(topic_id: int) -> Any:
+    """Return the topic's updated_at (None if the topic is gone)."""
+    from .models import Topic
+
+    return Topic.objects.filter(pk=topic_id).values_list("updated_at", flat=True).first()
+
+
+def _touch_topic(topic_id: int) -> None:
+    """Bump the topic's updated_at so every worker revalidates its snapshot."""
+    from django.utils import timezone
+
+    from .models import Topic
+
+    Topic.objects.filter(pk=topic_id).update(updated_at=timezone.now())
+
+
+class TopicCache:
+    """
+    Thread-safe LRU of topic snapshots with single-flight loading.
+
+    Concurrent get() calls for the same missing topic share one load: the
+    first caller runs the loader, the others wait for its result.
+
+    Snapshots older than `ttl` seconds are revalidated by get() (peek()
+    treats them as missing): `stamp(topic_id)` is compared with the value
+    read before the snapshot was loaded, and the topic is reloaded if it
+    changed. Without `stamp`, old snapshots are simply reloaded.
+    invalidate() calls `touch(topic_id)` so that the stamp changes for
+    every process sharing the database.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 30.0,
+        stamp: Optional[Callable[[int], Any]] = None,
+        touch: Optional[Callable[[int], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stamp = stamp
+        self.touch = touch
+        self._entries: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._validated: dict[int, tuple[float, Any]] = {}  # topic_id -> (time.monotonic(), stamp)
+        self._versions: dict[int, int] = {}
+        self._loading: dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # misses that waited on another caller's load
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0  # stamp checks of snapshots older than ttl
+        self.stale = 0  # revalidations that found the topic changed
+
+    def _fresh(self, topic_id: int) -> bool:
+        """Whether a cached snapshot was validated within ttl (caller holds the lock)."""
+        validated = self._validated.get(topic_id)
+        return validated is not None and time.monotonic() - validated[0] < self.ttl
+
+    def _drop(self, topic_id: int) -> None:
+        """Forget a cached snapshot (caller holds the lock)."""
+        self._entries.pop(topic_id, None)
+        self._validated.pop(topic_id, None)
+
+    def _revalidate(self, topic_id: int, snapshot: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Check an old snapshot against the topic's stamp.
+
+        Returns:
+            The snapshot if the topic is unchanged, None if it must be reloaded
+        """
+        current = self.stamp(topic_id) if self.stamp is not None else None
+        with self._lock:
+            self.revalidations += 1
+            validated = self._validated.get(topic_id)
+            if (
+                self.stamp is not None
+                and current is not None
+                and self._entries.get(topic_id) is snapshot
+                and validated is not None
+                and validated[1] == current
+            ):
+                self._validated[topic_id] = (time.monotonic(), current)
+                self._entries.move_to_end(topic_id)
+                self.hits += 1
+                return snapshot
+            self.stale += 1
+            if self._entries.get(topic_id) is snapshot:
+                self._drop(topic_id)
+            return None
+
+    def peek(self, topic_id: int) -> Optional[dict[str, Any]]:
+        """
+        Return a cached snapshot without loading (counts as a hit if found).
+
+        Never touches the database, so snapshots due for revalidation are
+        treated as missing.
+
+        Args:
+            topic_id: Topic ID
+
+        Returns:
+            Snapshot if cached and validated within ttl, None otherwise
+        """
+        with self._lock:
+            snapshot = self._entries.get(topic_id)
+            if snapshot is None or not self._fresh(topic_id):
+                return None
+            self._entries.move_to_end(topic_id)
+            self.hits += 1
+            return snapshot
+
+    def get(
+        self,
+        topic_id: int,
+        loader: Callable[[int], Optional[dict[str, Any]]],
+    ) -> Optional[dict[str, Any]]:
+        """
+        Return the snapshot for a topic, loading it on a miss.
+
+        Blocking: may query the topic's stamp or run the loader.
+
+        Args:
+            topic_id: Topic ID
+            loader: Blocking function building the snapshot (None if not found)
+
+        Returns:
+            Snapshot, or None if the loader found no such topic
+        """
+        with self._lock:
+            snapshot = self._entries.get(topic_id)
+            if snapshot is not None and self._fresh(topic_id):
+                self._entries.move_to_end(topic_id)
+                self.hits += 1
+                return snapshot
+
+        if snapshot is not None:
+            snapshot = self._revalidate(topic_id, snapshot)
+            if snapshot is not None:
+                return snapshot
+
+        with self._lock:
+            self.misses += 1
+            future = self._loading.get(topic_id)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._loading[topic_id] = future
+                version = self._versions.get(topic_id, 0)
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            # Read before loading: an edit made during the load changes it again
+            stamp = self.stamp(topic_id) if self.stamp is not None else None
+            snapshot = loader(topic_id)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(topic_id, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._loading.pop(topic_id, None)
+            # Only cache if no edit happened while we were loading
+            if snapshot is not None and self._versions.get(topic_id, 0) == version:
+                snapshot["version"] = version
+                self._entries[topic_id] = snapshot
+                self._validated[topic_id] = (time.monotonic(), stamp)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._validated.pop(evicted, None)
+                    self.evictions += 1
+
+        future.set_result(snapshot)
+        return snapshot
+
+    def invalidate(self, topic_id: int) -> None:
+        """
+        Drop a topic's snapshot, bump its version and touch its stamp.
+
+        Args:
+            topic_id: Topic ID whose content changed
+        """
+        if self.touch is not None:
+            self.touch(topic_id)
+        with self._lock:
+            self._versions[topic_id] = self._versions.get(topic_id, 0) + 1
+            self._drop(topic_id)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached snapshot."""
+        with self._lock:
+            for topic_id in self._entries:
+                self._versions[topic_id] = self._versions.get(topic_id, 0) + 1
+            self._entries.clear()
+            self._validated.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "revalidations": self.revalidations,
+                "stale": self.stale,
+            }
+
+
+topic_cache = TopicCache(
+    getattr(settings, "LIVE_TOPIC_CACHE_SIZE", 256),
+    ttl=getattr(settings, "LIVE_TOPIC_CACHE_TTL", 30),
+    stamp=_topic_stamp,
+    touch=_touch_topic,
+)
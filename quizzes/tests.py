@@ -1,3 +1,134 @@
-from django.test import TestCase
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.models import User
+from .cache import TopicCache, topic_cache
+from .models import AnswerOption, Question, Topic
+from .views import QuestionDeleteView, QuestionUpdateAPIView, TopicDetailView
+
+
+class TopicCacheTests(SimpleTestCase):
+    """Snapshots edited through another process are picked up after the TTL."""
+
+    def setUp(self):
+        self.stamps = {1: 0}
+        self.loads = 0
+        self.cache = TopicCache(ttl=60, stamp=self.stamps.get)
+
+    def loader(self, topic_id):
+        self.loads += 1
+        return {"topic": {"id": topic_id, "stamp": self.stamps[topic_id]}}
+
+    def expire(self):
+        for topic_id, (_, stamp) in self.cache._validated.items():
+            self.cache._validated[topic_id] = (float("-inf"), stamp)
+
+    def test_fresh_snapshot_is_served_without_a_check(self):
+        self.cache.get(1, self.loader)
+        self.stamps[1] = 1  # edited elsewhere, within the TTL
+        self.assertEqual(self.cache.get(1, self.loader)["topic"]["stamp"], 0)
+        self.assertEqual(self.cache.peek(1)["topic"]["stamp"], 0)
+        self.assertEqual(self.cache.revalidations, 0)
+
+    def test_unchanged_topic_is_revalidated(self):
+        self.cache.get(1, self.loader)
+        self.expire()
+        self.assertIsNone(self.cache.peek(1))
+        self.assertEqual(self.cache.get(1, self.loader)["topic"]["stamp"], 0)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual((self.cache.revalidations, self.cache.stale), (1, 0))
+        self.assertIsNotNone(self.cache.peek(1))
+
+    def test_edited_topic_is_reloaded(self):
+        self.cache.get(1, self.loader)
+        self.stamps[1] = 1
+        self.expire()
+        self.assertEqual(self.cache.get(1, self.loader)["topic"]["stamp"], 1)
+        self.assertEqual(self.loads, 2)
+        self.assertEqual((self.cache.revalidations, self.cache.stale), (1, 1))
+
+    def test_invalidate_touches_the_stamp(self):
+        touched = []
+        cache = TopicCache(stamp=self.stamps.get, touch=touched.append)
+        cache.get(1, self.loader)
+        cache.invalidate(1)
+        self.assertEqual(touched, [1])
+        self.assertIsNone(cache.peek(1))
+
+    def test_concurrent_misses_share_one_load(self):
+        release = threading.Event()
+
+        def loader(topic_id):
+            release.wait(5)
+            return self.loader(topic_id)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get(1, loader))) for _ in range(2)]
+        threads[0].start()
+        while not self.cache._loading:
+            release.wait(0.001)
+        threads[1].start()
+        while self.cache.coalesced < 1:
+            release.wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loads, 1)
+        self.assertIs(results[0], results[1])
+        self.assertEqual((self.cache.misses, self.cache.coalesced), (2, 1))
+
+
+class TopicCacheInvalidationTests(TestCase):
+    """Every REST edit of a topic's content invalidates its snapshot exactly once."""
+
+    def setUp(self):
+        self.teacher = User.objects.create_user("teacher@example.com", "secret")
+        self.topic = Topic.objects.create(teacher=self.teacher, title="Topic")
+        self.question = Question.objects.create(topic=self.topic, text="Question")
+        self.options = AnswerOption.objects.bulk_create(
+            [AnswerOption(question=self.question, text=f"Option {i}", is_correct=i == 0) for i in range(4)]
+        )
+        self.factory = APIRequestFactory()
+        patcher = mock.patch.object(topic_cache, "invalidate")
+        self.invalidate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call(self, view, method, data=None, **kwargs):
+        request = getattr(self.factory, method)("/", data, format="json")
+        force_authenticate(request, user=self.teacher)
+        return view.as_view()(request, **kwargs)
+
+    def patch_question(self, options):
+        return self.call(
+            QuestionUpdateAPIView, "patch",
+            {"topic_id": self.topic.id, "text": "Edited", "options": options},
+            pk=self.question.pk,
+        )
+
+    def test_question_update(self):
+        options = [{"id": o.id, "text": f"New {o.id}", "is_correct": o.is_correct} for o in self.options]
+        response = self.patch_question(options)
+        self.assertEqual(response.status_code, 200)
+        self.invalidate.assert_called_once_with(self.topic.id)
+        self.assertEqual(AnswerOption.objects.get(pk=self.options[0].pk).text, f"New {self.options[0].id}")
+
+    def test_rejected_question_update_saves_nothing(self):
+        options = [{"id": o.id, "text": "x", "is_correct": o.is_correct} for o in self.options[:3]]
+        options.append({"id": 999, "text": "x", "is_correct": False})
+        response = self.patch_question(options)
+        self.assertEqual(response.status_code, 400)
+        self.invalidate.assert_not_called()
+        self.assertEqual(Question.objects.get(pk=self.question.pk).text, "Question")
+
+    def test_topic_update_and_deletes(self):
+        response = self.call(TopicDetailView, "patch", {"title": "Renamed"}, pk=self.topic.pk)
+        self.assertEqual(response.status_code, 200)
+        response = self.call(QuestionDeleteView, "delete", pk=self.question.pk)
+        self.assertEqual(response.status_code, 200)
+        response = self.call(TopicDetailView, "delete", pk=self.topic.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.invalidate.call_args_list, [mock.call(self.topic.id)] * 3)
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from backend.responses import StandardResponseMixin
+from .cache import topic_cache
 from .models import AnswerOption, Question, Topic
 from .serializers import (
     AnswerOptionSerializer,
@@ -33,12 +34,18 @@ class TopicDetailView(StandardResponseMixin, generics.RetrieveUpdateDestroyAPIVi
     serializer_class = TopicSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def perform_update(self, serializer):
+        topic = serializer.save()
+        topic_cache.invalidate(topic.id)
+
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
         except Http404:
             return Response({"message": "Topic not found"}, status=status.HTTP_404_NOT_FOUND)
+        topic_id = instance.id
         self.perform_destroy(instance)
+        topic_cache.invalidate(topic_id)
         return Response({"message": "Topic deleted"}, status=status.HTTP_200_OK)
 
 
@@ -59,6 +66,7 @@ class QuestionCreateAPIView(StandardResponseMixin, APIView):
             )
 
         question = serializer.save(topic=topic)
+        topic_cache.invalidate(topic.id)
         response_data = QuestionCreateSerializer(question).data
         return Response(response_data, status=status.HTTP_201_CREATED)
 
@@ -72,7 +80,9 @@ class QuestionDeleteView(StandardResponseMixin, generics.DestroyAPIView):
             instance = self.get_object()
         except Http404:
             return Response({"message": "Question not found"}, status=status.HTTP_404_NOT_FOUND)
+        topic_id = instance.topic_id
         self.perform_destroy(instance)
+        topic_cache.invalidate(topic_id)
         return Response({"message": "Question deleted"}, status=status.HTTP_200_OK)
 
 
@@ -88,7 +98,9 @@ class AnswerOptionDeleteView(StandardResponseMixin, generics.DestroyAPIView):
             instance = self.get_object()
         except Http404:
             return Response({"message": "Answer option not found"}, status=status.HTTP_404_NOT_FOUND)
+        topic_id = instance.question.topic_id
         self.perform_destroy(instance)
+        topic_cache.invalidate(topic_id)
         return Response({"message": "Option deleted"}, status=status.HTTP_200_OK)
 
 
@@ -116,29 +128,32 @@ class QuestionUpdateAPIView(StandardResponseMixin, APIView):
         if data.get("topic_id") != question.topic_id:
             return Response({"message": "Question not found in this topic"}, status=status.HTTP_404_NOT_FOUND)
 
+        # Check every option before saving anything, so a 400 leaves the question untouched
+        opt_map = {o.id: o for o in question.options.all()}
+        for opt in data.get("options", []):
+            opt_id = opt.get("id")
+            if opt_id not in opt_map:
+                return Response(
+                    {"message": f"Option {opt_id} does not belong to question {question.id}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         if "text" in data:
             question.text = data["text"]
         if "order_index" in data:  # allow forward compatibility if sent
             question.order_index = data["order_index"]
         question.save()
 
-        if "options" in data:
-            # Update existing options by id; do not create/delete
-            opt_map = {o.id: o for o in question.options.all()}
-            for opt in data["options"]:
-                opt_id = opt.get("id")
-                if opt_id not in opt_map:
-                    return Response(
-                        {"message": f"Option {opt_id} does not belong to question {question.id}."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-            for opt in data["options"]:
-                o = opt_map[opt["id"]]
-                if "text" in opt:
-                    o.text = opt["text"]
-                if "is_correct" in opt:
-                    o.is_correct = opt["is_correct"]
-                o.save()
+        # Update existing options by id; do not create/delete
+        for opt in data.get("options", []):
+            o = opt_map[opt["id"]]
+            if "text" in opt:
+                o.text = opt["text"]
+            if "is_correct" in opt:
+                o.is_correct = opt["is_correct"]
+            o.save()
+
+        topic_cache.invalidate(question.topic_id)
 
         return Response(QuestionSerializer(question).data, status=status.HTTP_200_OK)
 
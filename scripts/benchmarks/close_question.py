@@ -0,0 +1,110 @@
+"""
+Benchmark close_question latency against room size.
+
+Socket emits are replaced with a coroutine that sleeps for --emit-latency-us,
+standing in for the per-packet transport round trip. Each room size is run
+once with FANOUT_CONCURRENCY=1 (the old one-emit-at-a-time behaviour) and once
+with the configured concurrency.
+
+Usage:
+    python scripts/benchmarks/close_question.py --sizes 50 500 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import percentile, print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark close_question fan-out")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=5, help="Closes per room size")
+    parser.add_argument("--emit-latency-us", type=int, default=200, help="Simulated cost per emit")
+    return parser.parse_args()
+
+
+async def build_session(server, students: int) -> str:
+    """Create a running session with every student having answered."""
+    SessionManager = server.SessionManager
+    question = {
+        "id": 1,
+        "text": "Question",
+        "options": [{"id": option_id, "text": f"Option {option_id}"} for option_id in range(1, 5)],
+        "correct_option_id": 1,
+    }
+    session = await SessionManager.create_session(
+        topic_id=1,
+        teacher_sid="teacher",
+        time_per_question=20,
+        question_ids=[1],
+        questions={1: question},
+    )
+    session_id = session["session_id"]
+    for i in range(students):
+        await SessionManager.add_student(session_id, f"sid-{i}", f"Student {i}")
+    await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+    await server.QuestionManager.open_question(session_id, 1)
+    for i in range(students):
+        await SessionManager.record_answer(session_id, f"sid-{i}", 1 + i % 4)
+    return session_id
+
+
+async def time_close(server, students: int, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        session_id = await build_session(server, students)
+        start = time.perf_counter()
+        await server.close_question(session_id)
+        samples.append((time.perf_counter() - start) * 1000)
+        await server.SessionManager.delete_session(session_id)
+    return samples
+
+
+async def run(args) -> list[list[str]]:
+    from sockets import server
+    from sockets.utils.logs import configure_logging
+
+    # Only the close path is timed, not the log output
+    configure_logging("WARNING")
+
+    latency = args.emit_latency_us / 1_000_000
+
+    async def fake_emit(event, data=None, to=None, room=None, **kwargs):
+        await asyncio.sleep(latency)
+
+    server.sio.emit = fake_emit
+    concurrency = server.FANOUT_CONCURRENCY
+
+    rows = []
+    for size in args.sizes:
+        server.FANOUT_CONCURRENCY = 1
+        sequential = await time_close(server, size, args.repeat)
+        server.FANOUT_CONCURRENCY = concurrency
+        concurrent = await time_close(server, size, args.repeat)
+
+        seq_p50 = percentile(sequential, 50)
+        con_p50 = percentile(concurrent, 50)
+        rows.append([
+            size,
+            f"{seq_p50:.2f}",
+            f"{con_p50:.2f}",
+            f"{percentile(concurrent, 95):.2f}",
+            f"{seq_p50 / con_p50:.1f}x" if con_p50 else "-",
+        ])
+    return rows
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+
+    rows = asyncio.run(run(args))
+    print(f"close_question latency (ms), simulated emit cost {args.emit_latency_us}us")
+    print_table(["students", "sequential p50", "concurrent p50", "concurrent p95", "speedup"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run offline: they import the socket managers directly and
+replace network I/O with in-process stand-ins.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def setup_path() -> None:
+    """Make the project packages importable when run as a script."""
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def setup_django() -> None:
+    """Configure Django with the project settings."""
+    setup_path()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import django
+
+    django.setup()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> list[float]:
+    """Run func `repeat` times and return wall times in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def print_table(headers: list[str], rows: Iterable[Iterable[Any]]) -> None:
+    """Print rows as a fixed-width text table."""
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [
+        max(len(headers[i]), *(len(row[i]) for row in rows)) if rows else len(headers[i])
+        for i in range(len(headers))
+    ]
+    print("  ".join(h.rjust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(cell.rjust(w) for cell, w in zip(row, widths)))
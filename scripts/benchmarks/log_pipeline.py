@@ -0,0 +1,147 @@
+"""
+Benchmark the event-loop cost of logging one burst of student answers.
+
+Every answer logs two lines ("Answer from ..." and "Answer recorded ...").
+For each room size the time spent on the calling thread is measured for:
+
+- print+flush: the previous print(..., flush=True) to the output file
+- print: print() without flush
+- sync handler: a plain logging.StreamHandler on the calling thread
+- queue: sockets.utils.logs (formatting and writes on a listener thread)
+- queue, sampled: the same with both events sampled 1 in 100
+- queue, filtered: the calls made at DEBUG while the level is INFO
+
+Two outputs are used:
+
+- file: a local file, so every write is a system call
+- pipe: a pipe drained at --pipe-rate bytes/s, like stdout read by a busy
+  container log collector; writes block once the pipe buffer is full
+
+Usage:
+    python scripts/benchmarks/log_pipeline.py --sizes 100 1000 5000 --pipe-rate 4000000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from common import measure, percentile, print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark print() against the queued logger")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", default=None, help="Log file (a temporary file by default)")
+    parser.add_argument("--pipe-rate", type=int, default=4_000_000, help="Pipe reader bytes/s")
+    return parser.parse_args()
+
+
+def open_pipe(rate: int):
+    """A text stream into a pipe whose reader drains `rate` bytes per second."""
+    read_fd, write_fd = os.pipe()
+    chunk = 4096
+
+    def drain():
+        with os.fdopen(read_fd, "rb") as reader:
+            while reader.read1(chunk):
+                time.sleep(chunk / rate)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return os.fdopen(write_fd, "w", buffering=8192), thread
+
+
+def run_target(out, sizes: list[int], repeat: int) -> list[list]:
+    """Time every logging mode writing to `out`."""
+    from sockets.utils.logs import configure_logging, get_logger, stop_logging
+
+    data = {"session_id": "AB12", "option_id": 18}
+
+    def burst_print(size: int, flush: bool):
+        for i in range(size):
+            print(f"[STUDENT] Answer from sid-{i}: {data}", file=out, flush=flush)
+            print(f"[STUDENT] Answer recorded: {i + 1}/{size}", file=out, flush=flush)
+
+    sync_logger = logging.getLogger("bench.sync")
+    sync_logger.handlers.clear()
+    sync_handler = logging.StreamHandler(out)
+    sync_handler.setFormatter(logging.Formatter("[STUDENT] %(message)s"))
+    sync_logger.addHandler(sync_handler)
+    sync_logger.setLevel(logging.INFO)
+    sync_logger.propagate = False
+
+    def burst_sync(size: int):
+        for i in range(size):
+            sync_logger.info("Answer from %s: %s", f"sid-{i}", data)
+            sync_logger.info("Answer recorded: %s/%s", i + 1, size)
+
+    log = get_logger("STUDENT")
+
+    def burst_queue(size: int, level: int = logging.INFO):
+        call = log.info if level == logging.INFO else log.debug
+        for i in range(size):
+            call("Answer from %s: %s", f"sid-{i}", data, event="student.answer")
+            call("Answer recorded: %s/%s", i + 1, size, event="student.answer_recorded")
+
+    sampling = {"student.answer": 100, "student.answer_recorded": 100}
+    modes = [
+        ("print+flush", None, lambda n: burst_print(n, True)),
+        ("print", None, lambda n: burst_print(n, False)),
+        ("sync handler", None, burst_sync),
+        ("queue", {}, burst_queue),
+        ("queue, sampled", sampling, burst_queue),
+        ("queue, filtered", {}, lambda n: burst_queue(n, logging.DEBUG)),
+    ]
+
+    rows = []
+    for size in sizes:
+        baseline = None
+        for name, queue_sampling, burst in modes:
+            if queue_sampling is not None:
+                configure_logging("INFO", sampling=queue_sampling, stream=out)
+            samples = measure(lambda: burst(size), repeat)
+            # Write out everything queued or buffered outside the timed region
+            if queue_sampling is not None:
+                stop_logging()
+            out.flush()
+
+            p50 = percentile(samples, 50)
+            baseline = baseline or p50
+            rows.append([
+                size,
+                name,
+                f"{p50:.2f}",
+                f"{p50 * 1000 / (2 * size):.2f}",
+                f"{baseline / p50:.1f}x" if p50 else "-",
+            ])
+    return rows
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+
+    path = args.output or os.path.join(tempfile.mkdtemp(), "bench.log")
+    headers = ["answers", "mode", "burst ms", "us/call", "vs print+flush"]
+
+    with open(path, "a", buffering=8192) as out:
+        rows = run_target(out, args.sizes, args.repeat)
+    print(f"file output ({path}): loop-side cost per burst of answers, p50 of {args.repeat}")
+    print_table(headers, rows)
+
+    out, reader = open_pipe(args.pipe_rate)
+    rows = run_target(out, args.sizes, args.repeat)
+    out.close()
+    reader.join()
+    print()
+    print(f"pipe output drained at {args.pipe_rate} B/s: loop-side cost per burst, p50 of {args.repeat}")
+    print_table(headers, rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
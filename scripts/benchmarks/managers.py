@@ -0,0 +1,348 @@
+"""
+Micro-benchmarks for the sockets.managers hot paths, with a stored baseline.
+
+Every case runs at each room size (--sizes) against a fresh in-memory
+session store and code allocator:
+
+- session.generate_session_id: one new code with `size` sessions active
+- session.create_session: one session with `size` sessions active
+- session.record_answer: one answer in a room of `size` students
+- session.all_students_answered: one check in a full room
+- session.get_student_list: the roster of the room
+- ranking.rank_players: the full ranked board
+- ranking.build_quiz_finished_payload: winners + scoreboard
+- question.build_answer_result: one student's result at close (with their
+  compact ranking), as built by close_question; the standings they come
+  from are rebuilt on every run and spread over the room
+
+Times are microseconds per operation, p50 (and p95) of --repeat samples.
+--save writes them to a JSON baseline; --compare reads one and exits with
+status 1 if any case got slower by more than --tolerance.
+
+scripts/benchmarks/managers-baseline.json is the committed reference
+baseline (--repeat 100). It records the machine it was taken on; to gate a
+branch, save a local baseline from main on the machine that runs the check
+and compare against that.
+
+Usage:
+    # Refresh the committed baseline (on main)
+    python scripts/benchmarks/managers.py --repeat 100 --save scripts/benchmarks/managers-baseline.json
+
+    # Before deploying a branch
+    python scripts/benchmarks/managers.py --save managers-local.json       # on main
+    python scripts/benchmarks/managers.py --compare managers-local.json    # on the branch
+
+    # A subset of cases and sizes
+    python scripts/benchmarks/managers.py --cases ranking --sizes 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from common import percentile, print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the session, ranking and question managers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1000, 10000],
+                        help="Room sizes (active sessions for the session ID cases)")
+    parser.add_argument("--repeat", type=int, default=30, help="Samples per case and size")
+    parser.add_argument("--cases", nargs="+", default=None, help="Run only cases containing these strings")
+    parser.add_argument("--save", metavar="PATH", help="Write the results to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results with a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+# A case is built for one size and returns (run, reset, ops): run() does
+# `ops` operations and is timed, reset() restores the state untimed. Both
+# are coroutine functions, since the session manager is async.
+Case = tuple[Callable[[], Awaitable[Any]], Optional[Callable[[], Awaitable[Any]]], int]
+
+QUESTIONS = 20
+BATCH = 1000  # Operations per sample for the constant-time cases
+
+
+async def fill_store(count: int) -> None:
+    """Add `count` waiting sessions to the store."""
+    from sockets.managers import SessionManager
+
+    for i in range(count):
+        await SessionManager.create_session(1, f"teacher-{i}", 30, list(range(QUESTIONS)))
+
+
+async def make_room(size: int, rng: random.Random) -> dict[str, Any]:
+    """A running session with `size` students, a spread of scores and an open question."""
+    from sockets.managers import SessionManager
+
+    session = await SessionManager.create_session(1, "teacher", 30, list(range(QUESTIONS)))
+    session_id = session["session_id"]
+    for i in range(size):
+        await SessionManager.add_student(session_id, f"sid-{i}", f"Student {i}")
+    for sid in session["students"]:
+        await SessionManager.update_student_score(session_id, sid, 100 * rng.randint(0, QUESTIONS))
+    await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+    open_question(session)
+    return session
+
+
+def open_question(session: dict[str, Any]) -> None:
+    """Start question 0 with options 1-4 and no answers yet."""
+    from sockets.managers import QuestionManager
+
+    QuestionManager.setup_question(session, 0)
+    session["option_counts"] = {option_id: 0 for option_id in range(1, 5)}
+
+
+async def case_generate_session_id(size: int, rng: random.Random) -> Case:
+    from sockets.managers import SessionManager
+
+    await fill_store(size)
+    allocated: list[str] = []
+
+    async def run():
+        for _ in range(BATCH):
+            allocated.append(await SessionManager.generate_session_id())
+
+    async def reset():
+        for code in allocated:
+            await SessionManager.codes.release(code)
+        allocated.clear()
+
+    return run, reset, BATCH
+
+
+async def case_create_session(size: int, rng: random.Random) -> Case:
+    from sockets.managers import SessionManager
+
+    await fill_store(size)
+    question_ids = list(range(QUESTIONS))
+    created: list[str] = []
+
+    async def run():
+        for i in range(100):
+            created.append((await SessionManager.create_session(1, f"bench-{i}", 30, question_ids))["session_id"])
+
+    async def reset():
+        for session_id in created:
+            await SessionManager.delete_session(session_id)
+        created.clear()
+
+    return run, reset, 100
+
+
+async def case_record_answer(size: int, rng: random.Random) -> Case:
+    from sockets.managers import SessionManager
+
+    session = await make_room(size, rng)
+    session_id = session["session_id"]
+    answers = [(sid, rng.randint(1, 4)) for sid in session["students"]]
+
+    async def run():
+        for sid, option_id in answers:
+            await SessionManager.record_answer(session_id, sid, option_id)
+
+    async def reset():
+        open_question(session)
+
+    return run, reset, size
+
+
+async def case_all_students_answered(size: int, rng: random.Random) -> Case:
+    from sockets.managers import SessionManager
+
+    session = await make_room(size, rng)
+    session_id = session["session_id"]
+    for sid in session["students"]:
+        await SessionManager.record_answer(session_id, sid, rng.randint(1, 4))
+
+    async def run():
+        for _ in range(BATCH):
+            await SessionManager.all_students_answered(session_id)
+
+    return run, None, BATCH
+
+
+async def case_get_student_list(size: int, rng: random.Random) -> Case:
+    from sockets.managers import SessionManager
+
+    session_id = (await make_room(size, rng))["session_id"]
+
+    async def run():
+        await SessionManager.get_student_list(session_id)
+
+    return run, None, 1
+
+
+async def case_rank_players(size: int, rng: random.Random) -> Case:
+    from sockets.managers import RankingManager
+
+    session = await make_room(size, rng)
+
+    async def run():
+        RankingManager.rank_players(session["students"], session["leaderboard"])
+
+    return run, None, 1
+
+
+async def case_build_quiz_finished_payload(size: int, rng: random.Random) -> Case:
+    from sockets.managers import RankingManager
+
+    session = await make_room(size, rng)
+
+    async def run():
+        RankingManager.build_quiz_finished_payload(session["students"], session["leaderboard"])
+
+    return run, None, 1
+
+
+async def case_build_answer_result(size: int, rng: random.Random) -> Case:
+    from sockets.managers import QuestionManager, RankingManager
+
+    session = await make_room(size, rng)
+    students = session["students"]
+    answers = {sid: rng.choice([1, 2, 3, 4, None]) for sid in students}
+
+    async def run():
+        standings = RankingManager.build_standings(students, session["leaderboard"])
+        top = standings.top(RankingManager.TOP_K)
+        for sid in students:
+            correct = answers[sid] == 1
+            QuestionManager.build_answer_result(
+                correct=correct,
+                correct_option_id=1,
+                student_answer=answers[sid],
+                score_delta=QuestionManager.POINTS_CORRECT if correct else 0,
+                score_total=students.score(sid),
+                ranking=RankingManager.build_student_ranking(top, standings[sid], len(standings)),
+            )
+
+    return run, None, size
+
+
+CASES = {
+    "session.generate_session_id": case_generate_session_id,
+    "session.create_session": case_create_session,
+    "session.record_answer": case_record_answer,
+    "session.all_students_answered": case_all_students_answered,
+    "session.get_student_list": case_get_student_list,
+    "ranking.rank_players": case_rank_players,
+    "ranking.build_quiz_finished_payload": case_build_quiz_finished_payload,
+    "question.build_answer_result": case_build_answer_result,
+}
+
+
+def run_case(build: Callable[[int, random.Random], Awaitable[Case]], size: int, repeat: int, seed: int) -> list[float]:
+    """Run one case at one size in a fresh store. Returns us/op samples."""
+    return asyncio.run(_run_case(build, size, repeat, seed))
+
+
+async def _run_case(build: Callable[[int, random.Random], Awaitable[Case]], size: int, repeat: int, seed: int) -> list[float]:
+    from sockets.managers import CodeAllocator, MemorySessionStore, SessionManager
+
+    previous = SessionManager.store, SessionManager.codes
+    SessionManager.configure_store(MemorySessionStore())
+    SessionManager.configure_codes(CodeAllocator(seed=seed))
+    try:
+        run, reset, ops = await build(size, random.Random(seed))
+        if reset:
+            await reset()
+        await run()  # Warm-up
+        samples = []
+        for _ in range(repeat):
+            if reset:
+                await reset()
+            start = time.perf_counter()
+            await run()
+            samples.append((time.perf_counter() - start) * 1e6 / ops)
+        return samples
+    finally:
+        SessionManager.configure_store(previous[0])
+        SessionManager.configure_codes(previous[1])
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: str, results: dict[str, float], args: argparse.Namespace) -> None:
+    baseline = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "unit": "us/op (p50)",
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+    from sockets.utils.logs import configure_logging
+
+    configure_logging("WARNING")
+
+    names = [
+        name for name in CASES
+        if not args.cases or any(pattern in name for pattern in args.cases)
+    ]
+    if not names:
+        print(f"No cases match {args.cases}; available: {', '.join(CASES)}")
+        return 1
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results: dict[str, float] = {}
+    regressions = []
+    rows = []
+    for name in names:
+        for size in args.sizes:
+            key = f"{name}[{size}]"
+            samples = run_case(CASES[name], size, args.repeat, args.seed)
+            p50 = percentile(samples, 50)
+            results[key] = round(p50, 4)
+
+            row = [name, size, f"{p50:.2f}", f"{percentile(samples, 95):.2f}"]
+            if args.compare:
+                before = baseline.get(key)
+                if before:
+                    change = p50 / before - 1
+                    flag = " !" if change > args.tolerance else ""
+                    row += [f"{before:.2f}", f"{change:+.0%}{flag}"]
+                    if flag:
+                        regressions.append((key, before, p50))
+                else:
+                    row += ["-", "new"]
+            rows.append(row)
+
+    headers = ["case", "size", "p50 us/op", "p95 us/op"]
+    if args.compare:
+        headers += ["baseline", "change"]
+    print(f"p50/p95 of {args.repeat} samples, Python {platform.python_version()}")
+    print_table(headers, rows)
+
+    if args.save:
+        save_baseline(args.save, results, args)
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.tolerance:.0%}:")
+        for key, before, after in regressions:
+            print(f"  {key}: {before:.2f} -> {after:.2f} us/op")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,221 @@
+"""
+Benchmark persist_session: row-by-row INSERTs vs. bulk inserts.
+
+Seeds a topic with --questions questions and builds a finished in-memory
+session with --students students who answered every question. Both paths
+write to the configured database inside a transaction that is rolled back,
+so the database is left unchanged.
+
+Point DJANGO_SETTINGS_MODULE at a settings module with a scratch database
+if the default one should not be touched.
+
+Usage:
+    python scripts/benchmarks/persist_session.py --students 200 --questions 30
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from common import print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark persist_session")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def seed(questions: int):
+    """Create a teacher, topic and questions with 4 options each."""
+    from quizzes.models import AnswerOption, Question, Topic
+    from users.models import User
+
+    teacher = User.objects.create_user(
+        email=f"bench-{time.time_ns()}@example.com",
+        password="bench",
+        first_name="Bench",
+        last_name="Teacher",
+    )
+    topic = Topic.objects.create(teacher=teacher, title="Benchmark topic", question_timer=20)
+
+    correct = {}
+    for i in range(questions):
+        question = Question.objects.create(topic=topic, text=f"Question {i}", order_index=i)
+        options = AnswerOption.objects.bulk_create([
+            AnswerOption(question=question, text=f"Option {j}", is_correct=(j == 0))
+            for j in range(4)
+        ])
+        correct[question.id] = [option.id for option in options]
+    return topic, correct
+
+
+def build_session(topic, correct: dict[int, list[int]], students: int) -> dict:
+    """Build a finished session in the previous per-student answer shape."""
+    rng = random.Random(42)
+    session = {
+        "session_id": "BNCH",
+        "topic_id": topic.id,
+        "time_per_question": 20,
+        "started_at": datetime.utcnow(),
+        "answered_questions": [
+            {"question_id": q_id, "correct_option_id": options[0]}
+            for q_id, options in correct.items()
+        ],
+        "students": {},
+        "student_answers": {},
+    }
+    for i in range(students):
+        sid = f"sid-{i}"
+        answers = {}
+        for q_id, options in correct.items():
+            option_id = rng.choice(options)
+            answers[q_id] = {
+                "option_id": option_id,
+                "is_correct": option_id == options[0],
+                "answered_at": datetime.utcnow(),
+                "response_time_ms": rng.randint(500, 20000),
+            }
+        session["students"][sid] = {
+            "name": f"Student {i}",
+            "score": 20 * sum(a["is_correct"] for a in answers.values()),
+        }
+        session["student_answers"][sid] = answers
+    return session
+
+
+def columnar_session(session: dict) -> dict:
+    """The same session as a decoded spool record, answers column-wise per question."""
+    started_at = session["started_at"]
+    questions = []
+    for q_data in session["answered_questions"]:
+        q_id = q_data["question_id"]
+        answers = {
+            sid: answers[q_id] for sid, answers in session["student_answers"].items() if q_id in answers
+        }
+        questions.append({
+            **q_data,
+            "question_started_at": started_at.isoformat(),
+            "sids": list(answers),
+            "options": [answer["option_id"] for answer in answers.values()],
+            "response_ms": [answer["response_time_ms"] for answer in answers.values()],
+        })
+    return {
+        "session_id": session["session_id"],
+        "topic_id": session["topic_id"],
+        "time_per_question": session["time_per_question"],
+        "started_at": started_at,
+        "students": session["students"],
+        "questions": questions,
+    }
+
+
+def persist_session_row_by_row(session_data: dict) -> int | None:
+    """The previous implementation: one INSERT per row, no transaction."""
+    from django.utils import timezone
+
+    from live.models import Session, SessionAnswer, SessionParticipant, SessionQuestion
+    from quizzes.models import Topic
+
+    try:
+        topic = Topic.objects.select_related('teacher').get(pk=session_data['topic_id'])
+    except Topic.DoesNotExist:
+        return None
+
+    session = Session.objects.create(
+        code=session_data['session_id'],
+        topic=topic,
+        teacher=topic.teacher,
+        status=Session.Status.FINISHED,
+        started_at=session_data.get('started_at') or timezone.now(),
+        finished_at=timezone.now(),
+        time_per_question=session_data['time_per_question'],
+        total_questions=len(session_data.get('answered_questions', [])),
+    )
+
+    sq_map = {}
+    for order, q_data in enumerate(session_data.get('answered_questions', []), start=1):
+        sq_map[q_data['question_id']] = SessionQuestion.objects.create(
+            session=session, question_id=q_data['question_id'], order=order
+        )
+
+    for sid, student_data in session_data.get('students', {}).items():
+        student_answers = session_data.get('student_answers', {}).get(sid, {})
+        correct_count = sum(1 for a in student_answers.values() if a.get('is_correct'))
+        participant = SessionParticipant.objects.create(
+            session=session,
+            student_name=student_data['name'],
+            socket_id=sid,
+            score=student_data.get('score', 0),
+            correct_answers=correct_count,
+            wrong_answers=len(student_answers) - correct_count,
+        )
+        for q_id, answer_data in student_answers.items():
+            sq = sq_map.get(q_id)
+            if not sq:
+                continue
+            SessionAnswer.objects.create(
+                session=session,
+                participant=participant,
+                session_question=sq,
+                selected_option_id=answer_data.get('option_id'),
+                is_correct=answer_data.get('is_correct', False),
+                answered_at=answer_data.get('answered_at'),
+                response_time_ms=answer_data.get('response_time_ms'),
+            )
+
+    return session.id
+
+
+def run_path(func, session: dict, repeat: int) -> tuple[int, float]:
+    """Return (queries per run, best wall time in ms)."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    best = float("inf")
+    queries = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func(session)
+            best = min(best, (time.perf_counter() - start) * 1000)
+        queries = len(ctx.captured_queries)
+    return queries, best
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+
+    import warnings
+
+    from django.db import transaction
+
+    from sockets.managers.persistence import _persist_session_sync
+
+    # Answers carry naive UTC timestamps, as in the live server
+    warnings.filterwarnings("ignore", message=".*received a naive datetime.*")
+
+    with transaction.atomic():
+        topic, correct = seed(args.questions)
+        session = build_session(topic, correct, args.students)
+
+        legacy = run_path(persist_session_row_by_row, session, args.repeat)
+        bulk = run_path(_persist_session_sync, columnar_session(session), args.repeat)
+
+        transaction.set_rollback(True)
+
+    rows = [
+        ["row-by-row", legacy[0], f"{legacy[1]:.1f}"],
+        ["bulk", bulk[0], f"{bulk[1]:.1f}"],
+    ]
+    print(f"persist_session: {args.students} students x {args.questions} questions")
+    print_table(["path", "queries", "best ms"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
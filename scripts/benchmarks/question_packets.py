@@ -0,0 +1,88 @@
+"""
+Benchmark the encode cost of revealing a question in many rooms.
+
+Compares, per reveal of one question in --rooms rooms:
+
+- rebuild: build_question_payload + packet encode for every room (what a
+  plain sio.emit does)
+- cached: PacketCache lookup for every room (one encode for all of them)
+
+Usage:
+    python scripts/benchmarks/question_packets.py --rooms 1 10 50 --options 4
+"""
+
+import argparse
+
+from common import measure, percentile, print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark question packet encoding")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--options", type=int, default=4, help="Options per question")
+    parser.add_argument("--text-length", type=int, default=120, help="Characters per question/option")
+    parser.add_argument("--repeat", type=int, default=200)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+
+    import socketio
+    from engineio import packet as eio_packet
+    from socketio import packet
+
+    from sockets.managers.questions import QuestionManager
+    from sockets.utils.packets import PacketCache
+
+    server = socketio.AsyncServer(async_mode="asgi")
+    question = {
+        "id": 1,
+        "text": "Q" * args.text_length,
+        "options": [
+            {"id": i, "text": f"{i}" * args.text_length} for i in range(1, args.options + 1)
+        ],
+        "correct_option_id": 1,
+    }
+    time_limit = 20
+
+    def encode_once():
+        payload = QuestionManager.build_question_payload(question, time_limit)
+        pkt = server.packet_class(packet.EVENT, namespace="/", data=["session:question", payload])
+        return eio_packet.Packet(eio_packet.MESSAGE, pkt.encode())
+
+    rows = []
+    for rooms in args.rooms:
+        cache = PacketCache(server)
+
+        def rebuild():
+            for _ in range(rooms):
+                encode_once()
+
+        def cached():
+            for _ in range(rooms):
+                cache.get(
+                    (question["id"], time_limit),
+                    question,
+                    "session:question",
+                    lambda: QuestionManager.build_question_payload(question, time_limit),
+                )
+
+        rebuild_p50 = percentile(measure(rebuild, args.repeat), 50) * 1000
+        cached_p50 = percentile(measure(cached, args.repeat), 50) * 1000
+        rows.append([
+            rooms,
+            f"{rebuild_p50:.1f}",
+            f"{cached_p50:.1f}",
+            f"{rebuild_p50 / cached_p50:.1f}x" if cached_p50 else "-",
+        ])
+
+    size = len(encode_once().encode())
+    print(f"question reveal encode cost (us, p50 of {args.repeat}), packet size {size} bytes")
+    print_table(["rooms", "rebuild us", "cached us", "speedup"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
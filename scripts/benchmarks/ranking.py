@@ -0,0 +1,175 @@
+"""
+Benchmark the per-session Leaderboard against full re-ranking.
+
+For each room size, every student gets a random score history and each
+operation is timed with the previous implementation (sort every player on
+every call) and with the session's Leaderboard:
+
+- close: apply one question's score changes, then build the ranking payload
+- standings: the top 10 plus every student's position and neighbours, as
+  sent in answer_result at close
+- finish: build the quiz_finished payload (winners + scoreboard)
+- top 10 / position / winners: single ranking queries
+
+Usage:
+    python scripts/benchmarks/ranking.py --sizes 50 1000 10000
+"""
+
+import argparse
+import random
+
+from common import percentile, measure, print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard vs. full re-ranking")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1000, 10000])
+    parser.add_argument("--questions", type=int, default=20, help="Questions already played")
+    parser.add_argument("--repeat", type=int, default=50)
+    return parser.parse_args()
+
+
+def legacy_rank_players(students: dict) -> list[dict]:
+    """The previous rank_players: sort every player on every call."""
+    player_list = [
+        {"sid": sid, "name": data["name"], "score": data["score"]}
+        for sid, data in students.items()
+    ]
+    player_list.sort(key=lambda x: x["score"], reverse=True)
+
+    ranked = []
+    current_position = 1
+    previous_score = None
+    for i, player in enumerate(player_list):
+        if previous_score is not None and player["score"] < previous_score:
+            current_position = i + 1
+        ranked.append({**player, "position": current_position})
+        previous_score = player["score"]
+    return ranked
+
+
+def legacy_get_winners(students: dict) -> list[dict]:
+    """The previous get_winners: one pass for the max, one for the winners."""
+    if not students:
+        return []
+    max_score = max(data["score"] for data in students.values())
+    return [
+        {"name": data["name"], "score": data["score"]}
+        for data in students.values()
+        if data["score"] == max_score
+    ]
+
+
+def legacy_payload(ranked: list[dict]) -> list[dict]:
+    return [
+        {"name": p["name"], "score": p["score"], "position": p["position"]}
+        for p in ranked
+    ]
+
+
+def legacy_standings(students: dict) -> tuple[list[dict], dict[str, dict]]:
+    """Rank everyone with the previous sort, then read each student's neighbours."""
+    ranked = legacy_rank_players(students)
+    players = legacy_payload(ranked)
+    last = len(players) - 1
+    standings = {
+        player["sid"]: {
+            "position": player["position"],
+            "above": players[i - 1] if i > 0 else None,
+            "below": players[i + 1] if i < last else None,
+        }
+        for i, player in enumerate(ranked)
+    }
+    return players[:10], standings
+
+
+def build_students(size: int, questions: int, rng: random.Random) -> dict:
+    return {
+        f"sid-{i}": {"name": f"Student {i}", "score": 20 * rng.randint(0, questions)}
+        for i in range(size)
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+
+    from sockets.managers.ranking import Leaderboard, RankingManager
+    from sockets.managers.students import StudentTable
+
+    rng = random.Random(42)
+    rows = []
+    for size in args.sizes:
+        students = build_students(size, args.questions, rng)
+        table = StudentTable.from_dict(students)
+        leaderboard = Leaderboard.from_students(table)
+        sids = list(students)
+        probe = sids[size // 2]
+
+        # One question's worth of score changes: about half answer correctly
+        def next_question_deltas() -> list[str]:
+            return [sid for sid in sids if rng.random() < 0.5]
+
+        def legacy_close():
+            for sid in next_question_deltas():
+                students[sid]["score"] += 20
+            legacy_payload(legacy_rank_players(students))
+
+        def leaderboard_close():
+            for sid in next_question_deltas():
+                leaderboard.add_points(sid, 20)
+            RankingManager.build_ranking_payload(table, leaderboard)
+
+        timings = {
+            "close": (
+                measure(legacy_close, args.repeat),
+                measure(leaderboard_close, args.repeat),
+            ),
+        }
+        # Both paths changed scores; start the queries from the same board
+        table = StudentTable.from_dict(students)
+        leaderboard = Leaderboard.from_students(table)
+
+        timings["finish"] = (
+            measure(lambda: (legacy_get_winners(students), legacy_payload(legacy_rank_players(students))), args.repeat),
+            measure(lambda: RankingManager.build_quiz_finished_payload(table, leaderboard), args.repeat),
+        )
+        def leaderboard_standings():
+            standings = RankingManager.build_standings(table, leaderboard)
+            return standings.top(10), [standings[sid] for sid in sids]
+
+        timings["standings"] = (
+            measure(lambda: legacy_standings(students), args.repeat),
+            measure(leaderboard_standings, args.repeat),
+        )
+        timings["top 10"] = (
+            measure(lambda: legacy_rank_players(students)[:10], args.repeat),
+            measure(lambda: leaderboard.top(10), args.repeat),
+        )
+        timings["position"] = (
+            measure(lambda: next(p["position"] for p in legacy_rank_players(students) if p["sid"] == probe), args.repeat),
+            measure(lambda: leaderboard.position(probe), args.repeat),
+        )
+        timings["winners"] = (
+            measure(lambda: legacy_get_winners(students), args.repeat),
+            measure(lambda: RankingManager.get_winners(table, leaderboard), args.repeat),
+        )
+
+        for operation, (legacy, incremental) in timings.items():
+            legacy_p50 = percentile(legacy, 50)
+            incremental_p50 = percentile(incremental, 50)
+            rows.append([
+                size,
+                operation,
+                f"{legacy_p50:.3f}",
+                f"{incremental_p50:.3f}",
+                f"{legacy_p50 / incremental_p50:.1f}x" if incremental_p50 else "-",
+            ])
+
+    print(f"ranking: {args.questions} questions played, p50 of {args.repeat} runs")
+    print_table(["students", "operation", "sort ms", "leaderboard ms", "speedup"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark the JSON and msgpack Socket.IO serializers on real payloads.
+
+For each room size, the payloads the server sends are built with the
+managers and encoded/decoded as Socket.IO EVENT packets:
+
+- session:question: one question with its options
+- answer_result: one student's result with their compact ranking
+- ranking: the teacher's full board
+- quiz_finished: the teacher's winners + full scoreboard
+
+Usage:
+    python scripts/benchmarks/serializers.py --sizes 30 300 3000
+"""
+
+import argparse
+import random
+
+from common import measure, percentile, print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark Socket.IO packet serializers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--questions", type=int, default=20, help="Questions already played")
+    parser.add_argument("--options", type=int, default=4, help="Options per question")
+    parser.add_argument("--repeat", type=int, default=200)
+    return parser.parse_args()
+
+
+def build_payloads(size: int, args, rng: random.Random) -> dict:
+    from sockets.managers.questions import QuestionManager
+    from sockets.managers.ranking import Leaderboard, RankingManager
+    from sockets.managers.students import StudentTable
+
+    students = StudentTable()
+    for i in range(size):
+        students.add(f"sid-{i}", f"Student {i}", 20 * rng.randint(0, args.questions))
+    leaderboard = Leaderboard.from_students(students)
+    standings = RankingManager.build_standings(students, leaderboard)
+
+    question = {
+        "id": 1,
+        "text": "Which planet is known as the Red Planet?",
+        "options": [{"id": i, "text": f"Option number {i}"} for i in range(1, args.options + 1)],
+        "correct_option_id": 1,
+    }
+    sid = f"sid-{size // 2}"
+    ranking = RankingManager.build_student_ranking(
+        standings.top(RankingManager.TOP_K), standings[sid], len(standings)
+    )
+
+    return {
+        "session:question": QuestionManager.build_question_payload(question, 20),
+        "answer_result": QuestionManager.build_answer_result(
+            True, 1, 1, QuestionManager.POINTS_CORRECT, students.score(sid), ranking
+        ),
+        "ranking": {"type": "ranking", "players": standings.players()},
+        "quiz_finished": RankingManager.build_quiz_finished_payload(students, leaderboard),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+
+    from socketio import packet
+
+    from sockets.utils.serializers import build_serializer
+
+    serializers = {"json": packet.Packet, "msgpack": build_serializer("msgpack")}
+
+    rng = random.Random(42)
+    rows = []
+    for size in args.sizes:
+        for event, payload in build_payloads(size, args, rng).items():
+            results = {}
+            for name, packet_class in serializers.items():
+                pkt = packet_class(packet.EVENT, namespace="/", data=[event, payload])
+                encoded = pkt.encode()
+                nbytes = len(encoded.encode() if isinstance(encoded, str) else encoded)
+                encode_us = percentile(measure(pkt.encode, args.repeat), 50) * 1000
+                decode_us = percentile(
+                    measure(lambda: packet_class(encoded_packet=encoded), args.repeat), 50
+                ) * 1000
+                results[name] = (nbytes, encode_us, decode_us)
+
+            (json_bytes, json_enc, json_dec), (mp_bytes, mp_enc, mp_dec) = results.values()
+            rows.append([
+                size,
+                event,
+                json_bytes,
+                mp_bytes,
+                f"{mp_bytes / json_bytes:.0%}",
+                f"{json_enc:.1f}",
+                f"{mp_enc:.1f}",
+                f"{json_dec:.1f}",
+                f"{mp_dec:.1f}",
+            ])
+
+    print(f"packet size (bytes) and encode/decode cost (us, p50 of {args.repeat})")
+    print_table(
+        ["students", "event", "json B", "msgpack B", "size", "json enc", "mp enc", "json dec", "mp dec"],
+        rows,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+"""
+Measure the memory a live session holds per student.
+
+For each room size a session is built through SessionManager (students
+join, then --questions questions are answered by everyone) and the
+allocations are traced with tracemalloc:
+
+- students: the per-session student container alone, the previous
+  {sid: {"name", "score"}} dict against the StudentTable
+- join: everything add_student allocates (student, leaderboard entry, sid
+  index), socket IDs and names excluded
+- answer history: what the persistence history holds per recorded answer,
+  the previous {sid: {question_id: answer dict}} against the QuestionAnswers
+  columns (recorded through record_answer and record_answered_question)
+
+Usage:
+    python scripts/benchmarks/session_memory.py --sizes 1000 10000 --questions 20
+"""
+
+import argparse
+import asyncio
+import gc
+import inspect
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable
+
+from common import print_table, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure per-student session memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--questions", type=int, default=20, help="Questions answered by every student")
+    return parser.parse_args()
+
+
+async def traced(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Run build() (awaiting it if it is a coroutine) and return (result, bytes still allocated by it)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    if inspect.isawaitable(result):
+        result = await result
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def legacy_students(sids: list[str], names: list[str]) -> dict:
+    """The previous container: one {"name", "score"} dict per student."""
+    return {sid: {"name": name, "score": 0} for sid, name in zip(sids, names)}
+
+
+def table_students(sids: list[str], names: list[str]):
+    from sockets.managers.students import StudentTable
+
+    table = StudentTable()
+    for sid, name in zip(sids, names):
+        table.add(sid, name)
+    return table
+
+
+def legacy_history(sids: list[str], question_ids: list[int]) -> dict:
+    """The previous history: one answer dict with its own datetime per answer."""
+    history: dict = {}
+    for question_id in question_ids:
+        for i, sid in enumerate(sids):
+            history.setdefault(sid, {})[question_id] = {
+                "option_id": 1 + i % 4,
+                "is_correct": i % 4 == 0,
+                "answered_at": datetime.utcnow(),
+                "response_time_ms": 1500 + i,
+            }
+    return history
+
+
+def main() -> int:
+    args = parse_args()
+    setup_django()
+    return asyncio.run(run(args))
+
+
+async def run(args) -> int:
+    from sockets.managers import CodeAllocator, MemorySessionStore, QuestionManager, SessionManager
+    from sockets.utils.logs import configure_logging
+
+    configure_logging("WARNING")
+    SessionManager.configure_store(MemorySessionStore())
+    SessionManager.configure_codes(CodeAllocator(seed=1))
+
+    rows = []
+    for size in args.sizes:
+        # Allocated up front so strings are not counted as session memory
+        sids = [f"sid-{i:08d}-abcdefghij" for i in range(size)]
+        names = [f"Student {i}" for i in range(size)]
+
+        _, legacy = await traced(lambda: legacy_students(sids, names))
+        _, table = await traced(lambda: table_students(sids, names))
+        rows.append([size, "students (dict of dicts)", f"{legacy / 1024:.0f}", f"{legacy / size:.0f}"])
+        rows.append([size, "students (StudentTable)", f"{table / 1024:.0f}", f"{table / size:.0f}"])
+
+        question_ids = list(range(1, args.questions + 1))
+        questions = {
+            question_id: {
+                "id": question_id,
+                "text": f"Question {question_id}",
+                "options": [{"id": option_id, "text": f"Option {option_id}"} for option_id in range(1, 5)],
+                "correct_option_id": 1,
+            }
+            for question_id in question_ids
+        }
+        session = await SessionManager.create_session(1, "teacher", 30, question_ids, questions)
+        session_id = session["session_id"]
+
+        async def join():
+            for sid, name in zip(sids, names):
+                await SessionManager.add_student(session_id, sid, name)
+
+        _, joined = await traced(join)
+        rows.append([size, "join (add_student)", f"{joined / 1024:.0f}", f"{joined / size:.0f}"])
+
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+
+        async def answer_all():
+            for question_id in question_ids:
+                await QuestionManager.open_question(session_id, question_id)
+                for i, sid in enumerate(sids):
+                    await SessionManager.record_answer(session_id, sid, 1 + i % 4)
+                await SessionManager.record_answered_question(session_id, question_id, 1)
+                await SessionManager.clear_answers(session_id)
+
+        answers = size * args.questions
+        _, legacy = await traced(lambda: legacy_history(sids, question_ids))
+        _, history = await traced(answer_all)
+        for label, used in (("dict of dicts", legacy), ("QuestionAnswers", history)):
+            rows.append([
+                size,
+                f"answer history, {label} ({args.questions} questions)",
+                f"{used / 1024:.0f}",
+                f"{used / size:.0f} ({used / answers:.0f}/answer)",
+            ])
+        await SessionManager.delete_session(session_id)
+
+    print_table(["students", "structure", "KiB", "bytes/student"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,330 @@
+"""
+Socket.IO load test for the live quiz server.
+
+Connects one teacher and N students with socketio.AsyncClient and plays a
+whole quiz:
+
+    teacher:create_session -> student:join (xN) -> teacher:start_session
+    -> per question: student:answer (xN) -> auto-close -> teacher:next_question
+
+and reports p50/p95/p99 of:
+
+- join: student:join -> student:joined
+- answer ack: student:answer -> student:answer_received
+- close: last answer of the question sent -> answer_result received
+  (every student) and -> ranking received (teacher)
+
+Usage:
+    # Seed a topic in the configured database and start a local server
+    python scripts/loadtest.py --seed --spawn --students 500
+
+    # Against a running server and an existing topic
+    python scripts/loadtest.py --url http://127.0.0.1:8000 --topic-id 3 --students 1000
+
+A local SQLite database is enough: point --settings at a settings module
+that overrides DATABASES and run `manage.py migrate` with it first.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import socketio
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(settings_module: str) -> None:
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    import django
+
+    django.setup()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the live quiz Socket.IO server")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server URL")
+    parser.add_argument("--students", "-n", type=int, default=100, help="Simulated students")
+    parser.add_argument("--topic-id", type=int, help="Topic to play (required without --seed)")
+    parser.add_argument("--seed", action="store_true", help="Create a load test topic in the database")
+    parser.add_argument("--questions", type=int, default=5, help="Questions in the seeded topic")
+    parser.add_argument("--timer", type=int, default=60, help="Seconds per question in the seeded topic")
+    parser.add_argument("--think-ms", type=int, default=1000, help="Maximum random delay before answering")
+    parser.add_argument("--connect-concurrency", type=int, default=100, help="Connections opened at once")
+    parser.add_argument("--spawn", action="store_true", help="Start uvicorn on --url's port for the run")
+    parser.add_argument("--settings", default=os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"),
+                        help="Django settings module for --seed and --spawn")
+    parser.add_argument("--random-seed", type=int, default=42, help="Seed for think times and choices")
+    return parser.parse_args()
+
+
+def seed_topic(questions: int, timer: int) -> int:
+    """Create a topic with `questions` four-option questions. Returns its ID."""
+    from quizzes.models import AnswerOption, Question, Topic
+    from users.models import User
+
+    teacher, _ = User.objects.get_or_create(
+        email="loadtest@example.com",
+        defaults={"first_name": "Load", "last_name": "Test"},
+    )
+    topic = Topic.objects.create(
+        teacher=teacher,
+        title=f"Load test {time.strftime('%Y-%m-%d %H:%M:%S')}",
+        question_timer=timer,
+    )
+    for i in range(questions):
+        question = Question.objects.create(topic=topic, text=f"Load test question {i + 1}", order_index=i)
+        AnswerOption.objects.bulk_create([
+            AnswerOption(question=question, text=f"Option {j + 1}", is_correct=(j == 0))
+            for j in range(4)
+        ])
+    return topic.id
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    """Nearest-rank p50/p95/p99 in milliseconds."""
+    if not samples:
+        return 0.0, 0.0, 0.0
+    ordered = sorted(samples)
+
+    def pick(pct: float) -> float:
+        index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return pick(50), pick(95), pick(99)
+
+
+class Stats:
+    """Latency samples (seconds) and error counts shared by every client."""
+
+    def __init__(self) -> None:
+        self.join: list[float] = []
+        self.answer_ack: list[float] = []
+        self.close_student: list[float] = []
+        self.close_teacher: list[float] = []
+        self.errors: dict[str, int] = {}
+
+    def error(self, message: str) -> None:
+        self.errors[message] = self.errors.get(message, 0) + 1
+
+
+class Student:
+    """One simulated student: joins, answers every question after a random delay."""
+
+    def __init__(self, index: int, run: "LoadTest"):
+        self.index = index
+        self.run = run
+        self.client = socketio.AsyncClient(reconnection=False)
+        self.joined = asyncio.Event()
+        self.join_sent = 0.0
+        self.answer_sent = 0.0
+        self.rng = random.Random(run.args.random_seed * 1_000_003 + index)
+
+        self.client.on("student:joined", self.on_joined)
+        self.client.on("session:question", self.on_question)
+        self.client.on("student:answer_received", self.on_answer_received)
+        self.client.on("answer_result", self.on_answer_result)
+        self.client.on("error", self.on_error)
+
+    async def join(self, session_id: str) -> None:
+        await self.client.connect(self.run.args.url, transports=["websocket"])
+        self.join_sent = time.perf_counter()
+        await self.client.emit("student:join", {"session_id": session_id, "name": f"Student {self.index}"})
+        await self.joined.wait()
+
+    async def on_joined(self, data: dict[str, Any]) -> None:
+        self.run.stats.join.append(time.perf_counter() - self.join_sent)
+        self.joined.set()
+
+    async def on_question(self, data: dict[str, Any]) -> None:
+        await asyncio.sleep(self.rng.uniform(0, self.run.args.think_ms / 1000))
+        option_id = self.rng.choice(data["options"])["id"]
+        self.answer_sent = time.perf_counter()
+        self.run.last_answer_sent = max(self.run.last_answer_sent, self.answer_sent)
+        await self.client.emit("student:answer", {"session_id": self.run.session_id, "option_id": option_id})
+
+    async def on_answer_received(self, data: dict[str, Any]) -> None:
+        self.run.stats.answer_ack.append(time.perf_counter() - self.answer_sent)
+
+    async def on_answer_result(self, data: dict[str, Any]) -> None:
+        self.run.stats.close_student.append(time.perf_counter() - self.run.last_answer_sent)
+        self.run.results_pending -= 1
+        self.run.maybe_question_done()
+
+    async def on_error(self, data: dict[str, Any]) -> None:
+        self.run.stats.error(data.get("message", "unknown"))
+
+
+class LoadTest:
+    """Drives the teacher and collects the students' timings."""
+
+    def __init__(self, args: argparse.Namespace, topic_id: int):
+        self.args = args
+        self.topic_id = topic_id
+        self.stats = Stats()
+        self.teacher = socketio.AsyncClient(reconnection=False)
+        self.session_id: Optional[str] = None
+        self.session_created = asyncio.Event()
+        self.question_done = asyncio.Event()
+        self.finished = asyncio.Event()
+        self.last_answer_sent = 0.0
+        self.results_pending = 0
+        self.ranking_pending = False
+        self.questions_played = 0
+
+        self.teacher.on("teacher:session_created", self.on_session_created)
+        self.teacher.on("ranking", self.on_ranking)
+        self.teacher.on("quiz_finished", self.on_quiz_finished)
+        self.teacher.on("error", self.on_error)
+
+    async def on_session_created(self, data: dict[str, Any]) -> None:
+        self.session_id = data["session_id"]
+        self.session_created.set()
+
+    async def on_ranking(self, data: dict[str, Any]) -> None:
+        self.stats.close_teacher.append(time.perf_counter() - self.last_answer_sent)
+        self.ranking_pending = False
+        self.maybe_question_done()
+
+    async def on_quiz_finished(self, data: dict[str, Any]) -> None:
+        self.finished.set()
+
+    async def on_error(self, data: dict[str, Any]) -> None:
+        self.stats.error(data.get("message", "unknown"))
+
+    def expect_question(self, students: int) -> None:
+        self.question_done.clear()
+        self.last_answer_sent = 0.0
+        self.results_pending = students
+        self.ranking_pending = True
+
+    def maybe_question_done(self) -> None:
+        if self.results_pending <= 0 and not self.ranking_pending:
+            self.question_done.set()
+
+    async def run(self) -> float:
+        """Play one quiz. Returns the wall time in seconds."""
+        args = self.args
+        start = time.perf_counter()
+
+        await self.teacher.connect(args.url, transports=["websocket"])
+        await self.teacher.emit("teacher:create_session", {"topic_id": self.topic_id})
+        await asyncio.wait_for(self.session_created.wait(), 30)
+
+        students = [Student(i, self) for i in range(args.students)]
+        limit = asyncio.Semaphore(args.connect_concurrency)
+
+        async def join(student: Student) -> None:
+            async with limit:
+                await student.join(self.session_id)
+
+        await asyncio.gather(*(join(student) for student in students))
+        print(f"{len(students)} students joined session {self.session_id} "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        self.expect_question(len(students))
+        await self.teacher.emit("teacher:start_session", {"session_id": self.session_id})
+        while True:
+            waiters = [
+                asyncio.ensure_future(self.question_done.wait()),
+                asyncio.ensure_future(self.finished.wait()),
+            ]
+            _, pending = await asyncio.wait(
+                waiters, timeout=args.timer + 30, return_when=asyncio.FIRST_COMPLETED
+            )
+            for waiter in pending:
+                waiter.cancel()
+            if self.finished.is_set():
+                break
+            if not self.question_done.is_set():
+                raise RuntimeError(f"question {self.questions_played + 1} did not close")
+
+            self.questions_played += 1
+            print(f"question {self.questions_played} closed")
+            self.expect_question(len(students))
+            await self.teacher.emit("teacher:next_question", {"session_id": self.session_id})
+
+        elapsed = time.perf_counter() - start
+        await asyncio.gather(*(s.client.disconnect() for s in students), self.teacher.disconnect())
+        return elapsed
+
+
+def wait_for_server(url: str, timeout: float = 30.0) -> None:
+    import urllib.error
+    import urllib.request
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{url}/socket.io/?EIO=4&transport=polling", timeout=1)
+            return
+        except urllib.error.HTTPError:
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.seed:
+        setup_django(args.settings)
+        topic_id = seed_topic(args.questions, args.timer)
+        print(f"Seeded topic {topic_id} ({args.questions} questions)")
+    elif args.topic_id:
+        topic_id = args.topic_id
+    else:
+        print("Either --topic-id or --seed is required")
+        return 1
+
+    server = None
+    if args.spawn:
+        port = args.url.rsplit(":", 1)[-1].strip("/")
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": args.settings}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.asgi:application",
+             "--port", port, "--log-level", "warning"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        wait_for_server(args.url)
+
+    try:
+        run = LoadTest(args, topic_id)
+        elapsed = asyncio.run(run.run())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    stats = run.stats
+    print()
+    print(f"{args.students} students, {run.questions_played} questions, {elapsed:.1f}s")
+    print(f"{'latency (ms)':<22}{'samples':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, samples in (
+        ("join", stats.join),
+        ("answer ack", stats.answer_ack),
+        ("close -> student", stats.close_student),
+        ("close -> teacher", stats.close_teacher),
+    ):
+        p50, p95, p99 = percentiles(samples)
+        print(f"{label:<22}{len(samples):>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+    for message, count in stats.errors.items():
+        print(f"error: {message} (x{count})")
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,17 +3,34 @@ Managers package for Live Quiz Socket.IO Server
 
 Contains:
 - sessions: Session creation and management
+- students: Slot-indexed student storage of a session
+- answers: Column-wise answers to one question
+- store: Pluggable session storage (memory, Redis)
+- codes: Collision-free session code allocation
 - questions: Question handling and delivery
-- ranking: Ranking calculation with tie support
+- ranking: Ranking calculation with tie support, per-session leaderboard
+- reaper: Eviction of finished, idle and teacherless sessions
 """
 
 from .sessions import SessionManager, active_sessions
+from .students import StudentTable
+from .answers import QuestionAnswers
+from .store import SessionStore, MemorySessionStore, RedisSessionStore
+from .codes import CodeAllocator, RedisCodeAllocator
 from .questions import QuestionManager
-from .ranking import RankingManager
+from .ranking import Leaderboard, RankingManager
 
 __all__ = [
     "SessionManager",
     "QuestionManager",
     "RankingManager",
+    "Leaderboard",
+    "StudentTable",
+    "QuestionAnswers",
+    "SessionStore",
+    "MemorySessionStore",
+    "RedisSessionStore",
+    "CodeAllocator",
+    "RedisCodeAllocator",
     "active_sessions",
 ]
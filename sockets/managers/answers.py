@@ -0,0 +1,140 @@
+"""
+Columnar answer storage for Live Quiz Socket.IO Server
+
+Handles:
+- Answers to one question as parallel typed arrays (student slot, option,
+  response time)
+- Correctness derived from the option column once the question closes
+"""
+
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Iterator, Optional
+
+
+class QuestionAnswers:
+    """
+    Answers to one question, stored column-wise in arrival order.
+
+    `slots`, `options` and `response_ms` are parallel array('i') columns:
+    an answer costs 12 bytes instead of a dict, a datetime and boxed values.
+    Slots are StudentTable slots, which stay fixed once a quiz has started
+    (students only join while it is waiting).
+
+    While the question is open, `chosen` maps slot -> option ID (0 = no
+    answer) for O(1) duplicate checks and lookups; drop_index() frees it
+    once the question is scored. Correctness is not stored: an answer is
+    correct if its option is `correct_option_id`, set by close().
+    """
+
+    __slots__ = (
+        "question_id", "started_at", "correct_option_id",
+        "slots", "options", "response_ms", "chosen",
+    )
+
+    def __init__(
+        self,
+        question_id: Optional[int] = None,
+        started_at: Optional[datetime] = None,
+        capacity: int = 0,
+    ):
+        self.question_id = question_id
+        self.started_at = started_at
+        self.correct_option_id: Optional[int] = None
+        self.slots = array("i")
+        self.options = array("i")
+        self.response_ms = array("i")
+        self.chosen: Optional[array] = array("i", [0]) * capacity
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, slot: int, option_id: int, response_ms: int) -> bool:
+        """
+        Record a student's answer.
+
+        Returns:
+            True if recorded, False if the slot already answered
+        """
+        chosen = self.chosen
+        if slot >= len(chosen):
+            chosen.extend(array("i", [0]) * (slot + 1 - len(chosen)))
+        elif chosen[slot]:
+            return False
+        chosen[slot] = option_id
+        self.slots.append(slot)
+        self.options.append(option_id)
+        self.response_ms.append(response_ms)
+        return True
+
+    def answered(self, slot: int) -> bool:
+        """Whether the student in this slot answered (open question only)."""
+        return slot < len(self.chosen) and self.chosen[slot] != 0
+
+    def option(self, slot: int) -> Optional[int]:
+        """The option chosen by the student in this slot, or None (open question only)."""
+        if slot < len(self.chosen):
+            return self.chosen[slot] or None
+        return None
+
+    def close(self, correct_option_id: int) -> None:
+        """Set the correct option; correctness of every answer follows from it."""
+        self.correct_option_id = correct_option_id
+
+    def drop_index(self) -> None:
+        """Free the per-slot lookup once the question has been scored."""
+        self.chosen = None
+
+    def correct_count(self) -> int:
+        """Number of correct answers (after close())."""
+        return self.options.count(self.correct_option_id) if self.correct_option_id else 0
+
+    def answered_at(self, index: int) -> Optional[datetime]:
+        """Wall time of the index-th answer, from the question start."""
+        if self.started_at is None:
+            return None
+        return self.started_at + timedelta(milliseconds=self.response_ms[index])
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and the open-question index."""
+        return sum(
+            sys.getsizeof(column)
+            for column in (self.slots, self.options, self.response_ms, self.chosen)
+            if column is not None
+        )
+
+    def to_state(self) -> dict[str, Any]:
+        """Plain-data copy of the columns (JSON-safe); the open-question index is rebuilt on load."""
+        return {
+            "question_id": self.question_id,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "correct_option_id": self.correct_option_id,
+            "slots": self.slots.tolist(),
+            "options": self.options.tolist(),
+            "response_ms": self.response_ms.tolist(),
+            "capacity": len(self.chosen) if self.chosen is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "QuestionAnswers":
+        """Rebuild answers from to_state()."""
+        started_at = state["started_at"]
+        answers = cls(state["question_id"], datetime.fromisoformat(started_at) if started_at else None)
+        answers.correct_option_id = state["correct_option_id"]
+        answers.slots = array("i", state["slots"])
+        answers.options = array("i", state["options"])
+        answers.response_ms = array("i", state["response_ms"])
+        if state["capacity"] is None:
+            answers.chosen = None
+        else:
+            answers.chosen = array("i", [0]) * max(state["capacity"], max(answers.slots, default=-1) + 1)
+            for slot, option_id in zip(answers.slots, answers.options):
+                answers.chosen[slot] = option_id
+        return answers
+
+    def rows(self) -> Iterator[tuple[int, int, bool, int]]:
+        """Yield (slot, option_id, is_correct, response_ms) in arrival order."""
+        correct = self.correct_option_id
+        for slot, option_id, response_ms in zip(self.slots, self.options, self.response_ms):
+            yield slot, option_id, option_id == correct, response_ms
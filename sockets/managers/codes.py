@@ -0,0 +1,231 @@
+"""
+Session code allocation for Live Quiz Socket.IO Server
+
+Handles:
+- Collision-free session codes ("AB12") in O(1) per allocate/release
+- Optional per-node prefixes, so nodes draw from disjoint code ranges
+- A Redis-backed allocator shared by every worker using the same store
+
+Codes are a keyed permutation of a counter: the n-th code is n encrypted
+with a small Feistel network over range(36^k) under a secret random key,
+written in base 36. Without the key, seeing some codes tells nothing about
+the next one. Every code of the space is handed out once before any is
+reused. After that, released codes are reused oldest first, so a code
+stays unused for as long as possible.
+"""
+
+import hashlib
+import math
+import random
+import secrets
+import string
+from collections import deque
+from typing import Any, Optional
+
+from .store import RedisSessionStore, SessionStore
+
+ALPHABET = string.ascii_uppercase + string.digits
+
+# Feistel rounds; 4 already give a pseudorandom permutation, 2 more are cheap
+FEISTEL_ROUNDS = 6
+KEY_BYTES = 16
+
+
+class FeistelPermutation:
+    """
+    Keyed pseudorandom permutation of range(size).
+
+    A balanced Feistel network over range(m) x range(m), m = ceil(sqrt(size)),
+    with a keyed BLAKE2b round function. Outputs outside range(size) are
+    encrypted again (cycle walking) until they fall inside, which keeps the
+    mapping a permutation; m * m is less than size + 2m + 1, so this rarely
+    takes more than one extra pass.
+    """
+
+    def __init__(self, size: int, key: bytes, rounds: int = FEISTEL_ROUNDS):
+        self.size = size
+        self.key = key
+        self.rounds = rounds
+        self.half = math.isqrt(size - 1) + 1 if size > 1 else 1
+
+    def _round(self, i: int, value: int) -> int:
+        digest = hashlib.blake2b(
+            value.to_bytes(8, "big"), digest_size=8, key=self.key, person=i.to_bytes(16, "big")
+        ).digest()
+        return int.from_bytes(digest, "big") % self.half
+
+    def _encrypt(self, value: int) -> int:
+        left, right = divmod(value, self.half)
+        for i in range(self.rounds):
+            left, right = right, (left + self._round(i, right)) % self.half
+        return left * self.half + right
+
+    def __call__(self, n: int) -> int:
+        """Map n (0 <= n < size) to its place in the permutation."""
+        value = self._encrypt(n)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class CodeAllocator:
+    """
+    Hand out unique session codes from a process-local counter.
+
+    Codes are `prefix` followed by `length` characters of A-Z0-9. Give each
+    node its own prefix when several processes keep their own sessions.
+    The permutation key is random unless `seed` is given (tests, benchmarks).
+    """
+
+    def __init__(self, length: int = 4, prefix: str = "", seed: Optional[int] = None):
+        if length < 1:
+            raise ValueError("Session code length must be at least 1")
+        if any(char not in ALPHABET for char in prefix):
+            raise ValueError(f"Session code prefix must only use A-Z and 0-9: {prefix!r}")
+
+        self.length = length
+        self.prefix = prefix
+        self.capacity = len(ALPHABET) ** length
+        key = secrets.token_bytes(KEY_BYTES) if seed is None else random.Random(seed).randbytes(KEY_BYTES)
+        self.permutation = FeistelPermutation(self.capacity, key)
+        self._next = 0
+        self._free: deque[str] = deque()
+        self._in_use: set[str] = set()
+
+    def code(self, n: int) -> str:
+        """Return the n-th code of the permutation (0 <= n < capacity)."""
+        value = self.permutation(n)
+        chars = []
+        for _ in range(self.length):
+            value, digit = divmod(value, len(ALPHABET))
+            chars.append(ALPHABET[digit])
+        return self.prefix + "".join(reversed(chars))
+
+    async def allocate(self) -> str:
+        """
+        Take an unused code.
+
+        Returns:
+            Session code
+
+        Raises:
+            RuntimeError: If every code is in use
+        """
+        if self._next < self.capacity:
+            code = self.code(self._next)
+            self._next += 1
+        elif self._free:
+            code = self._free.popleft()
+        else:
+            raise RuntimeError(f"All {self.capacity} session codes are in use")
+        self._in_use.add(code)
+        return code
+
+    async def release(self, code: str) -> bool:
+        """
+        Return a code to the pool.
+
+        Args:
+            code: Code from allocate()
+
+        Returns:
+            True if the code was in use, False otherwise
+        """
+        if code not in self._in_use:
+            return False
+        self._in_use.remove(code)
+        self._free.append(code)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Capacity and codes currently in use."""
+        return {"capacity": self.capacity, "in_use": len(self._in_use)}
+
+
+class RedisCodeAllocator(CodeAllocator):
+    """
+    Hand out unique session codes shared by every worker on one Redis.
+
+    The counter is an INCR key and the permutation key is stored next to
+    it by the first worker to allocate, so every worker maps the same
+    counter value to the same code. Codes in use are a set and released
+    codes a list, both keyed by prefix. `client` is a redis.asyncio client.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        length: int = 4,
+        prefix: str = "",
+        key_prefix: str = "livequiz:codes:",
+    ):
+        super().__init__(length, prefix)
+        self.client = client
+        base = f"{key_prefix}{prefix}{length}:"
+        self.counter_key = f"{base}next"
+        self.free_key = f"{base}free"
+        self.in_use_key = f"{base}in_use"
+        self.key_key = f"{base}key"
+        self._key_loaded = False
+        self._in_use_count = 0  # as of this worker's last allocate/release
+
+    @staticmethod
+    def _decode(value: Any) -> Optional[str]:
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def _load_key(self) -> None:
+        """Adopt the permutation key of the first worker (or publish ours)."""
+        if self._key_loaded:
+            return
+        await self.client.set(self.key_key, self.permutation.key.hex(), nx=True)
+        key = bytes.fromhex(self._decode(await self.client.get(self.key_key)))
+        self.permutation = FeistelPermutation(self.capacity, key)
+        self._key_loaded = True
+
+    async def allocate(self) -> str:
+        await self._load_key()
+        while True:
+            n = await self.client.incr(self.counter_key) - 1
+            if n < self.capacity:
+                code = self.code(n)
+            else:
+                code = self._decode(await self.client.lpop(self.free_key))
+                if code is None:
+                    raise RuntimeError(f"All {self.capacity} session codes are in use")
+            pipe = self.client.pipeline()
+            pipe.sadd(self.in_use_key, code)
+            pipe.scard(self.in_use_key)
+            added, self._in_use_count = await pipe.execute()
+            # A code can already be in use if the key changed under a running
+            # counter (e.g. its Redis key was deleted); take the next one
+            if added:
+                return code
+
+    async def release(self, code: str) -> bool:
+        # SREM succeeds for one caller only, so a code is never freed twice
+        if not await self.client.srem(self.in_use_key, code):
+            return False
+        await self.client.rpush(self.free_key, code)
+        self._in_use_count = max(0, self._in_use_count - 1)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        # Metrics are collected synchronously; the count is refreshed by allocate()
+        return {"capacity": self.capacity, "in_use": self._in_use_count}
+
+
+def build_code_allocator(store: SessionStore, length: int = 4, prefix: str = "") -> CodeAllocator:
+    """
+    Build the code allocator matching a session store.
+
+    Args:
+        store: The configured session store
+        length: Characters after the prefix
+        prefix: Per-node prefix ("" for none)
+
+    Returns:
+        A Redis allocator for a Redis store, a local one otherwise
+    """
+    if isinstance(store, RedisSessionStore):
+        return RedisCodeAllocator(store.client, length, prefix)
+    return CodeAllocator(length, prefix)
@@ -2,95 +2,829 @@
 Session persistence manager.
 
 Saves completed sessions to the database when they finish.
+
+Finished sessions go through PersistenceQueue: they are appended to a local
+spool file first and written to the database by a background worker, so a
+slow or unavailable database neither delays the socket handlers nor loses
+the quiz.
+
+In incremental mode (LIVE_PERSISTENCE_MODE = "incremental") a session is
+written as a stream of records through the same queue instead:
+
+- "start": the Session row (status running) and its participants
+- "question": one closed question with every answer given to it
+- "finish": final scores, correct/wrong counts and the final status
+
+Answers travel column-wise, as SessionManager keeps them (QuestionAnswers):
+a question block holds parallel "sids", "options" and "response_ms" lists
+next to its correct option.
 """
 
 import asyncio
-from datetime import datetime
-from typing import Any
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
 
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.db.models import Count, Q
 from django.utils import timezone
 
+from ..utils.logs import get_logger
+from .answers import QuestionAnswers
 
-async def persist_session(session_data: dict[str, Any]) -> int | None:
-    """
-    Persist a finished session to the database.
 
-    Args:
-        session_data: The in-memory session dict from SessionManager
+# Rows per INSERT statement for answer bulk inserts
+ANSWER_BATCH_SIZE = 1000
 
-    Returns:
-        Session ID if saved successfully, None otherwise
+# Persistence modes
+MODE_FINISH = "finish"  # whole session written once it finishes
+MODE_INCREMENTAL = "incremental"  # start, each closed question, then totals
+
+# Final Session.Status of a persisted session: the quiz ran to the end, or
+# it was abandoned (teacher gone) while running
+STATUS_FINISHED = "finished"
+STATUS_CANCELLED = "cancelled"
+
+# Errors worth retrying: the database is unreachable or the connection broke.
+# Anything else (integrity errors, malformed records) fails the same way again.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+log = get_logger("PERSISTENCE")
+
+
+def _persist_session_sync(session_data: dict[str, Any]) -> int | None:
+    """
+    Synchronous function to save a finished session.
+
+    Everything is written in one transaction with one bulk INSERT per table
+    (answers are chunked by ANSWER_BATCH_SIZE), so the query count no longer
+    grows with students x questions.
     """
     from live.models import Session, SessionParticipant, SessionQuestion, SessionAnswer
-    from quizzes.models import Topic, AnswerOption
+    from quizzes.models import Topic
 
-    def _save():
-        try:
-            topic = Topic.objects.select_related('teacher').get(pk=session_data['topic_id'])
-        except Topic.DoesNotExist:
-            return None
+    try:
+        topic = Topic.objects.select_related('teacher').get(pk=session_data['topic_id'])
+    except Topic.DoesNotExist:
+        return None
 
+    questions = session_data.get('questions', [])
+    students = session_data.get('students', {})
+
+    # sid -> [answered, correct]
+    counts: dict[str, list[int]] = {}
+    for block in questions:
+        correct_option_id = block['correct_option_id']
+        for sid, option_id in zip(block['sids'], block['options']):
+            count = counts.setdefault(sid, [0, 0])
+            count[0] += 1
+            count[1] += option_id == correct_option_id
+
+    with transaction.atomic():
         # Create Session
         session = Session.objects.create(
             code=session_data['session_id'],
             topic=topic,
             teacher=topic.teacher,
-            status=Session.Status.FINISHED,
+            status=session_data.get('status', STATUS_FINISHED),
             started_at=session_data.get('started_at') or timezone.now(),
             finished_at=timezone.now(),
             time_per_question=session_data['time_per_question'],
-            total_questions=len(session_data.get('answered_questions', [])),
+            total_questions=len(questions),
         )
 
         # Create SessionQuestions
-        sq_map = {}  # question_id -> SessionQuestion
-        for order, q_data in enumerate(session_data.get('answered_questions', []), start=1):
-            sq = SessionQuestion.objects.create(
-                session=session,
-                question_id=q_data['question_id'],
-                order=order
-            )
-            sq_map[q_data['question_id']] = sq
-
-        # Create SessionParticipants and their answers
-        for sid, student_data in session_data.get('students', {}).items():
-            # Calculate correct/wrong counts
-            student_answers = session_data.get('student_answers', {}).get(sid, {})
-            correct_count = 0
-            wrong_count = 0
-
-            for q_id, answer_data in student_answers.items():
-                if answer_data.get('is_correct'):
-                    correct_count += 1
-                else:
-                    wrong_count += 1
+        session_questions = SessionQuestion.objects.bulk_create([
+            SessionQuestion(session=session, question_id=q_data['question_id'], order=order)
+            for order, q_data in enumerate(questions, start=1)
+        ])
+        sq_map = {sq.question_id: sq for sq in session_questions}  # question_id -> SessionQuestion
 
-            participant = SessionParticipant.objects.create(
+        # Create SessionParticipants with their correct/wrong counts
+        participants = []
+        for sid, student_data in students.items():
+            answered, correct_count = counts.get(sid, (0, 0))
+
+            participants.append(SessionParticipant(
                 session=session,
                 student_name=student_data['name'],
                 socket_id=sid,
                 score=student_data.get('score', 0),
                 correct_answers=correct_count,
-                wrong_answers=wrong_count,
+                wrong_answers=answered - correct_count,
+            ))
+        participants = SessionParticipant.objects.bulk_create(participants)
+
+        # Backends that can't return PKs from bulk_create: resolve them in one query
+        if participants and participants[0].pk is None:
+            pk_map = dict(
+                SessionParticipant.objects.filter(session=session)
+                .values_list('socket_id', 'id')
+            )
+            for participant in participants:
+                participant.pk = pk_map[participant.socket_id]
+
+        # Create SessionAnswers, question by question
+        by_sid = {participant.socket_id: participant.pk for participant in participants}
+        answers = []
+        for block in questions:
+            answers.extend(
+                _answer_rows(block, sq_map[block['question_id']], by_sid, session=session)
             )
+        SessionAnswer.objects.bulk_create(answers, batch_size=ANSWER_BATCH_SIZE)
+
+    return session.id
+
+
+def _answer_rows(
+    block: dict[str, Any],
+    session_question: Any,
+    participants: dict[str, Any],
+    **fields: Any,
+) -> list[Any]:
+    """
+    Build the SessionAnswer rows of one question block.
+
+    Args:
+        block: Question block from _encode_answers()
+        session_question: The question's SessionQuestion
+        participants: socket ID -> participant ID; answers of other
+            socket IDs are skipped
+        **fields: Extra SessionAnswer fields (session or session_id)
+
+    Returns:
+        Unsaved SessionAnswer instances
+    """
+    from live.models import SessionAnswer
+
+    correct_option_id = block['correct_option_id']
+    started_at = _parse_dt(block['question_started_at'])
+    rows = []
+    for sid, option_id, response_ms in zip(block['sids'], block['options'], block['response_ms']):
+        participant_id = participants.get(sid)
+        if participant_id is None:
+            continue
+        answered_at = started_at + timedelta(milliseconds=response_ms) if started_at else None
+        rows.append(SessionAnswer(
+            participant_id=participant_id,
+            session_question=session_question,
+            selected_option_id=option_id,
+            is_correct=option_id == correct_option_id,
+            answered_at=answered_at,
+            response_time_ms=response_ms,
+            **fields,
+        ))
+    return rows
 
-            # Create SessionAnswers
-            for q_id_str, answer_data in student_answers.items():
-                q_id = int(q_id_str) if isinstance(q_id_str, str) else q_id_str
-                sq = sq_map.get(q_id)
-                if not sq:
+
+async def persist_session(session_data: dict[str, Any], status: str = STATUS_FINISHED) -> int | None:
+    """
+    Persist a finished session to the database.
+
+    Args:
+        session_data: The in-memory session dict from SessionManager
+        status: Final status (STATUS_FINISHED or STATUS_CANCELLED)
+
+    Returns:
+        Session ID if saved successfully, None otherwise
+    """
+    # Snapshot on the loop thread; the session keeps changing while we write
+    record = _encode_session(session_data, status)
+    return await asyncio.to_thread(_persist_session_sync, _decode_session(record))
+
+
+def _dt(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_dt(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _encode_answers(answers: QuestionAnswers, sids: list[Optional[str]]) -> dict[str, Any]:
+    """
+    Snapshot one closed question's answers as a column-wise block.
+
+    Args:
+        answers: The question's answers
+        sids: The session's StudentTable.sids (slot -> socket ID); answers
+            of students who have left are dropped
+
+    Returns:
+        {"question_id", "correct_option_id", "question_started_at",
+        "sids", "options", "response_ms"}
+    """
+    block_sids, options, response_times = [], [], []
+    for slot, option_id, _, response_ms in answers.rows():
+        sid = sids[slot] if slot < len(sids) else None
+        if sid is not None:
+            block_sids.append(sid)
+            options.append(option_id)
+            response_times.append(response_ms)
+    return {
+        "question_id": answers.question_id,
+        "correct_option_id": answers.correct_option_id,
+        "question_started_at": _dt(answers.started_at),
+        "sids": block_sids,
+        "options": options,
+        "response_ms": response_times,
+    }
+
+
+def _encode_session(session_data: dict[str, Any], status: str) -> dict[str, Any]:
+    """Snapshot the fields persist_session needs as JSON-compatible data."""
+    sids = session_data["students"].sids
+    return {
+        "session_id": session_data["session_id"],
+        "topic_id": session_data["topic_id"],
+        "status": status,
+        "time_per_question": session_data["time_per_question"],
+        # Fixed at submit time so a replayed record can be recognised
+        "started_at": _dt(session_data.get("started_at") or datetime.utcnow()),
+        "students": session_data["students"].to_dict(),
+        "questions": [
+            _encode_answers(answers, sids) for answers in session_data.get("answer_history", [])
+        ],
+    }
+
+
+def _decode_session(record: dict[str, Any]) -> dict[str, Any]:
+    """Reverse _encode_session."""
+    session_data = dict(record)
+    session_data["started_at"] = _parse_dt(record.get("started_at"))
+    return session_data
+
+
+def _is_persisted_sync(session_data: dict[str, Any]) -> bool:
+    """Check whether a replayed session already reached the database."""
+    from live.models import Session
+
+    return Session.objects.filter(
+        code=session_data["session_id"],
+        topic_id=session_data["topic_id"],
+        started_at=session_data["started_at"],
+    ).exists()
+
+
+def _encode_session_start(session_data: dict[str, Any]) -> dict[str, Any]:
+    """Snapshot a session that just started, with its roster."""
+    return {
+        "session_id": session_data["session_id"],
+        "topic_id": session_data["topic_id"],
+        "time_per_question": session_data["time_per_question"],
+        "started_at": _dt(session_data["started_at"]),
+        "students": {sid: name for sid, name, _ in session_data["students"].entries()},
+    }
+
+
+def _encode_question(session_data: dict[str, Any], question_id: int) -> dict[str, Any]:
+    """
+    Snapshot one closed question and the answers given to it.
+
+    The question must still be in answer_history; its order counts the
+    questions already released by SessionManager.release_question_history().
+    """
+    position, answers = next(
+        (i, answers) for i, answers in enumerate(session_data["answer_history"])
+        if answers.question_id == question_id
+    )
+    return {
+        "session_id": session_data["session_id"],
+        "topic_id": session_data["topic_id"],
+        "started_at": _dt(session_data["started_at"]),
+        "order": session_data.get("flushed_questions", 0) + position + 1,
+        **_encode_answers(answers, session_data["students"].sids),
+    }
+
+
+def _encode_session_finish(session_data: dict[str, Any], status: str) -> dict[str, Any]:
+    """Snapshot the final scores and status of a session persisted incrementally."""
+    return {
+        "session_id": session_data["session_id"],
+        "topic_id": session_data["topic_id"],
+        "status": status,
+        "started_at": _dt(session_data["started_at"]),
+        "scores": {sid: score for sid, _, score in session_data["students"].entries()},
+    }
+
+
+def _find_session_sync(record: dict[str, Any]) -> Optional[int]:
+    """Return the DB id of the session a record belongs to, or None."""
+    from live.models import Session
+
+    return Session.objects.filter(
+        code=record["session_id"],
+        topic_id=record["topic_id"],
+        started_at=_parse_dt(record["started_at"]),
+    ).values_list("id", flat=True).first()
+
+
+def _persist_session_start_sync(record: dict[str, Any]) -> int | None:
+    """
+    Create the running Session and its participants (idempotent).
+
+    Returns:
+        DB session id, or None if the topic no longer exists
+    """
+    from live.models import Session, SessionParticipant
+    from quizzes.models import Topic
+
+    existing = _find_session_sync(record)
+    if existing is not None:
+        return existing
+
+    try:
+        topic = Topic.objects.select_related('teacher').get(pk=record['topic_id'])
+    except Topic.DoesNotExist:
+        return None
+
+    with transaction.atomic():
+        session = Session.objects.create(
+            code=record['session_id'],
+            topic=topic,
+            teacher=topic.teacher,
+            status=Session.Status.RUNNING,
+            started_at=_parse_dt(record['started_at']),
+            time_per_question=record['time_per_question'],
+            total_questions=0,
+        )
+        SessionParticipant.objects.bulk_create([
+            SessionParticipant(session=session, student_name=name, socket_id=sid)
+            for sid, name in record['students'].items()
+        ])
+    return session.id
+
+
+def _persist_question_sync(record: dict[str, Any]) -> int | None:
+    """
+    Write one closed question and its answers (idempotent).
+
+    Returns:
+        DB session id, or None if the session was never stored
+    """
+    from live.models import SessionAnswer, SessionParticipant, SessionQuestion
+
+    session_pk = _find_session_sync(record)
+    if session_pk is None:
+        return None
+
+    with transaction.atomic():
+        session_question, created = SessionQuestion.objects.get_or_create(
+            session_id=session_pk,
+            question_id=record['question_id'],
+            defaults={'order': record['order']},
+        )
+        if not created:
+            return session_pk  # replayed record, answers were written with it
+
+        participants = dict(
+            SessionParticipant.objects.filter(session_id=session_pk)
+            .values_list('socket_id', 'id')
+        )
+        SessionAnswer.objects.bulk_create(
+            _answer_rows(record, session_question, participants, session_id=session_pk),
+            batch_size=ANSWER_BATCH_SIZE,
+        )
+    return session_pk
+
+
+def _persist_session_finish_sync(record: dict[str, Any]) -> int | None:
+    """
+    Write participant totals and the final status (idempotent).
+
+    Correct/wrong counts are aggregated from the stored answers, so students
+    who left during the quiz are counted too. Scores come from the record.
+
+    Returns:
+        DB session id, or None if the session was never stored
+    """
+    from live.models import Session, SessionParticipant, SessionQuestion
+
+    session_pk = _find_session_sync(record)
+    if session_pk is None:
+        return None
+
+    with transaction.atomic():
+        participants = list(
+            SessionParticipant.objects.filter(session_id=session_pk).annotate(
+                answered=Count('answers'),
+                correct=Count('answers', filter=Q(answers__is_correct=True)),
+            )
+        )
+        for participant in participants:
+            participant.score = record['scores'].get(participant.socket_id, participant.score)
+            participant.correct_answers = participant.correct
+            participant.wrong_answers = participant.answered - participant.correct
+        SessionParticipant.objects.bulk_update(
+            participants, ['score', 'correct_answers', 'wrong_answers']
+        )
+
+        Session.objects.filter(pk=session_pk).update(
+            status=record.get('status', STATUS_FINISHED),
+            finished_at=timezone.now(),
+            total_questions=SessionQuestion.objects.filter(session_id=session_pk).count(),
+        )
+    return session_pk
+
+
+def _persist_full_session_sync(record: dict[str, Any], replayed: bool) -> int | str | None:
+    """Write a spooled finished session, skipping replays already stored."""
+    session_data = _decode_session(record)
+    if replayed and _is_persisted_sync(session_data):
+        return "already stored"
+    return _persist_session_sync(session_data)
+
+
+# Record kind -> writer(record, replayed); writers return None to drop a record
+RECORD_WRITERS = {
+    "session": _persist_full_session_sync,
+    "start": lambda record, replayed: _persist_session_start_sync(record),
+    "question": lambda record, replayed: _persist_question_sync(record),
+    "finish": lambda record, replayed: _persist_session_finish_sync(record),
+}
+
+
+class PersistenceQueue:
+    """
+    Write-behind queue for finished sessions.
+
+    submit() appends the session to an append-only spool file (JSON lines,
+    fsynced) and queues it. A single worker task writes queued sessions to
+    the database in batches; each session is its own transaction. A "done"
+    record is appended once a session is stored, and start() replays every
+    spooled session without one, so nothing is lost across restarts.
+
+    Transient failures (TRANSIENT_ERRORS) are retried with exponential
+    backoff, per session: other sessions keep being written meanwhile. A
+    record that fails with any other error, or `max_attempts` times, is
+    appended to the dead-letter file (JSON lines with the error) and marked
+    done, so it neither blocks the queue nor keeps the spool from being
+    emptied.
+
+    submit_start(), submit_question() and submit_finish() queue the records
+    of an incrementally persisted session the same way. Records are written
+    in submission order; once a record fails, later records of the same
+    session wait for the retry.
+    """
+
+    LATENCY_SAMPLES = 1024
+
+    def __init__(
+        self,
+        spool_path: str | Path,
+        batch_size: int = 20,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        max_attempts: int = 10,
+        dead_letter_path: str | Path | None = None,
+    ):
+        self.spool_path = Path(spool_path)
+        self.dead_letter_path = (
+            Path(dead_letter_path) if dead_letter_path
+            else self.spool_path.with_name(f"{self.spool_path.stem}.dead.jsonl")
+        )
+        self.batch_size = batch_size
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_attempts = max_attempts
+
+        # {"id", "kind", "record", "submitted", "replayed", "attempts"}
+        self._pending: deque[dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._started: Optional[asyncio.Task] = None  # spool replay, awaited by every submit
+        self._task: Optional[asyncio.Task] = None
+        self._spool_lock = threading.Lock()
+        self._outstanding = 0  # spooled records without a done record
+        self._retry_at: dict[tuple[str, Optional[str]], float] = {}  # session key -> monotonic time
+
+        self.flushed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.dead = 0
+        self._latency: deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+
+    # ------------------------------------------------------------------ API
+
+    async def start(self) -> None:
+        """Replay the spool and start the worker (idempotent)."""
+        if self._started is None:
+            self._started = asyncio.get_running_loop().create_task(self._replay())
+        await self._started
+
+    async def _replay(self) -> None:
+        replayed = await asyncio.to_thread(self._load_spool)
+        for job_id, (kind, record) in replayed:
+            self._pending.append({
+                "id": job_id,
+                "kind": kind,
+                "record": record,
+                "submitted": time.monotonic(),
+                "replayed": True,
+                "attempts": 0,
+            })
+        if replayed:
+            log.info("Replaying %s spooled record(s)", len(replayed))
+            self._wakeup.set()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Give the worker up to `timeout` seconds to drain, then stop it."""
+        if self._task is None:
+            return
+
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        self._task.cancel()
+        self._task = None
+        self._started = None
+        # Anything left is still in the spool and is replayed by the next start()
+        self._pending.clear()
+        self._retry_at.clear()
+
+    async def submit(self, session_data: dict[str, Any], status: str = STATUS_FINISHED) -> str:
+        """
+        Spool a finished session and queue it for writing.
+
+        Returns once the session is durable on local disk.
+
+        Args:
+            session_data: The in-memory session dict from SessionManager
+            status: Final status (STATUS_FINISHED or STATUS_CANCELLED)
+
+        Returns:
+            Job ID of the spooled session
+        """
+        return await self._submit("session", _encode_session(session_data, status))
+
+    async def submit_start(self, session_data: dict[str, Any]) -> str:
+        """
+        Spool the start of an incrementally persisted session.
+
+        Args:
+            session_data: The in-memory session dict, already marked started
+
+        Returns:
+            Job ID of the spooled record
+        """
+        return await self._submit("start", _encode_session_start(session_data))
+
+    async def submit_question(self, session_data: dict[str, Any], question_id: int) -> str:
+        """
+        Spool a closed question and its answers.
+
+        Once this returns, the question's in-memory history can be released.
+
+        Args:
+            session_data: The in-memory session dict
+            question_id: Question just recorded by close_question
+
+        Returns:
+            Job ID of the spooled record
+        """
+        return await self._submit("question", _encode_question(session_data, question_id))
+
+    async def submit_finish(self, session_data: dict[str, Any], status: str = STATUS_FINISHED) -> str:
+        """
+        Spool the final scores of an incrementally persisted session.
+
+        Args:
+            session_data: The in-memory session dict
+            status: Final status (STATUS_FINISHED or STATUS_CANCELLED)
+
+        Returns:
+            Job ID of the spooled record
+        """
+        return await self._submit("finish", _encode_session_finish(session_data, status))
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Queue depth and submit-to-commit latency of recent sessions in ms.
+
+        Returns:
+            {"depth", "waiting", "flushed", "dropped", "retries", "dead",
+             "flush_latency_ms": {"mean", "p99", "max"}}
+        """
+        samples = sorted(self._latency)
+        latency = {"mean": 0.0, "p99": 0.0, "max": 0.0}
+        if samples:
+            latency = {
+                "mean": sum(samples) / len(samples) * 1000,
+                "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+                "max": samples[-1] * 1000,
+            }
+        return {
+            "depth": len(self._pending),
+            "waiting": len(self._retry_at),  # sessions backing off
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "dead": self.dead,
+            "flush_latency_ms": latency,
+        }
+
+    # ------------------------------------------------------------ internals
+
+    async def _submit(self, kind: str, record: dict[str, Any]) -> str:
+        # Replay must finish first, or it could pick up this record as well
+        await self.start()
+
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(
+            self._append_spool, {"op": "add", "id": job_id, "kind": kind, "record": record}
+        )
+
+        self._pending.append({
+            "id": job_id,
+            "kind": kind,
+            "record": record,
+            "submitted": time.monotonic(),
+            "replayed": False,
+            "attempts": 0,
+        })
+        self._wakeup.set()
+        return job_id
+
+    @staticmethod
+    def _session_key(job: dict[str, Any]) -> tuple[str, Optional[str]]:
+        return job["record"]["session_id"], job["record"]["started_at"]
+
+    def _next_batch(self) -> list[dict[str, Any]]:
+        """Pop up to batch_size jobs of sessions that are not backing off."""
+        now = time.monotonic()
+        batch, waiting = [], []
+        while self._pending and len(batch) < self.batch_size:
+            job = self._pending.popleft()
+            if self._retry_at.get(self._session_key(job), 0) > now:
+                waiting.append(job)
+            else:
+                batch.append(job)
+        self._pending.extendleft(reversed(waiting))
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._step()
+            except Exception:
+                log.exception("Persistence worker error")
+                await asyncio.sleep(self.backoff_base)
+
+    async def _step(self) -> None:
+        """Write one batch, or wait for work."""
+        if not self._pending:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+        batch = self._next_batch()
+        if not batch:
+            # Every queued session is backing off: sleep until the first retry
+            self._wakeup.clear()
+            delay = min(self._retry_at.values(), default=time.monotonic()) - time.monotonic()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(delay, 0.01))
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        try:
+            failed = await asyncio.to_thread(self._write_batch, batch)
+        except Exception:
+            # Spool I/O failed mid-batch: requeue what has no done record.
+            # Replays check the database first, so a record written just
+            # before the failure is not duplicated.
+            log.exception("Persistence batch failed, requeueing")
+            failed = [dict(job, replayed=True) for job in batch if not job.get("done")]
+
+        if failed:
+            # Keep order: failed sessions go back to the front of the queue
+            self._pending.extendleft(reversed(failed))
+            self.retries += len(failed)
+        elif not self._pending:
+            await asyncio.to_thread(self._truncate_spool)
+
+    def _backoff(self, job: dict[str, Any]) -> float:
+        """Delay the job's session before its next attempt. Returns the delay."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (job["attempts"] - 1))
+        self._retry_at[self._session_key(job)] = time.monotonic() + delay
+        return delay
+
+    def _write_batch(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Write a batch to the database (worker thread). Returns jobs to retry."""
+        failed = []
+        blocked = set()  # sessions with a failed record in this batch
+        for job in batch:
+            record = job["record"]
+            label = f"{job['kind']} record of session {record['session_id']}"
+            session_key = self._session_key(job)
+            if session_key in blocked:
+                failed.append(job)
+                continue
+
+            try:
+                db_session_id = RECORD_WRITERS[job["kind"]](record, job["replayed"])
+            except TRANSIENT_ERRORS as e:
+                close_old_connections()  # reconnect on the next attempt
+                job["attempts"] += 1
+                if job["attempts"] < self.max_attempts:
+                    delay = self._backoff(job)
+                    log.warning(
+                        "Error persisting %s (attempt %s/%s), retrying in %.1fs: %s",
+                        label, job["attempts"], self.max_attempts, delay, e,
+                    )
+                    failed.append(job)
+                    blocked.add(session_key)
                     continue
+                self._dead_letter(job, e)
+            except Exception as e:
+                job["attempts"] += 1
+                self._dead_letter(job, e)
+            else:
+                self._retry_at.pop(session_key, None)
+                if db_session_id is None:
+                    # Topic was deleted: nothing to attach the record to
+                    self.dropped += 1
+                    log.warning("Dropped %s: topic or session not found", label)
+                else:
+                    self.flushed += 1
+                    self._latency.append(time.monotonic() - job["submitted"])
+                    log.info("Persisted %s (%s)", label, db_session_id)
+            self._append_spool({"op": "done", "id": job["id"]})
+            job["done"] = True
+        return failed
+
+    def _dead_letter(self, job: dict[str, Any], error: Exception) -> None:
+        """Move a record that cannot be written to the dead-letter file (worker thread)."""
+        self._retry_at.pop(self._session_key(job), None)
+        self.dead += 1
+        log.error(
+            "Giving up on %s record of session %s after %s attempt(s): %r (kept in %s)",
+            job["kind"], job["record"]["session_id"], job["attempts"], error, self.dead_letter_path,
+        )
+        entry = {
+            "id": job["id"],
+            "kind": job["kind"],
+            "record": job["record"],
+            "attempts": job["attempts"],
+            "error": repr(error),
+            "failed_at": datetime.utcnow().isoformat(),
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._spool_lock:
+            self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.dead_letter_path, "a", encoding="utf-8") as dead:
+                dead.write(line)
+                dead.flush()
+                os.fsync(dead.fileno())
+
+    def _append_spool(self, entry: dict[str, Any]) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._spool_lock:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as spool:
+                spool.write(line)
+                spool.flush()
+                os.fsync(spool.fileno())
+            self._outstanding += 1 if entry["op"] == "add" else -1
+
+    def _load_spool(self) -> list[tuple[str, tuple[str, dict[str, Any]]]]:
+        """Read spooled records without a done record and compact the file."""
+        with self._spool_lock:
+            if not self.spool_path.exists():
+                return []
+
+            pending: dict[str, tuple[str, dict[str, Any]]] = {}  # id -> (kind, record)
+            with open(self.spool_path, encoding="utf-8") as spool:
+                for line in spool:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from a crash
+                    if entry.get("op") == "add":
+                        pending[entry["id"]] = (entry["kind"], entry["record"])
+                    elif entry.get("op") == "done":
+                        pending.pop(entry["id"], None)
 
-                SessionAnswer.objects.create(
-                    session=session,
-                    participant=participant,
-                    session_question=sq,
-                    selected_option_id=answer_data.get('option_id'),
-                    is_correct=answer_data.get('is_correct', False),
-                    answered_at=answer_data.get('answered_at'),
-                    response_time_ms=answer_data.get('response_time_ms'),
-                )
+            tmp_path = self.spool_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as spool:
+                for job_id, (kind, record) in pending.items():
+                    entry = {"op": "add", "id": job_id, "kind": kind, "record": record}
+                    spool.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                spool.flush()
+                os.fsync(spool.fileno())
+            os.replace(tmp_path, self.spool_path)
+            self._outstanding = len(pending)
+            return list(pending.items())
 
-        return session.id
+    def _truncate_spool(self) -> None:
+        """Empty the spool once every spooled record is stored."""
+        with self._spool_lock:
+            if self._outstanding == 0 and self.spool_path.exists():
+                self.spool_path.write_text("", encoding="utf-8")
 
-    return await asyncio.to_thread(_save)
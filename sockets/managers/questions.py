@@ -2,7 +2,7 @@
 Question handling for Live Quiz Socket.IO Server
 
 Handles:
-- Loading questions from database
+- Loading topic snapshots (topic + question set) through the topic cache
 - Question delivery to students
 - Answer validation
 """
@@ -11,28 +11,11 @@ import asyncio
 from typing import Any, Optional
 from datetime import datetime
 
-from .sessions import active_sessions, SessionData
-from ..utils.time import TimeUtils
-
+from quizzes.cache import topic_cache
 
-def _get_correct_option_id_sync(question_id: int) -> Optional[int]:
-    """Synchronous function to get correct option from DB."""
-    from quizzes.models import AnswerOption
-
-    try:
-        correct_option = AnswerOption.objects.get(
-            question_id=question_id,
-            is_correct=True
-        )
-        return correct_option.id
-    except AnswerOption.DoesNotExist:
-        return None
-    except AnswerOption.MultipleObjectsReturned:
-        correct_option = AnswerOption.objects.filter(
-            question_id=question_id,
-            is_correct=True
-        ).first()
-        return correct_option.id if correct_option else None
+from .answers import QuestionAnswers
+from .sessions import SessionData, SessionManager
+from ..utils.time import TimeUtils
 
 
 def _load_topic_data_sync(topic_id: int) -> Optional[dict[str, Any]]:
@@ -51,42 +34,49 @@ def _load_topic_data_sync(topic_id: int) -> Optional[dict[str, Any]]:
         return None
 
 
-def _load_question_ids_sync(topic_id: int) -> list[int]:
-    """Synchronous function to load question IDs."""
+def _serialize_question(question: Any) -> dict[str, Any]:
+    """Convert a Question with prefetched options to a plain dict."""
+    correct_option_id = None
+    options = []
+    for opt in question.options.all():
+        options.append({
+            "id": opt.id,
+            "text": opt.text,
+        })
+        if opt.is_correct:
+            correct_option_id = opt.id
+
+    return {
+        "id": question.id,
+        "text": question.text,
+        "options": options,
+        "correct_option_id": correct_option_id,
+    }
+
+
+def _load_question_set_sync(topic_id: int) -> dict[int, dict[str, Any]]:
+    """Synchronous function to load every question of a topic with its options."""
     from quizzes.models import Question
 
-    return list(
+    questions = (
         Question.objects.filter(topic_id=topic_id)
         .order_by("order_index")
-        .values_list("id", flat=True)
+        .prefetch_related("options")
     )
+    return {question.id: _serialize_question(question) for question in questions}
 
 
-def _load_question_sync(question_id: int) -> Optional[dict[str, Any]]:
-    """Synchronous function to load question with options."""
-    from quizzes.models import Question
-
-    try:
-        question = Question.objects.prefetch_related("options").get(id=question_id)
-        correct_option_id = None
-        options = []
-        for opt in question.options.all():
-            options.append({
-                "id": opt.id,
-                "text": opt.text,
-            })
-            if opt.is_correct:
-                correct_option_id = opt.id
-
-        return {
-            "id": question.id,
-            "text": question.text,
-            "options": options,
-            "correct_option_id": correct_option_id,
-        }
-    except Question.DoesNotExist:
+def _load_topic_snapshot_sync(topic_id: int) -> Optional[dict[str, Any]]:
+    """Synchronous function to load a topic with its full question set."""
+    topic_data = _load_topic_data_sync(topic_id)
+    if topic_data is None:
         return None
 
+    return {
+        "topic": topic_data,
+        "questions": _load_question_set_sync(topic_id),
+    }
+
 
 class QuestionManager:
     """Manager class for question-related operations."""
@@ -95,29 +85,62 @@ class QuestionManager:
     POINTS_CORRECT = 20
 
     @staticmethod
-    async def load_topic_data(topic_id: int) -> Optional[dict[str, Any]]:
-        """Load topic data from database."""
-        return await asyncio.to_thread(_load_topic_data_sync, topic_id)
+    async def load_topic_snapshot(topic_id: int) -> Optional[dict[str, Any]]:
+        """
+        Load a topic and its question set through the process-wide topic cache.
 
-    @staticmethod
-    async def load_question_ids(topic_id: int) -> list[int]:
-        """Load all question IDs for a topic."""
-        return await asyncio.to_thread(_load_question_ids_sync, topic_id)
+        Cache hits return without leaving the event loop. Concurrent misses
+        for the same topic share one DB load.
+
+        Returns:
+            {"topic": topic data, "questions": {question_id: data}, "version": int},
+            or None if the topic does not exist. The snapshot is shared and
+            must not be mutated.
+        """
+        snapshot = topic_cache.peek(topic_id)
+        if snapshot is not None:
+            return snapshot
+        return await asyncio.to_thread(topic_cache.get, topic_id, _load_topic_snapshot_sync)
 
     @staticmethod
-    async def load_question(question_id: int) -> Optional[dict[str, Any]]:
-        """Load a question with its options from database."""
-        return await asyncio.to_thread(_load_question_sync, question_id)
+    def get_question(session: SessionData, question_id: int) -> Optional[dict[str, Any]]:
+        """
+        Get a question from the session's snapshot (no DB access).
+
+        Args:
+            session: Session data dictionary
+            question_id: ID of the question
+
+        Returns:
+            Question data if it is part of the session, None otherwise
+        """
+        return session["questions"].get(question_id)
 
     @staticmethod
-    async def get_correct_option_id(question_id: int) -> Optional[int]:
-        """Get the correct option ID for a question."""
-        return await asyncio.to_thread(_get_correct_option_id_sync, question_id)
+    async def open_question(session_id: str, question_id: int) -> bool:
+        """
+        Make a question the session's current question, through the store.
+
+        Args:
+            session_id: The session ID
+            question_id: ID of the question to setup
+
+        Returns:
+            True if the session exists
+        """
+        now = TimeUtils.now()
+
+        def apply(session: SessionData) -> bool:
+            QuestionManager.setup_question(session, question_id, now)
+            return True
+
+        return await SessionManager.update_session(session_id, apply, False)
 
     @staticmethod
     def setup_question(
         session: SessionData,
         question_id: int,
+        now: Optional[datetime] = None,
     ) -> None:
         """
         Setup session state for a new question.
@@ -125,15 +148,39 @@ class QuestionManager:
         Args:
             session: Session data dictionary
             question_id: ID of the question to setup
+            now: Time the question opens (defaults to now)
         """
-        now = TimeUtils.now()
+        now = now or TimeUtils.now()
         time_limit = session["time_per_question"]
 
+        question_data = session["questions"].get(question_id)
+
         session["current_question"] = question_id
-        session["answers"] = {}
+        session["question_closing"] = False
+        session["question_remaining"] = None
+        session["answers"] = QuestionAnswers(question_id, now, len(session["students"].sids))
+        session["option_counts"] = {
+            option["id"]: 0 for option in question_data["options"]
+        } if question_data else {}
         session["question_started_at"] = now
         session["question_deadline"] = TimeUtils.add_seconds(now, time_limit)
 
+    @staticmethod
+    def build_distribution(session: SessionData) -> list[dict[str, int]]:
+        """
+        Build the current question's answer distribution from its counters.
+
+        Args:
+            session: Session data dictionary
+
+        Returns:
+            [{"option_id", "count"}] in the question's option order
+        """
+        return [
+            {"option_id": option_id, "count": count}
+            for option_id, count in session["option_counts"].items()
+        ]
+
     @staticmethod
     def build_question_payload(
         question_data: dict[str, Any],
@@ -172,6 +219,10 @@ class QuestionManager:
         if session["stage"] != "running":
             return False
 
+        # Question being closed (answers are being scored)
+        if session["question_closing"]:
+            return False
+
         # Check deadline
         if TimeUtils.is_expired(session["question_deadline"]):
             return False
@@ -184,7 +235,8 @@ class QuestionManager:
         correct_option_id: int,
         student_answer: Optional[int],
         score_delta: int,
-        score_total: int
+        score_total: int,
+        ranking: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         """
         Build the answer result payload for a student.
@@ -195,11 +247,12 @@ class QuestionManager:
             student_answer: ID of the student's answer (or None)
             score_delta: Points gained this question
             score_total: Total score after this question
+            ranking: The student's RankingManager.build_student_ranking() result
 
         Returns:
             Formatted answer result payload
         """
-        return {
+        payload = {
             "type": "answer_result",
             "correct": correct,
             "correct_option": correct_option_id,
@@ -207,3 +260,6 @@ class QuestionManager:
             "score_delta": score_delta,
             "score_total": score_total,
         }
+        if ranking is not None:
+            payload["ranking"] = ranking
+        return payload
@@ -3,20 +3,266 @@ Ranking logic for Live Quiz Socket.IO Server
 
 Handles:
 - Ranking calculation with tie support
+- Per-session leaderboard kept up to date as scores change
 - Winner determination
-- Scoreboard generation
+- Scoreboard generation (full for the teacher, top-K + own rank for students)
 """
 
-from typing import Any
+import bisect
+import itertools
+import sys
+from typing import Any, Iterator, Optional
 
-from .sessions import StudentData
+from .students import StudentTable
 
 
+class Leaderboard:
+    """
+    Students of one session grouped into buckets of equal score.
+
+    Positions are dense: players with equal scores share a position and the
+    next score down gets the next position (120, 120, 80 -> 1, 1, 2).
+
+    Scores live only in the session's StudentTable; the board keeps which
+    bucket each student is in. Change scores through add_points() so both
+    stay in step, and add()/remove() a student while they are in the table.
+
+    The distinct scores are kept sorted, so a score change moves one player
+    between buckets in O(log D) (D = distinct scores, at most the number of
+    questions + 1). A player's position, the winners and the top K are read
+    straight from the buckets without sorting the players. Tied players are
+    listed in the order they reached the score (join order before any points
+    are scored), not in join order as the old full sort did.
+    """
+
+    def __init__(self, students: StudentTable) -> None:
+        self.students = students
+        self._buckets: dict[int, dict[str, None]] = {}  # score -> sids, in arrival order
+        self._distinct: list[int] = []  # scores with a non-empty bucket, ascending
+
+    @classmethod
+    def from_students(cls, students: StudentTable) -> "Leaderboard":
+        """Build a leaderboard from a session's students."""
+        leaderboard = cls(students)
+        for sid in students:
+            leaderboard.add(sid)
+        return leaderboard
+
+    @classmethod
+    def from_state(cls, students: StudentTable, state: list[str]) -> "Leaderboard":
+        """Rebuild a leaderboard over `students` from to_state(), keeping the tie order."""
+        leaderboard = cls(students)
+        for sid in state:
+            leaderboard.add(sid)
+        return leaderboard
+
+    def to_state(self) -> list[str]:
+        """Socket IDs bucket by bucket, ascending score (JSON-safe; scores are the table's)."""
+        return [sid for score in self._distinct for sid in self._buckets[score]]
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self.students
+
+    def _insert(self, sid: str, score: int) -> None:
+        bucket = self._buckets.get(score)
+        if bucket is None:
+            bucket = self._buckets[score] = {}
+            bisect.insort(self._distinct, score)
+        bucket[sid] = None
+
+    def _discard(self, sid: str, score: int) -> None:
+        bucket = self._buckets[score]
+        del bucket[sid]
+        if not bucket:
+            del self._buckets[score]
+            del self._distinct[bisect.bisect_left(self._distinct, score)]
+
+    def add(self, sid: str) -> None:
+        """Put a student who was just added to the table on the board."""
+        self._insert(sid, self.students.score(sid))
+
+    def remove(self, sid: str) -> None:
+        """Take a student off the board; call before removing them from the table."""
+        self._discard(sid, self.students.score(sid))
+
+    def add_points(self, sid: str, points: int) -> int:
+        """Add points to a student's score in the table. Returns the new score."""
+        score = self.students.score(sid)
+        if not points:
+            return score
+        self._discard(sid, score)
+        score = self.students.add_points(sid, points)
+        self._insert(sid, score)
+        return score
+
+    def position(self, sid: str) -> Optional[int]:
+        """
+        A player's dense position (1 = best).
+
+        Returns:
+            Position, or None if the player is not on the board
+        """
+        if sid not in self.students:
+            return None
+        score = self.students.score(sid)
+        return len(self._distinct) - bisect.bisect_right(self._distinct, score) + 1
+
+    def winners(self) -> list[str]:
+        """Socket IDs of every player with the highest score."""
+        if not self._distinct:
+            return []
+        return list(self._buckets[self._distinct[-1]])
+
+    def buckets(self) -> Iterator[tuple[int, int, dict[str, None]]]:
+        """Yield (position, score, sids) from the best score down; do not change the board meanwhile."""
+        for position, score in enumerate(reversed(self._distinct), start=1):
+            yield position, score, self._buckets[score]
+
+    def ranked(self) -> Iterator[tuple[str, int, int]]:
+        """Yield (sid, score, position) from the best score down."""
+        for position, score, bucket in self.buckets():
+            for sid in bucket:
+                yield sid, score, position
+
+    def top(self, k: int) -> list[tuple[str, int, int]]:
+        """The first k entries of ranked()."""
+        return list(itertools.islice(self.ranked(), k))
+
+    def standings(self) -> "Standings":
+        """Where every player stands right now (see Standings)."""
+        return Standings(self)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the buckets (socket IDs and scores are the StudentTable's)."""
+        return (
+            sys.getsizeof(self._buckets) + sys.getsizeof(self._distinct)
+            + sum(sys.getsizeof(bucket) for bucket in self._buckets.values())
+        )
+
+
+class Standings:
+    """
+    One ranking of a Leaderboard: the top K and each player's neighbourhood.
+
+    Built from bucket offsets: the number of players above a score is a
+    prefix sum over the D distinct scores. A bucket is listed and indexed
+    the first time one of its players is looked up, so nothing is built per
+    player up front. Only valid until the next score change.
+    """
+
+    def __init__(self, leaderboard: Leaderboard) -> None:
+        self._names = leaderboard.students.names
+        self._slots = leaderboard.students.slots
+        self._student_scores = leaderboard.students.scores
+        self._scores = leaderboard._distinct[::-1]  # position - 1 -> score
+        self._positions = dict(zip(self._scores, range(1, len(self._scores) + 1)))  # score -> position
+        self._buckets = [leaderboard._buckets[score] for score in self._scores]
+        self._listed: dict[int, tuple[list[str], dict[str, int]]] = {}  # position -> (sids, sid -> index)
+        self._entries: dict[str, dict[str, Any]] = {}  # sid -> board entry, shared by its neighbours
+        self.offsets = list(itertools.accumulate(map(len, self._buckets), initial=0))
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    def _entry(self, sid: str, position: int) -> dict[str, Any]:
+        entry = self._entries.get(sid)
+        if entry is None:
+            entry = self._entries[sid] = {
+                "name": self._names[self._slots[sid]],
+                "score": self._scores[position - 1],
+                "position": position,
+            }
+        return entry
+
+    def _listing(self, position: int) -> tuple[list[str], dict[str, int]]:
+        """The bucket at `position` as a list and its index, built on first use."""
+        listed = self._listed.get(position)
+        if listed is None:
+            sids = list(self._buckets[position - 1])
+            listed = self._listed[position] = (sids, dict(zip(sids, range(len(sids)))))
+        return listed
+
+    def top(self, k: int) -> list[dict[str, Any]]:
+        """The first k entries [{name, score, position}], best first."""
+        entries = []
+        for position, bucket in enumerate(self._buckets, start=1):
+            if len(entries) >= k:
+                break
+            for sid in itertools.islice(bucket, k - len(entries)):
+                entries.append(self._entry(sid, position))
+        return entries
+
+    def players(self) -> list[dict[str, Any]]:
+        """The full board [{name, score, position}], best first."""
+        names, slots = self._names, self._slots
+        return [
+            {"name": names[slots[sid]], "score": score, "position": position}
+            for position, (score, bucket) in enumerate(zip(self._scores, self._buckets), start=1)
+            for sid in bucket
+        ]
+
+    def position(self, sid: str) -> int:
+        """A player's dense position (1 = best)."""
+        return self._positions[self._student_scores[self._slots[sid]]]
+
+    def index(self, sid: str) -> int:
+        """A player's 0-based place on the board: its bucket's offset plus its place in the bucket."""
+        position = self.position(sid)
+        return self.offsets[position - 1] + self._listing(position)[1][sid]
+
+    def __getitem__(self, sid: str) -> dict[str, Any]:
+        """
+        A player's standing.
+
+        Returns:
+            {"position", "above", "below"}: above/below are the neighbouring
+            entries of the board (or None)
+        """
+        position = self._positions[self._student_scores[self._slots[sid]]]
+        sids, indexes = self._listed.get(position) or self._listing(position)
+        i = indexes[sid]
+        entries = self._entries
+
+        # Neighbours come from the same bucket, or the edge of the next one
+        if i > 0:
+            neighbour, neighbour_position = sids[i - 1], position
+        elif position > 1:
+            neighbour, neighbour_position = next(reversed(self._buckets[position - 2])), position - 1
+        else:
+            neighbour = None
+        above = None if neighbour is None else (
+            entries.get(neighbour) or self._entry(neighbour, neighbour_position)
+        )
+
+        if i < len(sids) - 1:
+            neighbour, neighbour_position = sids[i + 1], position
+        elif position < len(self._buckets):
+            neighbour, neighbour_position = next(iter(self._buckets[position])), position + 1
+        else:
+            neighbour = None
+        below = None if neighbour is None else (
+            entries.get(neighbour) or self._entry(neighbour, neighbour_position)
+        )
+
+        return {"position": position, "above": above, "below": below}
+
 class RankingManager:
     """Manager class for ranking-related operations."""
 
+    # Players at the top of every student's personal ranking
+    TOP_K = 10
+
+    # Largest scoreboard page a teacher can request
+    MAX_PAGE_SIZE = 100
+
     @staticmethod
-    def rank_players(students: dict[str, StudentData]) -> list[dict[str, Any]]:
+    def rank_players(
+        students: StudentTable,
+        leaderboard: Optional[Leaderboard] = None,
+    ) -> list[dict[str, Any]]:
         """
         Calculate rankings with tie support.
 
@@ -29,90 +275,67 @@ class RankingManager:
             Karim = 60  -> position 3
 
         Args:
-            students: Dictionary of students {sid: StudentData}
+            students: The session's StudentTable
+            leaderboard: The session's leaderboard (built from students if omitted)
 
         Returns:
             List of ranked players with name, score, and position
         """
-        if not students:
-            return []
+        if leaderboard is None:
+            leaderboard = Leaderboard.from_students(students)
 
-        # Convert to list and sort by score descending
-        player_list = [
-            {"sid": sid, "name": data["name"], "score": data["score"]}
-            for sid, data in students.items()
+        slots, names = students.slots, students.names
+        return [
+            {
+                "name": names[slots[sid]],
+                "score": score,
+                "position": position,
+                "sid": sid,
+            }
+            for position, score, bucket in leaderboard.buckets()
+            for sid in bucket
         ]
-        player_list.sort(key=lambda x: x["score"], reverse=True)
-
-        # Assign positions with tie handling
-        ranked = []
-        current_position = 1
-        previous_score = None
-
-        for i, player in enumerate(player_list):
-            # If score is different from previous, update position
-            if previous_score is not None and player["score"] < previous_score:
-                current_position = i + 1
-
-            ranked.append({
-                "name": player["name"],
-                "score": player["score"],
-                "position": current_position,
-                "sid": player["sid"],
-            })
-
-            previous_score = player["score"]
-
-        return ranked
 
     @staticmethod
-    def get_winners(students: dict[str, StudentData]) -> list[dict[str, Any]]:
+    def get_winners(
+        students: StudentTable,
+        leaderboard: Optional[Leaderboard] = None,
+    ) -> list[dict[str, Any]]:
         """
         Get all players with the highest score (multiple winners possible).
 
         Args:
-            students: Dictionary of students {sid: StudentData}
+            students: The session's StudentTable
+            leaderboard: The session's leaderboard (built from students if omitted)
 
         Returns:
             List of winners with name and score
         """
-        if not students:
-            return []
-
-        # Find the maximum score
-        max_score = max(data["score"] for data in students.values())
+        if leaderboard is None:
+            leaderboard = Leaderboard.from_students(students)
 
-        # Get all players with the maximum score
-        winners = [
-            {"name": data["name"], "score": data["score"]}
-            for sid, data in students.items()
-            if data["score"] == max_score
+        return [
+            {"name": students.name(sid), "score": students.score(sid)}
+            for sid in leaderboard.winners()
         ]
 
-        return winners
-
     @staticmethod
-    def build_ranking_payload(students: dict[str, StudentData]) -> dict[str, Any]:
+    def build_ranking_payload(
+        students: StudentTable,
+        leaderboard: Optional[Leaderboard] = None,
+    ) -> dict[str, Any]:
         """
         Build the ranking payload to send to teacher.
 
         Args:
-            students: Dictionary of students {sid: StudentData}
+            students: The session's StudentTable
+            leaderboard: The session's leaderboard (built from students if omitted)
 
         Returns:
             Formatted ranking payload
         """
-        ranked = RankingManager.rank_players(students)
-
-        # Remove sid from the payload sent to clients
-        players = [
-            {
-                "name": player["name"],
-                "score": player["score"],
-                "position": player["position"],
-            }
-            for player in ranked
-        ]
+        # Entries without sid, as sent to clients
+        players = RankingManager.build_standings(students, leaderboard).players()
 
         return {
             "type": "ranking",
@@ -121,32 +344,135 @@ class RankingManager:
 
     @staticmethod
     def build_quiz_finished_payload(
-        students: dict[str, StudentData]
+        students: StudentTable,
+        leaderboard: Optional[Leaderboard] = None,
     ) -> dict[str, Any]:
         """
         Build the quiz finished payload with winners and scoreboard.
 
         Args:
-            students: Dictionary of students {sid: StudentData}
+            students: The session's StudentTable
+            leaderboard: The session's leaderboard (built from students if omitted)
 
         Returns:
             Formatted quiz finished payload
         """
-        winners = RankingManager.get_winners(students)
-        ranked = RankingManager.rank_players(students)
+        if leaderboard is None:
+            leaderboard = Leaderboard.from_students(students)
 
-        # Build scoreboard without sid
-        scoreboard = [
-            {
-                "name": player["name"],
-                "score": player["score"],
-                "position": player["position"],
-            }
-            for player in ranked
-        ]
+        winners = RankingManager.get_winners(students, leaderboard)
+        scoreboard = RankingManager.build_standings(students, leaderboard).players()
 
         return {
             "type": "quiz_finished",
             "winners": winners,
             "scoreboard": scoreboard,
         }
+
+    @staticmethod
+    def build_standings(
+        students: StudentTable,
+        leaderboard: Optional[Leaderboard] = None,
+    ) -> Standings:
+        """
+        Rank every player once, without walking the whole board.
+
+        Args:
+            students: The session's StudentTable
+            leaderboard: The session's leaderboard (built from students if omitted)
+
+        Returns:
+            Standings: top(k) for the shared top K, standings[sid] for a
+            player's {"position", "above", "below"}, players() for the full
+            board and len() for the number of ranked players
+        """
+        if leaderboard is None:
+            leaderboard = Leaderboard.from_students(students)
+        return leaderboard.standings()
+
+    @staticmethod
+    def build_student_ranking(
+        top: list[dict[str, Any]],
+        standing: dict[str, Any],
+        total: int,
+    ) -> dict[str, Any]:
+        """
+        Build a student's compact ranking: the top K plus their own neighbourhood.
+
+        Args:
+            top: First TOP_K entries of the board (shared by every student)
+            standing: The student's entry from build_standings()[sid]
+            total: Number of ranked players
+
+        Returns:
+            {"top", "position", "above", "below", "total"}
+        """
+        return {
+            "top": top,
+            "position": standing["position"],
+            "above": standing["above"],
+            "below": standing["below"],
+            "total": total,
+        }
+
+    @staticmethod
+    def build_student_finished_payload(
+        winners: list[dict[str, Any]],
+        ranking: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Build a student's quiz finished payload.
+
+        `scoreboard` holds only the top K, so existing clients keep working.
+        Winners are capped at TOP_K as well; `winners_total` has the count.
+
+        Args:
+            winners: Result of get_winners()
+            ranking: The student's build_student_ranking() result
+
+        Returns:
+            Formatted quiz finished payload
+        """
+        return {
+            "type": "quiz_finished",
+            "winners": winners[:RankingManager.TOP_K],
+            "winners_total": len(winners),
+            "scoreboard": ranking["top"],
+            "ranking": ranking,
+        }
+
+    @staticmethod
+    def build_scoreboard_page(
+        students: StudentTable,
+        leaderboard: Leaderboard,
+        offset: int,
+        limit: int,
+    ) -> dict[str, Any]:
+        """
+        Build one page of the full scoreboard.
+
+        Only the entries up to offset + limit are visited.
+
+        Args:
+            students: The session's StudentTable
+            leaderboard: The session's leaderboard
+            offset: Index of the first entry (0 = best)
+            limit: Maximum number of entries (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            {"type", "total", "offset", "limit", "players"}
+        """
+        offset = max(0, offset)
+        limit = max(1, min(limit, RankingManager.MAX_PAGE_SIZE))
+        page = itertools.islice(leaderboard.ranked(), offset, offset + limit)
+
+        return {
+            "type": "scoreboard",
+            "total": len(leaderboard),
+            "offset": offset,
+            "limit": limit,
+            "players": [
+                {"name": students.name(sid), "score": score, "position": position}
+                for sid, score, position in page
+            ],
+        }
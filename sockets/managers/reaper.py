@@ -0,0 +1,210 @@
+"""
+Session reaper for Live Quiz Socket.IO Server
+
+Handles:
+- Finding sessions that no longer need to be kept: finished, idle, or
+  left without a connected teacher
+- Evicting them from one periodic task, persisting what is unsaved first
+- Reporting the sessions and the memory reclaimed
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from ..utils.logs import get_logger
+from .sessions import SessionData, SessionManager
+
+log = get_logger("REAPER")
+
+# Eviction reasons
+REASON_FINISHED = "finished"
+REASON_IDLE = "idle"
+REASON_TEACHERLESS = "teacherless"
+
+# Seconds a worker holds the right to evict a session (see SessionStore.claim)
+CLAIM_TTL = 300
+
+
+def session_nbytes(session: SessionData) -> int:
+    """
+    Approximate memory held by a session's own structures.
+
+    The question snapshot is shared with the topic cache and not counted.
+
+    Args:
+        session: Session data dictionary
+
+    Returns:
+        Size in bytes
+    """
+    return (
+        sys.getsizeof(session)
+        + sys.getsizeof(session["question_queue"])
+        + session["students"].nbytes()
+        + session["leaderboard"].nbytes()
+        + session["answers"].nbytes()
+        + sum(answers.nbytes() for answers in session["answer_history"])
+    )
+
+
+class SessionReaper:
+    """
+    Evict expired sessions from a single periodic task.
+
+    Every `interval` seconds the store is swept and a session is evicted when
+    nothing changed in it (session["last_activity"]) for:
+
+    - `finished_ttl` seconds once it is finished, so late clients can still
+      read the results for a while
+    - `teacherless_ttl` seconds while `teacher_connected(teacher_sid)` is
+      False (left as None when teacher sockets can live on other workers)
+    - `idle_ttl` seconds in any stage
+
+    `evict(session, reason)` persists whatever is not stored yet and deletes
+    the session. It returns False to keep the session until the next sweep,
+    e.g. when persisting failed.
+    """
+
+    def __init__(
+        self,
+        evict: Callable[[SessionData, str], Awaitable[bool]],
+        interval: float = 60,
+        finished_ttl: float = 600,
+        idle_ttl: float = 3600,
+        teacherless_ttl: float = 120,
+        teacher_connected: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        self.evict = evict
+        self.interval = interval
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self.teacherless_ttl = teacherless_ttl
+        self.teacher_connected = teacher_connected
+        self._task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.failures = 0
+        self.reaped = {REASON_FINISHED: 0, REASON_IDLE: 0, REASON_TEACHERLESS: 0}
+        self.reclaimed_bytes = 0
+        self.last_sweep_ms = 0.0
+
+    def start(self) -> None:
+        """Start the sweep task (idempotent). Must be called from a running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the sweep task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def expiry_reason(self, session: SessionData, now: float) -> Optional[str]:
+        """
+        Decide whether a session should be evicted.
+
+        Args:
+            session: Session data dictionary
+            now: Current time.time()
+
+        Returns:
+            The eviction reason, or None to keep the session
+        """
+        # Sessions stored before last_activity existed expire with the store's own TTL
+        idle = now - session.get("last_activity", now)
+        if session["stage"] == SessionManager.STAGE_FINISHED and idle >= self.finished_ttl:
+            return REASON_FINISHED
+        if (
+            self.teacher_connected is not None
+            and idle >= self.teacherless_ttl
+            and not self.teacher_connected(session["teacher_sid"])
+        ):
+            return REASON_TEACHERLESS
+        if idle >= self.idle_ttl:
+            return REASON_IDLE
+        return None
+
+    async def sweep(self) -> dict[str, int]:
+        """
+        Evict every expired session once.
+
+        Returns:
+            Sessions evicted per reason and "bytes" reclaimed by this sweep
+        """
+        started = time.perf_counter()
+        now = time.time()
+        expired = []
+        async for session in SessionManager.store.sessions():
+            reason = self.expiry_reason(session, now)
+            if reason is not None:
+                expired.append((session, reason))
+
+        result = dict.fromkeys(self.reaped, 0)
+        result["bytes"] = 0
+        for session, reason in expired:
+            session_id = session["session_id"]
+            if self.expiry_reason(session, time.time()) is None:
+                continue  # touched while earlier sessions were evicted
+            if not await SessionManager.store.claim(session_id, CLAIM_TTL):
+                continue  # another worker is evicting it
+
+            nbytes = session_nbytes(session)
+            try:
+                evicted = await self.evict(session, reason)
+            except Exception as e:
+                log.error("Error evicting session %s: %s", session_id, e, event="reaper.error")
+                evicted = False
+            # Let socket handlers run between evictions of a large backlog
+            await asyncio.sleep(0)
+            if not evicted:
+                self.failures += 1
+                continue
+
+            result[reason] += 1
+            result["bytes"] += nbytes
+            log.info("Evicted %s session %s (~%d bytes)", reason, session_id, nbytes, event="reaper.evicted")
+
+        for reason in self.reaped:
+            self.reaped[reason] += result[reason]
+        self.reclaimed_bytes += result["bytes"]
+        self.sweeps += 1
+        self.last_sweep_ms = (time.perf_counter() - started) * 1000
+
+        evicted = sum(result[reason] for reason in self.reaped)
+        if evicted:
+            log.info(
+                "Reaped %d sessions (%d finished, %d idle, %d teacherless), ~%.1f KiB reclaimed",
+                evicted, result[REASON_FINISHED], result[REASON_IDLE], result[REASON_TEACHERLESS],
+                result["bytes"] / 1024, event="reaper.sweep",
+            )
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                log.error("Session sweep failed: %s", e, event="reaper.error")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Reaper counters.
+
+        Returns:
+            {"sweeps", "failures", "reaped": {"finished", "idle", "teacherless"},
+             "reclaimed_bytes", "last_sweep_ms"}
+        """
+        return {
+            "sweeps": self.sweeps,
+            "failures": self.failures,
+            "reaped": dict(self.reaped),
+            "reclaimed_bytes": self.reclaimed_bytes,
+            "last_sweep_ms": self.last_sweep_ms,
+        }
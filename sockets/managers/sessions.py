@@ -5,32 +5,35 @@ Handles:
 - Session creation and storage
 - Session state management
 - Student management within sessions
+
+Sessions are kept in a pluggable SessionStore (see store.py). The default
+store wraps the module-level `active_sessions` dict. Session codes come from
+a CodeAllocator (see codes.py) and are released when a session is deleted.
 """
 
 import random
-import string
-from datetime import datetime
-from typing import Any, Optional, TypedDict
-
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, TypedDict, TypeVar
 
-class StudentData(TypedDict):
-    """Type definition for student data."""
-    name: str
-    score: int
+from .. import metrics
+from .answers import QuestionAnswers
+from .codes import CodeAllocator
+from .ranking import Leaderboard
+from .store import MemorySessionStore, SessionStore
+from .students import StudentTable
 
+T = TypeVar("T")
 
-class AnswerData(TypedDict):
-    """Type definition for persisted answer data."""
-    option_id: int
-    is_correct: bool
-    answered_at: Optional[datetime]
-    response_time_ms: Optional[int]
+# Answer response times are stored in whole milliseconds
+MILLISECOND = timedelta(milliseconds=1)
 
 
-class QuestionData(TypedDict):
-    """Type definition for answered question data."""
-    question_id: int
-    correct_option_id: int
+class StudentData(TypedDict):
+    """Type definition for student data (as returned by StudentTable.to_dict())."""
+    name: str
+    score: int
 
 
 class SessionData(TypedDict):
@@ -39,21 +42,28 @@ class SessionData(TypedDict):
     topic_id: int
     teacher_sid: str
     time_per_question: int
-    question_queue: list[int]
+    question_queue: deque[int]  # remaining question IDs, consumed from the left
+    questions: dict[int, dict[str, Any]]  # question_id -> snapshot loaded at creation
     current_question: Optional[int]
-    current_correct_option: Optional[int]  # Cached correct option ID
     question_started_at: Optional[datetime]
     question_deadline: Optional[datetime]
-    answers: dict[str, int]  # sid -> option_id (current question only)
-    students: dict[str, StudentData]  # sid -> StudentData
+    question_closing: bool  # current question claimed by close_question (see claim_question)
+    question_remaining: Optional[float]  # seconds left while the question's clock is paused
+    answers: QuestionAnswers  # answers to the current question, column-wise
+    option_counts: dict[int, int]  # option_id -> number of answers (current question only)
+    students: StudentTable  # sid -> slot; names and scores by slot
+    roster_seq: int  # sequence number of the last roster delta sent to the teacher
+    leaderboard: Leaderboard  # students bucketed by their score in `students`, kept in sync by SessionManager
     stage: str  # waiting | running | finished
+    last_activity: float  # time.time() of the last change, for the session reaper
     # Persistence tracking
     started_at: Optional[datetime]
-    answered_questions: list[QuestionData]  # questions that have been answered
-    student_answers: dict[str, dict[int, AnswerData]]  # sid -> {question_id -> AnswerData}
+    answer_history: list[QuestionAnswers]  # closed questions not yet released to persistence
+    flushed_questions: int  # answered questions already released to the persistence queue
+    persisted: bool  # final state spooled by finish_session; retried before eviction if not
 
 
-# Global storage for active sessions
+# Global storage for active sessions (backs the default in-memory store)
 active_sessions: dict[str, SessionData] = {}
 
 
@@ -65,29 +75,87 @@ class SessionManager:
     STAGE_RUNNING = "running"
     STAGE_FINISHED = "finished"
 
+    # Storage backend for all sessions
+    store: SessionStore = MemorySessionStore(active_sessions)
+
+    # Session code allocator
+    codes: CodeAllocator = CodeAllocator()
+
+    # Option IDs are database keys stored in 32-bit answer columns
+    MAX_OPTION_ID = 2**31 - 1
+
+    @staticmethod
+    def configure_store(store: SessionStore) -> None:
+        """
+        Replace the session storage backend.
+
+        Args:
+            store: Store to use for all subsequent operations
+        """
+        SessionManager.store = store
+
+    @staticmethod
+    def configure_codes(allocator: CodeAllocator) -> None:
+        """
+        Replace the session code allocator.
+
+        Args:
+            allocator: Allocator to use for all subsequent sessions
+        """
+        SessionManager.codes = allocator
+
     @staticmethod
-    def generate_session_id(length: int = 4) -> str:
+    async def update_session(
+        session_id: str,
+        apply: Callable[[SessionData], T],
+        default: Any = None,
+    ) -> Any:
         """
-        Generate a unique 4-character session ID like 'AB12'.
+        Change a session through the store.
+
+        Also marks the session as active for the session reaper. `apply`
+        may run more than once (see SessionStore.update), so it must only
+        read the session and values captured before the call.
 
         Args:
-            length: Length of the session ID (default: 4)
+            session_id: The session ID
+            apply: Function mutating the session and returning the result
+            default: Returned if the session does not exist
+
+        Returns:
+            What `apply` returned, or `default`
+        """
+        def change(session: SessionData) -> T:
+            session["last_activity"] = time.time()
+            return apply(session)
+
+        result = await SessionManager.store.update(session_id, change)
+        return default if result is None else result
+
+    @staticmethod
+    async def generate_session_id() -> str:
+        """
+        Allocate a unique session ID like 'AB12'.
+
+        Codes still held by a stored session (e.g. one created before the
+        allocator was replaced) are skipped and stay allocated until that
+        session is deleted.
 
         Returns:
             Unique session ID string
         """
-        characters = string.ascii_uppercase + string.digits
         while True:
-            session_id = ''.join(random.choices(characters, k=length))
-            if session_id not in active_sessions:
+            session_id = await SessionManager.codes.allocate()
+            if not await SessionManager.store.exists(session_id):
                 return session_id
 
     @staticmethod
-    def create_session(
+    async def create_session(
         topic_id: int,
         teacher_sid: str,
         time_per_question: int,
-        question_ids: list[int]
+        question_ids: list[int],
+        questions: Optional[dict[int, dict[str, Any]]] = None,
     ) -> SessionData:
         """
         Create a new quiz session.
@@ -97,6 +165,7 @@ class SessionManager:
             teacher_sid: Socket ID of the teacher
             time_per_question: Time allowed per question in seconds
             question_ids: List of question IDs to include
+            questions: Question snapshot {question_id: data} frozen for the session
 
         Returns:
             Created session data
@@ -105,32 +174,42 @@ class SessionManager:
         shuffled_questions = question_ids.copy()
         random.shuffle(shuffled_questions)
 
-        session_id = SessionManager.generate_session_id()
+        session_id = await SessionManager.generate_session_id()
 
+        students = StudentTable()
         session: SessionData = {
             "session_id": session_id,
             "topic_id": topic_id,
             "teacher_sid": teacher_sid,
             "time_per_question": time_per_question,
-            "question_queue": shuffled_questions,
+            "question_queue": deque(shuffled_questions),
+            "questions": questions or {},
             "current_question": None,
-            "current_correct_option": None,
             "question_started_at": None,
             "question_deadline": None,
-            "answers": {},
-            "students": {},
+            "question_closing": False,
+            "question_remaining": None,
+            "answers": QuestionAnswers(),
+            "option_counts": {},
+            "students": students,
+            "roster_seq": 0,
+            "leaderboard": Leaderboard(students),
             "stage": SessionManager.STAGE_WAITING,
+            "last_activity": time.time(),
             # Persistence tracking
             "started_at": None,
-            "answered_questions": [],
-            "student_answers": {},
+            "answer_history": [],
+            "flushed_questions": 0,
+            "persisted": False,
         }
 
-        active_sessions[session_id] = session
+        await SessionManager.store.save(session)
+        await SessionManager.store.bind_sid("teacher", teacher_sid, session_id)
+        metrics.active_sessions.inc()
         return session
 
     @staticmethod
-    def get_session(session_id: str) -> Optional[SessionData]:
+    async def get_session(session_id: str) -> Optional[SessionData]:
         """
         Get session by ID.
 
@@ -140,12 +219,12 @@ class SessionManager:
         Returns:
             Session data if found, None otherwise
         """
-        return active_sessions.get(session_id)
+        return await SessionManager.store.get(session_id)
 
     @staticmethod
-    def get_session_by_teacher(teacher_sid: str) -> Optional[SessionData]:
+    async def get_session_by_teacher(teacher_sid: str) -> Optional[SessionData]:
         """
-        Get session by teacher's socket ID.
+        Get session by teacher's socket ID (O(1) via the teacher index).
 
         Args:
             teacher_sid: Teacher's socket ID
@@ -153,15 +232,21 @@ class SessionManager:
         Returns:
             Session data if found, None otherwise
         """
-        for session in active_sessions.values():
-            if session["teacher_sid"] == teacher_sid:
-                return session
-        return None
+        session_id = await SessionManager.store.lookup_sid("teacher", teacher_sid)
+        if session_id is None:
+            return None
+
+        session = await SessionManager.store.get(session_id)
+        if not session or session["teacher_sid"] != teacher_sid:
+            # Stale entry (session gone or teacher moved to another socket)
+            await SessionManager.store.unbind_sid("teacher", teacher_sid, session_id)
+            return None
+        return session
 
     @staticmethod
-    def get_session_by_student(student_sid: str) -> Optional[SessionData]:
+    async def get_session_by_student(student_sid: str) -> Optional[SessionData]:
         """
-        Get session by student's socket ID.
+        Get session by student's socket ID (O(1) via the student index).
 
         Args:
             student_sid: Student's socket ID
@@ -169,13 +254,19 @@ class SessionManager:
         Returns:
             Session data if found, None otherwise
         """
-        for session in active_sessions.values():
-            if student_sid in session["students"]:
-                return session
-        return None
+        session_id = await SessionManager.store.lookup_sid("student", student_sid)
+        if session_id is None:
+            return None
+
+        session = await SessionManager.store.get(session_id)
+        if not session or student_sid not in session["students"]:
+            # Stale entry (session gone or student already removed)
+            await SessionManager.store.unbind_sid("student", student_sid, session_id)
+            return None
+        return session
 
     @staticmethod
-    def add_student(session_id: str, sid: str, name: str) -> bool:
+    async def add_student(session_id: str, sid: str, name: str) -> bool:
         """
         Add a student to a session.
 
@@ -187,21 +278,27 @@ class SessionManager:
         Returns:
             True if student was added, False otherwise
         """
-        session = active_sessions.get(session_id)
-        if not session:
-            return False
-
-        if session["stage"] != SessionManager.STAGE_WAITING:
+        def apply(session: SessionData) -> Optional[bool]:
+            if session["stage"] != SessionManager.STAGE_WAITING:
+                return None
+            new = sid not in session["students"]
+            if not new:
+                session["leaderboard"].remove(sid)
+            session["students"].add(sid, name)
+            session["leaderboard"].add(sid)
+            return new
+
+        new = await SessionManager.update_session(session_id, apply)
+        if new is None:
             return False
 
-        session["students"][sid] = {
-            "name": name,
-            "score": 0
-        }
+        if new:
+            metrics.active_students.inc()
+        await SessionManager.store.bind_sid("student", sid, session_id)
         return True
 
     @staticmethod
-    def remove_student(session_id: str, sid: str) -> bool:
+    async def remove_student(session_id: str, sid: str) -> bool:
         """
         Remove a student from a session.
 
@@ -212,17 +309,47 @@ class SessionManager:
         Returns:
             True if student was removed, False otherwise
         """
-        session = active_sessions.get(session_id)
-        if not session:
+        def apply(session: SessionData) -> bool:
+            if sid not in session["students"]:
+                return False
+            session["leaderboard"].remove(sid)
+            session["students"].remove(sid)
+            return True
+
+        if not await SessionManager.update_session(session_id, apply, False):
             return False
 
-        if sid in session["students"]:
-            del session["students"][sid]
-            return True
-        return False
+        metrics.active_students.dec()
+        await SessionManager.store.unbind_sid("student", sid, session_id)
+        return True
+
+    @staticmethod
+    async def set_teacher_sid(session_id: str, sid: str) -> Optional[str]:
+        """
+        Point a session at the teacher's current socket.
+
+        Args:
+            session_id: The session ID
+            sid: Teacher's new socket ID
+
+        Returns:
+            Previous teacher socket ID, or None if session not found
+        """
+        def apply(session: SessionData) -> str:
+            old_sid = session["teacher_sid"]
+            session["teacher_sid"] = sid
+            return old_sid
+
+        old_sid = await SessionManager.update_session(session_id, apply)
+        if old_sid is None:
+            return None
+
+        await SessionManager.store.unbind_sid("teacher", old_sid, session_id)
+        await SessionManager.store.bind_sid("teacher", sid, session_id)
+        return old_sid
 
     @staticmethod
-    def get_student_list(session_id: str) -> list[dict[str, Any]]:
+    async def get_student_list(session_id: str) -> list[dict[str, Any]]:
         """
         Get list of students in a session.
 
@@ -232,21 +359,31 @@ class SessionManager:
         Returns:
             List of student dictionaries with sid, name, and score
         """
-        session = active_sessions.get(session_id)
+        session = await SessionManager.store.get(session_id)
         if not session:
             return []
 
-        return [
-            {
-                "sid": sid,
-                "name": data["name"],
-                "score": data["score"]
-            }
-            for sid, data in session["students"].items()
-        ]
+        return session["students"].roster()
+
+    @staticmethod
+    async def next_roster_seq(session_id: str) -> int:
+        """
+        Allocate the sequence number of the next roster delta.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            New sequence number, or 0 if session not found
+        """
+        def apply(session: SessionData) -> int:
+            session["roster_seq"] += 1
+            return session["roster_seq"]
+
+        return await SessionManager.update_session(session_id, apply, 0)
 
     @staticmethod
-    def set_stage(session_id: str, stage: str) -> bool:
+    async def set_stage(session_id: str, stage: str) -> bool:
         """
         Set session stage.
 
@@ -257,15 +394,14 @@ class SessionManager:
         Returns:
             True if stage was set, False otherwise
         """
-        session = active_sessions.get(session_id)
-        if not session:
-            return False
+        def apply(session: SessionData) -> bool:
+            session["stage"] = stage
+            return True
 
-        session["stage"] = stage
-        return True
+        return await SessionManager.update_session(session_id, apply, False)
 
     @staticmethod
-    def pop_next_question(session_id: str) -> Optional[int]:
+    async def pop_next_question(session_id: str) -> Optional[int]:
         """
         Pop and return the next question ID from the queue.
 
@@ -275,14 +411,15 @@ class SessionManager:
         Returns:
             Question ID if available, None if queue is empty
         """
-        session = active_sessions.get(session_id)
-        if not session or not session["question_queue"]:
-            return None
+        def apply(session: SessionData) -> Optional[int]:
+            if not session["question_queue"]:
+                return None
+            return session["question_queue"].popleft()
 
-        return session["question_queue"].pop(0)
+        return await SessionManager.update_session(session_id, apply)
 
     @staticmethod
-    def has_questions_remaining(session_id: str) -> bool:
+    async def has_questions_remaining(session_id: str) -> bool:
         """
         Check if there are questions remaining in the queue.
 
@@ -292,37 +429,48 @@ class SessionManager:
         Returns:
             True if questions remain, False otherwise
         """
-        session = active_sessions.get(session_id)
+        session = await SessionManager.store.get(session_id)
         if not session:
             return False
 
         return len(session["question_queue"]) > 0
 
     @staticmethod
-    def record_answer(session_id: str, sid: str, option_id: int) -> bool:
+    async def record_answer(session_id: str, sid: str, option_id: int) -> bool:
         """
         Record a student's answer.
 
         Args:
             session_id: The session ID
             sid: Student's socket ID
-            option_id: Selected option ID
+            option_id: Selected option ID, one of the current question's options
+
+        Answers are stored through SessionStore.add_answer(), apart from
+        the rest of the session, and do not refresh `last_activity`.
 
         Returns:
-            True if answer was recorded, False otherwise
+            True if answer was recorded, False otherwise (unknown student or
+            option, or already answered)
         """
-        session = active_sessions.get(session_id)
+        if not 0 < option_id <= SessionManager.MAX_OPTION_ID:
+            return False
+        answered_at = datetime.utcnow()
+
+        session = await SessionManager.store.get(session_id)
         if not session:
             return False
 
-        if sid in session["answers"]:
-            return False  # Already answered
+        slot = session["students"].slot(sid)
+        question_id = session["current_question"]
+        if slot is None or question_id is None or option_id not in session["option_counts"]:
+            return False
 
-        session["answers"][sid] = option_id
-        return True
+        started_at = session["question_started_at"]
+        response_ms = (answered_at - started_at) // MILLISECOND if started_at else 0
+        return await SessionManager.store.add_answer(session_id, question_id, slot, option_id, response_ms)
 
     @staticmethod
-    def has_student_answered(session_id: str, sid: str) -> bool:
+    async def has_student_answered(session_id: str, sid: str) -> bool:
         """
         Check if a student has already answered the current question.
 
@@ -333,14 +481,15 @@ class SessionManager:
         Returns:
             True if student has answered, False otherwise
         """
-        session = active_sessions.get(session_id)
+        session = await SessionManager.store.get(session_id)
         if not session:
             return True  # Treat as answered if session not found
 
-        return sid in session["answers"]
+        slot = session["students"].slot(sid)
+        return slot is not None and session["answers"].answered(slot)
 
     @staticmethod
-    def all_students_answered(session_id: str) -> bool:
+    async def all_students_answered(session_id: str) -> bool:
         """
         Check if all students have answered the current question.
 
@@ -350,29 +499,56 @@ class SessionManager:
         Returns:
             True if all students answered, False otherwise
         """
-        session = active_sessions.get(session_id)
+        session = await SessionManager.store.get(session_id)
         if not session:
             return False
 
-        student_count = len(session["students"])
-        answer_count = len(session["answers"])
+        student_count = len(session["students"].slots)  # skips StudentTable.__len__ per answer
+        return student_count > 0 and SessionManager.answer_count(session) >= student_count
+
+    @staticmethod
+    def answer_count(session: SessionData) -> int:
+        """
+        Number of answers to the current question.
+
+        Read from the option counters, which also count answers recorded
+        through other workers (the local answers may not hold those yet).
+
+        Args:
+            session: Session data dictionary
 
-        return student_count > 0 and answer_count >= student_count
+        Returns:
+            Answer count
+        """
+        return sum(session["option_counts"].values())
 
     @staticmethod
-    def clear_answers(session_id: str) -> None:
+    async def clear_answers(session_id: str) -> None:
         """
-        Clear all answers for the current question.
+        Clear all answers and close the current question.
+
+        Answers of a closed question stay in answer_history without their
+        per-slot lookup.
 
         Args:
             session_id: The session ID
         """
-        session = active_sessions.get(session_id)
-        if session:
-            session["answers"] = {}
+        def apply(session: SessionData) -> Optional[int]:
+            question_id = session["current_question"]
+            session["answers"].drop_index()
+            session["answers"] = QuestionAnswers()
+            session["option_counts"] = {}
+            session["current_question"] = None
+            session["question_closing"] = False
+            session["question_remaining"] = None
+            return question_id
+
+        question_id = await SessionManager.update_session(session_id, apply)
+        if question_id is not None:
+            await SessionManager.store.drop_answers(session_id, question_id)
 
     @staticmethod
-    def update_student_score(session_id: str, sid: str, points: int) -> int:
+    async def update_student_score(session_id: str, sid: str, points: int) -> int:
         """
         Add points to a student's score.
 
@@ -384,15 +560,15 @@ class SessionManager:
         Returns:
             New total score
         """
-        session = active_sessions.get(session_id)
-        if not session or sid not in session["students"]:
-            return 0
+        def apply(session: SessionData) -> int:
+            if sid not in session["students"]:
+                return 0
+            return session["leaderboard"].add_points(sid, points)
 
-        session["students"][sid]["score"] += points
-        return session["students"][sid]["score"]
+        return await SessionManager.update_session(session_id, apply, 0)
 
     @staticmethod
-    def get_student_score(session_id: str, sid: str) -> int:
+    async def get_student_score(session_id: str, sid: str) -> int:
         """
         Get a student's current score.
 
@@ -403,57 +579,197 @@ class SessionManager:
         Returns:
             Current score
         """
-        session = active_sessions.get(session_id)
+        session = await SessionManager.store.get(session_id)
         if not session or sid not in session["students"]:
             return 0
 
-        return session["students"][sid]["score"]
+        return session["students"].score(sid)
 
     @staticmethod
-    def mark_session_started(session_id: str) -> None:
+    async def mark_session_started(session_id: str) -> None:
         """Mark the session as started with timestamp."""
-        session = active_sessions.get(session_id)
-        if session and session["started_at"] is None:
-            session["started_at"] = datetime.utcnow()
+        now = datetime.utcnow()
+
+        def apply(session: SessionData) -> bool:
+            if session["started_at"] is None:
+                session["started_at"] = now
+            return True
+
+        await SessionManager.update_session(session_id, apply)
 
     @staticmethod
-    def record_answered_question(session_id: str, question_id: int, correct_option_id: int) -> None:
-        """Record that a question was answered (for persistence)."""
-        session = active_sessions.get(session_id)
-        if session:
-            session["answered_questions"].append({
-                "question_id": question_id,
-                "correct_option_id": correct_option_id,
-            })
+    async def mark_session_persisted(session_id: str) -> None:
+        """Record that the session's final state is in the persistence queue."""
+        def apply(session: SessionData) -> bool:
+            session["persisted"] = True
+            return True
+
+        await SessionManager.update_session(session_id, apply)
+
+    @staticmethod
+    async def pause_question(session_id: str) -> Optional[float]:
+        """
+        Stop the current question's clock.
+
+        The deadline is cleared while paused, so is_answer_valid() rejects
+        answers until resume_question().
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            Seconds that were left, or None if no question is running
+        """
+        now = datetime.utcnow()
+
+        def apply(session: SessionData) -> Optional[float]:
+            deadline = session["question_deadline"]
+            if (
+                session["current_question"] is None or session["question_closing"]
+                or session["question_remaining"] is not None or deadline is None
+            ):
+                return None
+            remaining = max(0.0, (deadline - now).total_seconds())
+            session["question_remaining"] = remaining
+            session["question_deadline"] = None
+            return remaining
+
+        return await SessionManager.update_session(session_id, apply)
+
+    @staticmethod
+    async def resume_question(session_id: str) -> Optional[datetime]:
+        """
+        Restart a paused question's clock with the time it had left.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            The new deadline, or None if the question is not paused
+        """
+        now = datetime.utcnow()
+
+        def apply(session: SessionData) -> Optional[datetime]:
+            remaining = session["question_remaining"]
+            if session["current_question"] is None or remaining is None:
+                return None
+            session["question_deadline"] = now + timedelta(seconds=remaining)
+            session["question_remaining"] = None
+            return session["question_deadline"]
+
+        return await SessionManager.update_session(session_id, apply)
+
+    @staticmethod
+    async def extend_question(session_id: str, seconds: float) -> Optional[float]:
+        """
+        Move the current question's deadline (negative seconds shorten it).
+
+        A paused question keeps its clock stopped with more (or less) time left.
+
+        Args:
+            session_id: The session ID
+            seconds: Seconds to add
+
+        Returns:
+            Seconds left after the change, or None if no question is open
+        """
+        now = datetime.utcnow()
+
+        def apply(session: SessionData) -> Optional[float]:
+            if session["current_question"] is None or session["question_closing"]:
+                return None
+            remaining = session["question_remaining"]
+            if remaining is not None:
+                session["question_remaining"] = max(0.0, remaining + seconds)
+                return session["question_remaining"]
+            deadline = session["question_deadline"]
+            if deadline is None:
+                return None
+            session["question_deadline"] = deadline + timedelta(seconds=seconds)
+            return max(0.0, (session["question_deadline"] - now).total_seconds())
+
+        return await SessionManager.update_session(session_id, apply)
+
+    @staticmethod
+    async def claim_question(session_id: str) -> Optional[int]:
+        """
+        Take the right to close the current question.
+
+        Checking and setting `question_closing` happen in one update, so
+        when the deadline callback and a teacher or last-answer close race,
+        only one of them scores the question.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            The question to close, or None if there is none or another
+            close already claimed it
+        """
+        def apply(session: SessionData) -> Optional[int]:
+            if session["current_question"] is None or session["question_closing"]:
+                return None
+            session["question_closing"] = True
+            return session["current_question"]
+
+        return await SessionManager.update_session(session_id, apply)
 
     @staticmethod
-    def record_student_answer(
+    async def record_answered_question(
         session_id: str,
-        sid: str,
         question_id: int,
-        option_id: int,
-        is_correct: bool,
-        response_time_ms: int | None = None
-    ) -> None:
-        """Record a student's answer for persistence."""
-        session = active_sessions.get(session_id)
-        if not session:
-            return
+        correct_option_id: int,
+    ) -> Optional[QuestionAnswers]:
+        """
+        Close the current question's answers and keep them for persistence.
 
-        if sid not in session["student_answers"]:
-            session["student_answers"][sid] = {}
+        Correctness of every answer follows from correct_option_id; nothing
+        is stored per answer. Answers recorded through other workers are
+        read first (SessionStore.sync_answers()).
 
-        session["student_answers"][sid][question_id] = {
-            "option_id": option_id,
-            "is_correct": is_correct,
-            "answered_at": datetime.utcnow(),
-            "response_time_ms": response_time_ms,
-        }
+        Args:
+            session_id: The session ID
+            question_id: The question being closed
+            correct_option_id: ID of the correct option
+
+        Returns:
+            The question's answers, or None if the session is gone
+        """
+        def apply(session: SessionData) -> QuestionAnswers:
+            answers = session["answers"]
+            answers.question_id = question_id
+            answers.close(correct_option_id)
+            session["answer_history"].append(answers)
+            return answers
+
+        await SessionManager.store.sync_answers(session_id, question_id)
+        return await SessionManager.update_session(session_id, apply)
+
+    @staticmethod
+    async def release_question_history(session_id: str, question_id: int) -> None:
+        """
+        Drop a question and its answers from the persistence history.
+
+        Used in incremental persistence mode once the question is spooled.
+
+        Args:
+            session_id: The session ID
+            question_id: Question handed to the persistence queue
+        """
+        def apply(session: SessionData) -> bool:
+            session["answer_history"] = [
+                answers for answers in session["answer_history"]
+                if answers.question_id != question_id
+            ]
+            session["flushed_questions"] += 1
+            return True
+
+        await SessionManager.update_session(session_id, apply)
 
     @staticmethod
-    def delete_session(session_id: str) -> bool:
+    async def delete_session(session_id: str) -> bool:
         """
-        Delete a session from active sessions.
+        Delete a session, drop its socket indexes and release its code.
 
         Args:
             session_id: The session ID
@@ -461,15 +777,22 @@ class SessionManager:
         Returns:
             True if deleted, False if not found
         """
-        if session_id in active_sessions:
-            del active_sessions[session_id]
-            return True
-        return False
+        session = await SessionManager.store.get(session_id)
+        if session:
+            await SessionManager.store.unbind_sid("teacher", session["teacher_sid"], session_id)
+            for sid in session["students"]:
+                await SessionManager.store.unbind_sid("student", sid, session_id)
+            metrics.active_sessions.dec()
+            metrics.active_students.dec(len(session["students"]))
+        deleted = await SessionManager.store.delete(session_id)
+        if deleted:
+            await SessionManager.codes.release(session_id)
+        return deleted
 
     @staticmethod
     def get_room_name(session_id: str) -> str:
         """
-        Get the room name for a session.
+        Get the room name for a session's students.
 
         Args:
             session_id: The session ID
@@ -478,3 +801,35 @@ class SessionManager:
             Room name string
         """
         return f"room_{session_id}"
+
+    @staticmethod
+    def get_teacher_room_name(session_id: str) -> str:
+        """
+        Get the room name for a session's teacher socket.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            Room name string
+        """
+        return f"teacher_{session_id}"
+
+    @staticmethod
+    def get_audience_rooms(session_id: str) -> list[str]:
+        """
+        Get the rooms that together reach everyone in a session.
+
+        Emitting to this list reaches each socket once, even if it is in
+        both rooms, and encodes the packet once.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            [students room, teacher room]
+        """
+        return [
+            SessionManager.get_room_name(session_id),
+            SessionManager.get_teacher_room_name(session_id),
+        ]
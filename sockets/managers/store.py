@@ -0,0 +1,748 @@
+"""
+Session storage backends for Live Quiz Socket.IO Server
+
+Handles:
+- The storage interface used by SessionManager
+- In-memory storage (default, single process)
+- Redis storage (shared between uvicorn workers and nodes)
+- The JSON encoding of sessions kept in Redis
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional, TypeVar
+
+from ..utils.logs import get_logger
+from .answers import QuestionAnswers
+from .ranking import Leaderboard
+from .students import StudentTable
+
+if TYPE_CHECKING:
+    from .sessions import SessionData
+
+log = get_logger("STORE")
+
+T = TypeVar("T")
+
+
+def _dump_dt(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _load_dt(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+# Session fields that are not plain JSON values: name -> (encode, decode)
+SESSION_FIELDS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "question_queue": (list, deque),
+    "question_started_at": (_dump_dt, _load_dt),
+    "question_deadline": (_dump_dt, _load_dt),
+    "started_at": (_dump_dt, _load_dt),
+    "students": (StudentTable.to_state, StudentTable.from_state),
+    "leaderboard": (Leaderboard.to_state, list),  # rebound to the students in decode_session
+    "answer_history": (
+        lambda history: [answers.to_state() for answers in history],
+        lambda history: [QuestionAnswers.from_state(answers) for answers in history],
+    ),
+}
+
+# Fields stored apart from the session state: the question snapshot is
+# written once and shared, answers and their counters have their own keys
+DETACHED_FIELDS = ("questions", "answers", "option_counts")
+
+
+def encode_questions(questions: dict[int, dict[str, Any]]) -> tuple[bytes, str]:
+    """
+    Encode a question snapshot as JSON.
+
+    Returns:
+        (encoded snapshot, digest identifying it in every process)
+    """
+    raw = json.dumps(sorted(questions.items()), sort_keys=True, separators=(",", ":")).encode()
+    return raw, hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def decode_questions(raw: bytes) -> dict[int, dict[str, Any]]:
+    """Decode a snapshot written by encode_questions()."""
+    return {question_id: question for question_id, question in json.loads(raw)}
+
+
+def encode_session(session: "SessionData", questions_digest: str) -> bytes:
+    """
+    Encode a session's state as JSON, without the fields in DETACHED_FIELDS.
+
+    Students, the leaderboard and closed answers are stored as their
+    columns, never as pickles, so reading a session cannot run code.
+    """
+    state = {
+        name: SESSION_FIELDS[name][0](value) if name in SESSION_FIELDS else value
+        for name, value in session.items()
+        if name not in DETACHED_FIELDS
+    }
+    state["questions_digest"] = questions_digest
+    return json.dumps(state, separators=(",", ":")).encode()
+
+
+def decode_session(raw: bytes) -> tuple[dict[str, Any], str]:
+    """
+    Decode encode_session() output.
+
+    Returns:
+        (session without its detached fields, question snapshot digest)
+    """
+    state = json.loads(raw)
+    digest = state.pop("questions_digest")
+    session = {
+        name: SESSION_FIELDS[name][1](value) if name in SESSION_FIELDS else value
+        for name, value in state.items()
+    }
+    # The leaderboard reads its scores from the decoded StudentTable
+    session["leaderboard"] = Leaderboard.from_state(session["students"], session["leaderboard"])
+    return session, digest
+
+
+class SessionStore:
+    """
+    Interface for session storage backends.
+
+    SessionManager reads sessions with get() and changes them with update():
+    `apply(session)` mutates the session in place and returns the caller's
+    result. Backends shared between processes may run `apply` again on a
+    newer copy of the session when another process changed it first, so it
+    must only depend on the session and on values captured beforehand
+    (timestamps included), and have no other side effects.
+
+    Stores also keep reverse indexes from socket IDs to session IDs so a
+    disconnect can find its session without scanning every session.
+    """
+
+    async def get(self, session_id: str) -> Optional["SessionData"]:
+        """Return the session with this ID, or None."""
+        raise NotImplementedError
+
+    async def save(self, session: "SessionData") -> None:
+        """Store a new session (or replace one wholesale)."""
+        raise NotImplementedError
+
+    async def update(self, session_id: str, apply: Callable[["SessionData"], T]) -> Optional[T]:
+        """
+        Change a session.
+
+        Returns:
+            What `apply` returned, or None if the session does not exist
+        """
+        raise NotImplementedError
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+        raise NotImplementedError
+
+    async def exists(self, session_id: str) -> bool:
+        """Check whether a session ID is in use."""
+        raise NotImplementedError
+
+    def sessions(self) -> AsyncIterator["SessionData"]:
+        """Iterate over all stored sessions."""
+        raise NotImplementedError
+
+    async def add_answer(
+        self,
+        session_id: str,
+        question_id: int,
+        slot: int,
+        option_id: int,
+        response_ms: int,
+    ) -> bool:
+        """
+        Record an answer to the open question and count it for its option.
+
+        Answers do not go through update() (nor refresh `last_activity`):
+        the store can keep them apart from the rest of the session.
+
+        Returns:
+            False if question_id is not open or the slot already answered it
+        """
+        raise NotImplementedError
+
+    async def sync_answers(self, session_id: str, question_id: int) -> None:
+        """Make the local copy hold every answer to the open question (before it is scored)."""
+        raise NotImplementedError
+
+    async def drop_answers(self, session_id: str, question_id: int) -> None:
+        """Discard what add_answer() stored for a question once it is closed."""
+        raise NotImplementedError
+
+    async def claim(self, session_id: str, ttl: int) -> bool:
+        """
+        Take the right to evict a session, so only one worker persists it.
+
+        Returns:
+            True for the first caller within `ttl` seconds
+        """
+        raise NotImplementedError
+
+    async def bind_sid(self, role: str, sid: str, session_id: str) -> None:
+        """Index a socket ID ("student" or "teacher" role) to a session."""
+        raise NotImplementedError
+
+    async def unbind_sid(self, role: str, sid: str, session_id: str) -> None:
+        """Drop a socket ID from the index if it still points at session_id."""
+        raise NotImplementedError
+
+    async def lookup_sid(self, role: str, sid: str) -> Optional[str]:
+        """Return the session ID indexed for a socket ID, or None."""
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Keep sessions in a process-local dict.
+
+    Sessions are shared by reference, so update() applies the change once,
+    in place, and nothing is ever written back.
+    """
+
+    def __init__(self, sessions: Optional[dict[str, "SessionData"]] = None):
+        self.data: dict[str, "SessionData"] = sessions if sessions is not None else {}
+        self.indexes: dict[str, dict[str, str]] = {"student": {}, "teacher": {}}
+
+    async def get(self, session_id: str) -> Optional["SessionData"]:
+        return self.data.get(session_id)
+
+    async def save(self, session: "SessionData") -> None:
+        self.data[session["session_id"]] = session
+
+    async def update(self, session_id: str, apply: Callable[["SessionData"], T]) -> Optional[T]:
+        session = self.data.get(session_id)
+        if session is None:
+            return None
+        return apply(session)
+
+    async def delete(self, session_id: str) -> bool:
+        return self.data.pop(session_id, None) is not None
+
+    async def exists(self, session_id: str) -> bool:
+        return session_id in self.data
+
+    async def sessions(self) -> AsyncIterator["SessionData"]:
+        for session in list(self.data.values()):
+            yield session
+
+    async def add_answer(
+        self,
+        session_id: str,
+        question_id: int,
+        slot: int,
+        option_id: int,
+        response_ms: int,
+    ) -> bool:
+        session = self.data.get(session_id)
+        if session is None or session["current_question"] != question_id:
+            return False
+        if not session["answers"].add(slot, option_id, response_ms):
+            return False
+        counts = session["option_counts"]
+        counts[option_id] = counts.get(option_id, 0) + 1
+        return True
+
+    async def sync_answers(self, session_id: str, question_id: int) -> None:
+        pass  # answers are recorded on the shared session itself
+
+    async def drop_answers(self, session_id: str, question_id: int) -> None:
+        pass
+
+    async def claim(self, session_id: str, ttl: int) -> bool:
+        # One process owns these sessions; the reaper never runs twice at once
+        return session_id in self.data
+
+    async def bind_sid(self, role: str, sid: str, session_id: str) -> None:
+        self.indexes[role][sid] = session_id
+
+    async def unbind_sid(self, role: str, sid: str, session_id: str) -> None:
+        index = self.indexes[role]
+        if index.get(sid) == session_id:
+            del index[sid]
+
+    async def lookup_sid(self, role: str, sid: str) -> Optional[str]:
+        return self.indexes[role].get(sid)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Keep sessions in Redis so several workers can serve the same session code.
+
+    Each session is a hash holding its JSON state ("data", see
+    encode_session()), a version counter ("version") that is bumped on
+    every write, and the question snapshot ("questions"), written once when
+    the session is saved. Processes share one decoded snapshot per digest,
+    taken from `peek_snapshot(topic_id)` (the topic cache) when it matches.
+
+    Answers to the open question live in a hash of their own, slot ->
+    "option:response_ms", written with HSETNX so a slot answers once across
+    workers, next to a hash of per-option counters (HINCRBY). Neither
+    touches the session's version, so an answer costs two small commands
+    instead of rewriting the session. get() refreshes the counters along
+    with the version check; sync_answers() reads every answer before the
+    question is scored.
+
+    Socket ID indexes are one hash per role under ``index_prefix``.
+    Sessions this process works on are kept locally with the version they
+    were read at:
+
+    - get() compares the remote version at most once per event-loop tick and
+      only downloads the state when another worker has changed it.
+    - update() applies the change locally and journals `apply`. Dirty
+      sessions are written by a background task once the handler yields.
+    - A write is a WATCH/MULTI transaction that only succeeds if the remote
+      version is still the one the local copy was read at. Otherwise the
+      newer state is downloaded, the journaled changes are applied to it
+      again and the write is retried, so concurrent changes from two
+      workers are merged instead of overwriting each other.
+    - Local copies not used for `local_ttl` seconds are dropped, so sessions
+      deleted or expired by other workers do not pile up. sessions() does
+      not keep copies of sessions this process never worked on.
+
+    All I/O goes through the asyncio client, so the event loop never blocks
+    on Redis. Requires the optional ``redis`` package. Any client exposing
+    the redis.asyncio API can be injected, e.g.
+    ``fakeredis.FakeAsyncRedis()`` in tests.
+    """
+
+    # Attempts to write a session before its pending changes are dropped
+    MAX_WRITE_ATTEMPTS = 10
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        prefix: str = "livequiz:session:",
+        index_prefix: str = "livequiz:sid:",
+        answers_prefix: str = "livequiz:answers:",
+        ttl: int = 24 * 60 * 60,
+        local_ttl: float = 60.0,
+        peek_snapshot: Optional[Callable[[int], Optional[dict[str, Any]]]] = None,
+    ):
+        if client is None:
+            try:
+                import redis.asyncio
+            except ImportError as e:
+                raise RuntimeError(
+                    "RedisSessionStore requires the 'redis' package (pip install redis)"
+                ) from e
+            client = redis.asyncio.Redis.from_url(url or "redis://localhost:6379/0")
+
+        self.client = client
+        self.prefix = prefix
+        self.index_prefix = index_prefix
+        self.answers_prefix = answers_prefix
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.peek_snapshot = peek_snapshot
+        self._local: dict[str, tuple["SessionData", int]] = {}  # id -> (session, version)
+        self._digests: dict[str, str] = {}  # id -> digest of its question snapshot
+        self._questions: dict[str, dict[int, dict[str, Any]]] = {}  # digest -> shared snapshot
+        self._used: dict[str, float] = {}  # id -> time.monotonic() of the last get/update
+        self._journal: dict[str, list[Callable[["SessionData"], Any]]] = {}  # changes not yet written
+        self._replace: dict[str, bytes] = {}  # saved wholesale: id -> encoded questions, written without a version check
+        self._dirty: set[str] = set()
+        self._writing: set[str] = set()  # written right now by the flush task
+        self._checked: set[str] = set()  # versions confirmed during this loop tick
+        self._tick_scheduled = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._pruned_at = time.monotonic()
+
+        self.conflicts = 0
+
+    def key(self, session_id: str) -> str:
+        """Redis key holding a session."""
+        return f"{self.prefix}{session_id}"
+
+    def answers_key(self, session_id: str, question_id: int) -> str:
+        """Redis key holding the answers to one question (slot -> "option:response_ms")."""
+        return f"{self.answers_prefix}{session_id}:{question_id}"
+
+    def counts_key(self, session_id: str, question_id: int) -> str:
+        """Redis key holding the per-option answer counters of one question."""
+        return f"{self.answers_prefix}{session_id}:{question_id}:counts"
+
+    def _pending(self, session_id: str) -> bool:
+        """Whether the local copy has changes Redis does not have yet."""
+        return (
+            session_id in self._journal
+            or session_id in self._replace
+            or session_id in self._dirty
+            or session_id in self._writing
+        )
+
+    def _schedule_tick(self) -> None:
+        """Run _end_tick() once the current handler yields to the loop."""
+        if self._tick_scheduled:
+            return
+        self._tick_scheduled = True
+        asyncio.get_running_loop().call_soon(self._end_tick)
+
+    def _end_tick(self) -> None:
+        self._tick_scheduled = False
+        self._checked.clear()
+        if self._dirty and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        now = time.monotonic()
+        if now - self._pruned_at >= self.local_ttl:
+            self._pruned_at = now
+            self.prune(now)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Drop local copies not used for `local_ttl` seconds.
+
+        Copies with unwritten changes are kept. Question snapshots no
+        remaining copy uses are dropped too.
+
+        Returns:
+            Number of copies dropped
+        """
+        now = time.monotonic() if now is None else now
+        stale = [
+            session_id for session_id, used in self._used.items()
+            if now - used >= self.local_ttl and not self._pending(session_id)
+        ]
+        for session_id in stale:
+            self._forget(session_id)
+
+        used = set(self._digests.values())
+        for digest in [digest for digest in self._questions if digest not in used]:
+            del self._questions[digest]
+        return len(stale)
+
+    def _forget(self, session_id: str) -> None:
+        self._local.pop(session_id, None)
+        self._digests.pop(session_id, None)
+        self._used.pop(session_id, None)
+        self._journal.pop(session_id, None)
+        self._replace.pop(session_id, None)
+        self._dirty.discard(session_id)
+        self._checked.discard(session_id)
+
+    def _mark_dirty(self, session_id: str) -> None:
+        self._used[session_id] = time.monotonic()
+        self._dirty.add(session_id)
+        self._schedule_tick()
+
+    async def _load(self, session_id: str, raw: bytes) -> tuple["SessionData", str]:
+        """
+        Decode a session read from Redis and attach its detached fields.
+
+        Returns:
+            (session, digest of its question snapshot)
+        """
+        session, digest = decode_session(raw)
+        questions = self._questions.get(digest)
+        if questions is None:
+            snapshot = self.peek_snapshot(session["topic_id"]) if self.peek_snapshot else None
+            if snapshot is not None and encode_questions(snapshot["questions"])[1] == digest:
+                questions = snapshot["questions"]
+            else:
+                encoded = await self.client.hget(self.key(session_id), "questions")
+                questions = decode_questions(encoded) if encoded is not None else {}
+            self._questions[digest] = questions
+        session["questions"] = questions
+
+        question_id = session["current_question"]
+        question = questions.get(question_id) if question_id is not None else None
+        session["answers"] = QuestionAnswers(question_id, session["question_started_at"], len(session["students"].sids))
+        session["option_counts"] = {option["id"]: 0 for option in question["options"]} if question else {}
+        if question_id is not None:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(self.answers_key(session_id, question_id))
+                pipe.hgetall(self.counts_key(session_id, question_id))
+                answers, counts = await pipe.execute()
+            self._add_remote_answers(session["answers"], answers)
+            self._update_counts(session["option_counts"], counts)
+        return session, digest
+
+    @staticmethod
+    def _add_remote_answers(answers: QuestionAnswers, entries: dict[bytes, bytes]) -> None:
+        """Add answers read from an answers hash, in response time order."""
+        rows = []
+        for slot, value in entries.items():
+            option_id, response_ms = value.split(b":")
+            rows.append((int(response_ms), int(slot), int(option_id)))
+        for response_ms, slot, option_id in sorted(rows):
+            answers.add(slot, option_id, response_ms)
+
+    @staticmethod
+    def _update_counts(counts: dict[int, int], remote: dict[bytes, bytes]) -> None:
+        for option_id, count in remote.items():
+            counts[int(option_id)] = int(count)
+
+    async def flush(self) -> None:
+        """Write every dirty session to Redis."""
+        while self._dirty:
+            dirty, self._dirty = self._dirty, set()
+            for session_id in dirty:
+                self._writing.add(session_id)
+                try:
+                    await self._write(session_id)
+                except Exception as e:
+                    # Keep the changes and try again on the next tick
+                    log.error("Error writing session %s: %s", session_id, e, event="store.error")
+                    self._dirty.add(session_id)
+                    return
+                finally:
+                    self._writing.discard(session_id)
+
+    async def _write(self, session_id: str) -> None:
+        """Write one session with a version check, merging concurrent changes."""
+        from redis.exceptions import WatchError
+
+        key = self.key(session_id)
+        for _ in range(self.MAX_WRITE_ATTEMPTS):
+            entry = self._local.get(session_id)
+            if entry is None:
+                return
+            session, version = entry
+            # Snapshot now: handlers may keep changing the session while we wait
+            fields = {"data": encode_session(session, self._digests[session_id])}
+            written = len(self._journal.get(session_id, ()))
+            replace = session_id in self._replace
+            if replace:
+                fields["questions"] = self._replace[session_id]
+
+            async with self.client.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    remote = await pipe.hget(key, "version")
+                    remote_version = int(remote) if remote is not None else 0
+                    if replace or remote_version == version:
+                        pipe.multi()
+                        pipe.hset(key, mapping=fields)
+                        pipe.hincrby(key, "version", 1)
+                        pipe.expire(key, self.ttl)
+                        results = await pipe.execute()
+                    else:
+                        results = None
+                except WatchError:
+                    results = None
+
+            if results is not None:
+                if session_id in self._local:
+                    self._local[session_id] = (self._local[session_id][0], int(results[1]))
+                journal = self._journal.get(session_id)
+                if journal is not None:
+                    del journal[:written]
+                    if not journal:
+                        del self._journal[session_id]
+                if replace:
+                    self._replace.pop(session_id, None)
+                return
+
+            self.conflicts += 1
+            if not await self._merge(session_id):
+                return
+
+        log.error(
+            "Gave up writing session %s after %s conflicts", session_id, self.MAX_WRITE_ATTEMPTS,
+            event="store.error",
+        )
+        self._forget(session_id)
+
+    async def _merge(self, session_id: str) -> bool:
+        """
+        Load the remote copy of a session and apply the journaled changes to it.
+
+        Returns:
+            False if the session no longer exists in Redis
+        """
+        key = self.key(session_id)
+        version, raw = await self.client.hmget(key, ["version", "data"])
+        if version is None or raw is None:
+            # Deleted (or expired) by another worker; its changes go with it
+            self._forget(session_id)
+            return False
+
+        session, digest = await self._load(session_id, raw)
+        for apply in self._journal.get(session_id, ()):
+            try:
+                apply(session)
+            except Exception as e:
+                log.error("Error re-applying a change to session %s: %s", session_id, e, event="store.error")
+        self._local[session_id] = (session, int(version))
+        self._digests[session_id] = digest
+        return True
+
+    async def get(self, session_id: str) -> Optional["SessionData"]:
+        entry = self._local.get(session_id)
+        if entry is not None and (session_id in self._checked or self._pending(session_id)):
+            self._used[session_id] = time.monotonic()
+            return entry[0]
+
+        key = self.key(session_id)
+        question_id = entry[0]["current_question"] if entry is not None else None
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hget(key, "version")
+            if question_id is not None:
+                pipe.hgetall(self.counts_key(session_id, question_id))
+            results = await pipe.execute()
+        version = results[0]
+
+        entry = self._local.get(session_id)  # may have changed while we waited
+        if entry is not None and self._pending(session_id):
+            return entry[0]
+        if version is None:
+            # Deleted (or expired) by another worker
+            self._forget(session_id)
+            return None
+
+        version = int(version)
+        if entry is None or entry[1] != version:
+            raw = await self.client.hget(key, "data")
+            if raw is None:
+                return None
+            session, digest = await self._load(session_id, raw)
+            entry = self._local.get(session_id)
+            if entry is not None and self._pending(session_id):
+                return entry[0]
+            entry = (session, version)
+            self._local[session_id] = entry
+            self._digests[session_id] = digest
+        elif question_id is not None and entry[0]["current_question"] == question_id:
+            # Answers given through other workers
+            self._update_counts(entry[0]["option_counts"], results[1])
+
+        self._used[session_id] = time.monotonic()
+        self._checked.add(session_id)
+        self._schedule_tick()
+        return entry[0]
+
+    async def save(self, session: "SessionData") -> None:
+        session_id = session["session_id"]
+        encoded, digest = encode_questions(session["questions"])
+        self._questions.setdefault(digest, session["questions"])
+        entry = self._local.get(session_id)
+        self._local[session_id] = (session, entry[1] if entry else 0)
+        self._digests[session_id] = digest
+        self._journal.pop(session_id, None)
+        self._replace[session_id] = encoded
+        self._mark_dirty(session_id)
+
+    async def update(self, session_id: str, apply: Callable[["SessionData"], T]) -> Optional[T]:
+        session = await self.get(session_id)
+        if session is None:
+            return None
+        result = apply(session)
+        self._journal.setdefault(session_id, []).append(apply)
+        self._mark_dirty(session_id)
+        return result
+
+    async def add_answer(
+        self,
+        session_id: str,
+        question_id: int,
+        slot: int,
+        option_id: int,
+        response_ms: int,
+    ) -> bool:
+        answers_key = self.answers_key(session_id, question_id)
+        if not await self.client.hsetnx(answers_key, str(slot), f"{option_id}:{response_ms}"):
+            return False  # Already answered, possibly through another worker
+
+        counts_key = self.counts_key(session_id, question_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hincrby(counts_key, str(option_id), 1)
+            pipe.expire(answers_key, self.ttl)
+            pipe.expire(counts_key, self.ttl)
+            count = (await pipe.execute())[0]
+
+        entry = self._local.get(session_id)
+        if entry is not None and entry[0]["current_question"] == question_id:
+            session = entry[0]
+            session["answers"].add(slot, option_id, response_ms)
+            session["option_counts"][option_id] = count
+        return True
+
+    async def sync_answers(self, session_id: str, question_id: int) -> None:
+        entry = self._local.get(session_id)
+        if entry is None or entry[0]["current_question"] != question_id:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self.answers_key(session_id, question_id))
+            pipe.hgetall(self.counts_key(session_id, question_id))
+            answers, counts = await pipe.execute()
+        entry = self._local.get(session_id)  # may have been reloaded while we waited
+        if entry is not None and entry[0]["current_question"] == question_id:
+            self._add_remote_answers(entry[0]["answers"], answers)
+            self._update_counts(entry[0]["option_counts"], counts)
+
+    async def drop_answers(self, session_id: str, question_id: int) -> None:
+        await self.client.delete(
+            self.answers_key(session_id, question_id), self.counts_key(session_id, question_id)
+        )
+
+    async def delete(self, session_id: str) -> bool:
+        entry = self._local.get(session_id)
+        self._forget(session_id)
+        if entry is not None and entry[0]["current_question"] is not None:
+            await self.drop_answers(session_id, entry[0]["current_question"])
+        return bool(await self.client.delete(self.key(session_id)))
+
+    async def exists(self, session_id: str) -> bool:
+        return session_id in self._dirty or bool(await self.client.exists(self.key(session_id)))
+
+    async def sessions(self) -> AsyncIterator["SessionData"]:
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            if isinstance(key, bytes):
+                key = key.decode()
+            session_id = key[len(self.prefix):]
+            if session_id in self._local:
+                session = await self.get(session_id)
+            else:
+                # Read-only copy; not kept, so a sweep does not mirror the cluster
+                raw = await self.client.hget(key, "data")
+                session = (await self._load(session_id, raw))[0] if raw is not None else None
+            if session is not None:
+                yield session
+
+    async def claim(self, session_id: str, ttl: int) -> bool:
+        key = f"{self.index_prefix}claim:{session_id}"
+        return bool(await self.client.set(key, 1, nx=True, ex=ttl))
+
+    async def bind_sid(self, role: str, sid: str, session_id: str) -> None:
+        await self.client.hset(f"{self.index_prefix}{role}", sid, session_id)
+
+    async def unbind_sid(self, role: str, sid: str, session_id: str) -> None:
+        key = f"{self.index_prefix}{role}"
+        if await self.lookup_sid(role, sid) == session_id:
+            await self.client.hdel(key, sid)
+
+    async def lookup_sid(self, role: str, sid: str) -> Optional[str]:
+        value = await self.client.hget(f"{self.index_prefix}{role}", sid)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+
+def build_store(url: Optional[str]) -> SessionStore:
+    """
+    Build a session store from a URL.
+
+    Args:
+        url: None or "memory" for the in-process store (backed by
+            `active_sessions`), "redis://..." for Redis
+
+    Returns:
+        Configured session store
+    """
+    if not url or url == "memory":
+        from .sessions import active_sessions
+
+        return MemorySessionStore(active_sessions)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from quizzes.cache import topic_cache
+
+        return RedisSessionStore(url=url, peek_snapshot=topic_cache.peek)
+    raise ValueError(f"Unsupported session store URL: {url}")
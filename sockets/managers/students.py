@@ -0,0 +1,157 @@
+"""
+Student table for Live Quiz Socket.IO Server
+
+Handles:
+- Compact per-session student storage indexed by integer slot
+- Name and score lookup by socket ID
+"""
+
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    from .sessions import StudentData
+
+
+class StudentTable:
+    """
+    Students of one session, stored column-wise by slot.
+
+    Each student gets an integer slot: sid -> slot is one dict entry, names
+    are a list and scores an array('i') indexed by slot. A student costs a
+    dict entry, a list pointer and 4 bytes instead of a dict per student.
+    Slots of students who leave are reused by later joins.
+
+    Iteration yields socket IDs in join order, like the {sid: StudentData}
+    dict this replaces; use name()/score() to read a student.
+    """
+
+    __slots__ = ("slots", "sids", "names", "scores", "_free")
+
+    def __init__(self) -> None:
+        self.slots: dict[str, int] = {}  # sid -> slot
+        self.sids: list[Optional[str]] = []  # slot -> sid (None if free)
+        self.names: list[Optional[str]] = []  # slot -> name
+        self.scores = array("i")  # slot -> score
+        self._free: list[int] = []
+
+    @classmethod
+    def from_dict(cls, students: dict[str, "StudentData"]) -> "StudentTable":
+        """Build a table from {sid: {"name", "score"}}."""
+        table = cls()
+        for sid, data in students.items():
+            table.add(sid, data["name"], data.get("score", 0))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, sid: object) -> bool:
+        return sid in self.slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.slots)
+
+    def add(self, sid: str, name: str, score: int = 0) -> int:
+        """
+        Add a student, or reset an existing one to this name and score.
+
+        Returns:
+            The student's slot
+        """
+        slot = self.slots.get(sid)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self.sids[slot] = sid
+                self.names[slot] = name
+                self.scores[slot] = score
+            else:
+                slot = len(self.sids)
+                self.sids.append(sid)
+                self.names.append(name)
+                self.scores.append(score)
+            self.slots[sid] = slot
+        else:
+            self.names[slot] = name
+            self.scores[slot] = score
+        return slot
+
+    def remove(self, sid: str) -> bool:
+        """Remove a student. Returns True if they were in the table."""
+        slot = self.slots.pop(sid, None)
+        if slot is None:
+            return False
+        self.sids[slot] = None
+        self.names[slot] = None
+        self.scores[slot] = 0
+        self._free.append(slot)
+        return True
+
+    def slot(self, sid: str) -> Optional[int]:
+        """A student's slot, or None."""
+        return self.slots.get(sid)
+
+    def name(self, sid: str) -> str:
+        """A student's name (KeyError if unknown)."""
+        return self.names[self.slots[sid]]
+
+    def score(self, sid: str) -> int:
+        """A student's score (KeyError if unknown)."""
+        return self.scores[self.slots[sid]]
+
+    def add_points(self, sid: str, points: int) -> int:
+        """Add points to a student's score. Returns the new score."""
+        slot = self.slots[sid]
+        self.scores[slot] += points
+        return self.scores[slot]
+
+    def entries(self) -> Iterator[tuple[str, str, int]]:
+        """Yield (sid, name, score) in join order."""
+        names, scores = self.names, self.scores
+        for sid, slot in self.slots.items():
+            yield sid, names[slot], scores[slot]
+
+    def roster(self) -> list[dict[str, Any]]:
+        """[{"sid", "name", "score"}] in join order."""
+        names, scores = self.names, self.scores
+        return [
+            {"sid": sid, "name": names[slot], "score": scores[slot]}
+            for sid, slot in self.slots.items()
+        ]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the table, socket IDs and names included."""
+        return (
+            sys.getsizeof(self.slots) + sys.getsizeof(self.sids) + sys.getsizeof(self.names)
+            + sys.getsizeof(self.scores) + sys.getsizeof(self._free)
+            + sum(sys.getsizeof(sid) for sid in self.slots)
+            + sum(sys.getsizeof(name) for name in self.names if name is not None)
+        )
+
+    def to_dict(self) -> dict[str, "StudentData"]:
+        """Snapshot as {sid: {"name", "score"}}."""
+        return {sid: {"name": name, "score": score} for sid, name, score in self.entries()}
+
+    def to_state(self) -> dict[str, Any]:
+        """Plain-data copy of the columns (JSON-safe), slots and free list included."""
+        return {
+            "slots": list(self.slots.items()),
+            "names": self.names,
+            "scores": self.scores.tolist(),
+            "free": self._free,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "StudentTable":
+        """Rebuild a table from to_state(), keeping every slot and the join order."""
+        table = cls()
+        table.slots = {sid: slot for sid, slot in state["slots"]}
+        table.names = list(state["names"])
+        table.scores = array("i", state["scores"])
+        table.sids = [None] * len(table.names)
+        for sid, slot in table.slots.items():
+            table.sids[slot] = sid
+        table._free = list(state["free"])
+        return table
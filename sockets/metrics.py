@@ -0,0 +1,343 @@
+"""
+Metrics of the Live Quiz socket layer
+
+Counters, gauges and histograms updated from the event loop with plain
+arithmetic, rendered on demand in the Prometheus text exposition format.
+The module-level metrics are updated by the socket server and session
+manager; metrics_app serves them at /metrics (see backend/asgi.py).
+Values are per process; with several workers, sum them in Prometheus.
+"""
+
+import bisect
+import functools
+import math
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import socketio
+from socketio import packet
+
+from .utils.packets import require_socketio_internals
+
+# Default histogram buckets in seconds (handler and close latencies)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _labels(labels) if labels else ()
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_labels(labels), 0)
+
+    def samples(self) -> Iterable[tuple[str, Labels, float]]:
+        for key, value in self._values.items():
+            yield self.name, key, value
+
+
+class Gauge:
+    """
+    Value that goes up and down.
+
+    Either set with set()/inc()/dec(), or computed at scrape time by a
+    `collect` function returning a number.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, collect: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help
+        self.collect = collect
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[_labels(labels) if labels else ()] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _labels(labels) if labels else ()
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        if self.collect is not None:
+            return self.collect()
+        return self._values.get(_labels(labels), 0)
+
+    def samples(self) -> Iterable[tuple[str, Labels, float]]:
+        if self.collect is not None:
+            yield self.name, (), self.collect()
+            return
+        for key, value in self._values.items():
+            yield self.name, key, value
+
+
+class Histogram:
+    """
+    Distribution of observations in fixed cumulative buckets.
+
+    observe() is a bisect and two additions, cheap enough for every event.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[Labels, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels) if labels else ()
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def timed(self, **labels: Any) -> Callable:
+        """Decorator observing the wall time of a coroutine function."""
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(_labels(labels))
+        return series[-1] if series else 0
+
+    def samples(self) -> Iterable[tuple[str, Labels, float]]:
+        for key, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                yield f"{self.name}_bucket", key + (("le", _format_value(bound)),), cumulative
+            yield f"{self.name}_sum", key, series[-2]
+            yield f"{self.name}_count", key, series[-1]
+
+
+class MetricsRegistry:
+    """
+    A set of metrics plus collectors rendered together.
+
+    Collectors are called at scrape time and return extra metrics (e.g. the
+    stats() of a cache or queue flattened into gauges and counters).
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list[Any] = []
+        self._collectors: list[Callable[[], Iterable[Any]]] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self.register(Counter(name, help))
+
+    def gauge(self, name: str, help: str, collect: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, help, collect))
+
+    def histogram(self, name: str, help: str, buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Any]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def stats_collector(
+    prefix: str,
+    stats: Callable[[], dict[str, Any]],
+    help: str,
+    counters: Iterable[str] = (),
+) -> Callable[[], list[Any]]:
+    """
+    Expose a component's stats() dict as metrics.
+
+    Nested dicts are flattened with "_" (lateness_ms.p99 -> lateness_ms_p99).
+    Keys listed in `counters` become counters named {prefix}_{key}_total,
+    everything else a gauge named {prefix}_{key}.
+
+    Args:
+        prefix: Metric name prefix (e.g. "livequiz_topic_cache")
+        stats: Function returning the stats dict
+        help: Help text shared by the metrics
+        counters: Keys whose values only grow
+
+    Returns:
+        A collector for MetricsRegistry.add_collector()
+    """
+    counters = set(counters)
+
+    def flatten(values: dict[str, Any], path: str = "") -> Iterable[tuple[str, float]]:
+        for key, value in values.items():
+            name = f"{path}_{key}" if path else key
+            if isinstance(value, dict):
+                yield from flatten(value, name)
+            elif isinstance(value, (int, float)):
+                yield name, value
+
+    def collect() -> list[Any]:
+        metrics = []
+        for key, value in flatten(stats()):
+            if key in counters:
+                metric = Counter(f"{prefix}_{key}_total", help)
+                metric.inc(value)
+            else:
+                metric = Gauge(f"{prefix}_{key}", help)
+                metric.set(value)
+            metrics.append(metric)
+        return metrics
+
+    return collect
+
+
+# Timer lateness is normally well under a millisecond; seconds
+LATENESS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+registry = MetricsRegistry()
+
+active_sessions = registry.gauge(
+    "livequiz_active_sessions", "Live sessions created by this worker and not yet deleted"
+)
+active_students = registry.gauge(
+    "livequiz_active_students", "Students in this worker's live sessions"
+)
+connected_sockets = registry.gauge(
+    "livequiz_connected_sockets", "Socket.IO clients connected to this worker"
+)
+handler_latency = registry.histogram(
+    "livequiz_handler_duration_seconds", "Socket event handler latency by event"
+)
+close_duration = registry.histogram(
+    "livequiz_close_question_duration_seconds", "close_question duration (scoring, ranking and fan-out)"
+)
+timer_lateness = registry.histogram(
+    "livequiz_timer_lateness_seconds", "Delay between a question deadline and its close starting",
+    LATENESS_BUCKETS,
+)
+emits = registry.counter(
+    "livequiz_emits_total", "Server emits by event (one per emit call, any number of recipients)"
+)
+emit_packets = registry.counter(
+    "livequiz_emit_packets_total", "Engine.IO packets queued to clients"
+)
+emit_bytes = registry.counter(
+    "livequiz_emit_bytes_total", "Size of queued packets (characters of text frames, bytes of binary frames)"
+)
+
+
+class MeteredAsyncServer(socketio.AsyncServer):
+    """
+    AsyncServer that counts emits per event and the packets and bytes sent.
+
+    Room emits are encoded once by the client manager and handed to
+    _send_eio_packet once per recipient, which is where packets and bytes
+    are counted. Per-socket sends (connect replies, acks) go through
+    _send_packet. Both overrides only count around the inherited method.
+    They are private python-socketio methods, checked on import: if a
+    release renamed them, the overrides would silently stop counting.
+    """
+
+    async def emit(self, event: str, *args: Any, **kwargs: Any) -> None:
+        emits.inc(event=event)
+        await super().emit(event, *args, **kwargs)
+
+    def count_emit(self, event: str) -> None:
+        """Count an emit sent without emit() (see PacketCache)."""
+        emits.inc(event=event)
+
+    async def _send_packet(self, eio_sid: str, pkt: packet.Packet) -> None:
+        await super()._send_packet(eio_sid, pkt)
+        # Encoded again for the sizes: only connect replies, acks and
+        # disconnects come this way, emits go through _send_eio_packet
+        encoded = pkt.encode()
+        for data in encoded if isinstance(encoded, list) else [encoded]:
+            emit_packets.inc()
+            emit_bytes.inc(len(data))
+
+    async def _send_eio_packet(self, eio_sid: str, eio_pkt: Any) -> None:
+        emit_packets.inc()
+        emit_bytes.inc(len(eio_pkt.data))
+        await super()._send_eio_packet(eio_sid, eio_pkt)
+
+
+# The overrides above replace private AsyncServer methods
+require_socketio_internals(
+    socketio.AsyncServer, ("_send_packet", "_send_eio_packet"), "MeteredAsyncServer"
+)
+
+
+async def metrics_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    """ASGI handler returning every metric in the Prometheus text format."""
+    body = registry.render().encode()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
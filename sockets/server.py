@@ -10,6 +10,7 @@ Events:
         - teacher:start_session
         - teacher:next_question
         - teacher:finish_session
+        - teacher:get_scoreboard
 
     Student:
         - student:join
@@ -19,99 +20,359 @@ Events:
     Server broadcasts:
         - teacher:session_created
         - session:state
+        - session:student_joined / session:student_left
         - session:question
         - session:question_closed
         - answer_result
         - ranking
+        - session:scoreboard
         - quiz_finished
 """
 
 import asyncio
+import logging
 import socketio
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
-from .managers.sessions import SessionManager, active_sessions
+from django.conf import settings
+
+from quizzes.cache import topic_cache
+
+from .managers.codes import build_code_allocator
+from .managers.sessions import SessionManager
+from .managers.store import build_store
 from .managers.questions import QuestionManager
 from .managers.ranking import RankingManager
-from .managers.persistence import persist_session
+from .managers.persistence import MODE_INCREMENTAL, STATUS_CANCELLED, STATUS_FINISHED, PersistenceQueue
+from .managers.reaper import REASON_FINISHED, SessionReaper
+from .metrics import (
+    MeteredAsyncServer,
+    close_duration,
+    connected_sockets,
+    handler_latency,
+    registry as metrics_registry,
+    stats_collector,
+    timer_lateness,
+)
+from .utils.logs import ROOT_LOGGER, configure_logging, get_logger, stop_logging
+from .utils.packets import PacketCache
+from .utils.scheduler import DeadlineScheduler
+from .utils.serializers import build_serializer
+from .utils.throttle import Throttle
 from .utils.time import TimeUtils
 
 
-# Storage for active question timers
-question_timers: dict[str, asyncio.Task] = {}
+# Log records are queued on the loop and written by a background thread,
+# started with the server (startup()) rather than on import. False leaves
+# the livequiz.* loggers to Django's LOGGING setting.
+LOG_QUEUE: bool = getattr(settings, "LIVE_LOG_QUEUE", True)
+
+emit_log = get_logger("EMIT")
+timer_log = get_logger("TIMER")
+close_log = get_logger("CLOSE_QUESTION")
+finish_log = get_logger("FINISH_SESSION")
+connect_log = get_logger("CONNECT")
+disconnect_log = get_logger("DISCONNECT")
+teacher_log = get_logger("TEACHER")
+student_log = get_logger("STUDENT")
+session_log = get_logger("SESSION")
+reaper_log = get_logger("REAPER")
+
+# python-socketio / python-engineio internals (one line per packet when enabled)
+SOCKETIO_LOG: bool = getattr(settings, "LIVE_SOCKETIO_LOG", False)
+
+# One scheduler drives the deadlines of every session's current question
+question_scheduler = DeadlineScheduler(on_lateness=timer_lateness.observe)
+
+# Questions being closed in this process: session_id -> resolved when done
+closing_questions: dict[str, asyncio.Future] = {}
+
+# Finished sessions are spooled to disk and written to the DB in the background
+persistence_queue = PersistenceQueue(
+    getattr(settings, "LIVE_PERSISTENCE_SPOOL", "persistence-spool.jsonl"),
+    max_attempts=getattr(settings, "LIVE_PERSISTENCE_MAX_ATTEMPTS", 10),
+    dead_letter_path=getattr(settings, "LIVE_PERSISTENCE_DEAD_LETTER", None),
+)
+
+# "finish" writes each session once it ends; "incremental" streams every
+# closed question and only writes the totals at the end
+PERSISTENCE_MODE: str = getattr(settings, "LIVE_PERSISTENCE_MODE", "finish")
+
+# Maximum number of per-student emits in flight during a fan-out
+FANOUT_CONCURRENCY = 64
+
+# Roster changes (joins/leaves) reach the teacher at most this often (seconds)
+ROSTER_FLUSH_INTERVAL = 0.1
+
+# Live answer counts reach the teacher at most this often (seconds)
+ANSWER_COUNT_INTERVAL = 0.25
+
+
+# Session storage: in-process by default, Redis when several workers share sessions
+SESSION_STORE_URL: Optional[str] = getattr(settings, "LIVE_SESSION_STORE_URL", None)
+SessionManager.configure_store(build_store(SESSION_STORE_URL))
 
+# Session codes: `prefix` + `length` characters, allocated from the store's pool
+SESSION_CODE_LENGTH: int = getattr(settings, "LIVE_SESSION_CODE_LENGTH", 4)
+SESSION_CODE_PREFIX: str = getattr(settings, "LIVE_SESSION_CODE_PREFIX", "")
+SessionManager.configure_codes(
+    build_code_allocator(SessionManager.store, SESSION_CODE_LENGTH, SESSION_CODE_PREFIX)
+)
+
+# Rooms must be shared too, or emits would only reach this worker's sockets
+client_manager = None
+if SESSION_STORE_URL and SESSION_STORE_URL.startswith(("redis://", "rediss://", "unix://")):
+    client_manager = socketio.AsyncRedisManager(SESSION_STORE_URL)
+
+# Session reaper: how often to sweep, and how long (seconds since the last
+# change) finished, teacherless and idle sessions are kept
+SESSION_REAP_INTERVAL: float = getattr(settings, "LIVE_SESSION_REAP_INTERVAL", 60)
+SESSION_FINISHED_TTL: float = getattr(settings, "LIVE_SESSION_FINISHED_TTL", 600)
+SESSION_TEACHERLESS_TTL: float = getattr(settings, "LIVE_SESSION_TEACHERLESS_TTL", 120)
+SESSION_IDLE_TTL: float = getattr(settings, "LIVE_SESSION_IDLE_TTL", 3600)
 
-# Create AsyncServer with CORS support
-sio = socketio.AsyncServer(
+# Wire encoding: "default" (JSON) or "msgpack"; clients must use the matching parser
+SOCKET_SERIALIZER: str = getattr(settings, "LIVE_SOCKET_SERIALIZER", "default")
+
+# Create AsyncServer with CORS support (and emit/packet counters, see metrics.py)
+sio = MeteredAsyncServer(
     async_mode="asgi",
     cors_allowed_origins="*",
-    logger=True,
-    engineio_logger=True,
+    client_manager=client_manager,
+    serializer=build_serializer(SOCKET_SERIALIZER),
+    logger=logging.getLogger(f"{ROOT_LOGGER}.socketio") if SOCKETIO_LOG else False,
+    engineio_logger=logging.getLogger(f"{ROOT_LOGGER}.engineio") if SOCKETIO_LOG else False,
 )
 
+# Question packets are encoded once per (question, time limit) and reused by every room
+question_packets = PacketCache(sio)
+
 # Create ASGI application
 socket_app = socketio.ASGIApp(
     sio,
     socketio_path="socket.io",
 )
 
+# Component stats exposed at /metrics next to the event metrics
+metrics_registry.add_collector(stats_collector(
+    "livequiz_scheduler", question_scheduler.stats, "Question deadline scheduler stats",
+    counters=["fired"],
+))
+metrics_registry.add_collector(stats_collector(
+    "livequiz_persistence", persistence_queue.stats, "Persistence queue stats",
+    counters=["flushed", "dropped", "retries", "dead"],
+))
+metrics_registry.add_collector(stats_collector(
+    "livequiz_topic_cache", topic_cache.stats, "Topic snapshot cache stats",
+    counters=["hits", "misses", "coalesced", "evictions", "invalidations", "revalidations", "stale"],
+))
+metrics_registry.add_collector(stats_collector(
+    "livequiz_question_packets", question_packets.stats, "Encoded question packet cache stats",
+    counters=["hits", "misses"],
+))
+metrics_registry.add_collector(stats_collector(
+    "livequiz_session_codes", lambda: SessionManager.codes.stats(), "Session code allocator stats",
+))
+
+
+def on_event(event: str) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Register a Socket.IO event handler and record its latency.
+
+    Args:
+        event: Event name (e.g. "student:answer")
+    """
+    def decorator(handler: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        sio.on(event, handler_latency.timed(event=event)(handler))
+        return handler
+    return decorator
+
 
 # =============================================================================
 #                           HELPER FUNCTIONS
 # =============================================================================
 
 
-async def question_timer_task(session_id: str, timeout: int) -> None:
+async def emit_each(event: str, payloads: list[tuple[str, dict[str, Any]]]) -> None:
     """
-    Background task that auto-closes question after timeout.
+    Send a personalised payload to each socket concurrently.
+
+    At most FANOUT_CONCURRENCY emits are in flight at once, so closing a
+    question in a large room does not wait on one round trip per student.
+
+    Args:
+        event: Event name
+        payloads: List of (sid, payload) pairs
+    """
+    pending = iter(payloads)
+
+    async def _worker() -> None:
+        # Workers share one iterator, so each payload is sent exactly once
+        for sid, payload in pending:
+            try:
+                await sio.emit(event, payload, to=sid)
+            except Exception as e:
+                emit_log.error("Failed to send %s to %s: %s", event, sid, e, event="emit.failed")
+
+    workers = min(FANOUT_CONCURRENCY, len(payloads))
+    await asyncio.gather(*(_worker() for _ in range(workers)))
+
+
+# Roster changes not yet sent to the teacher: session_id -> {"joined": {sid: student}, "left": [sid]}
+roster_changes: dict[str, dict[str, Any]] = {}
+
+
+def queue_roster_change(
+    session_id: str,
+    joined: Optional[dict[str, Any]] = None,
+    left: Optional[str] = None,
+) -> None:
+    """
+    Queue a student join or leave for the teacher's next roster delta.
+
+    A student who joins and leaves within the same window is never sent.
 
     Args:
         session_id: The session ID
-        timeout: Seconds to wait before closing
+        joined: Student entry {sid, name, score} that joined
+        left: Socket ID of a student that left
     """
-    try:
-        await asyncio.sleep(timeout)
+    changes = roster_changes.setdefault(session_id, {"joined": {}, "left": []})
+    if joined is not None:
+        changes["joined"][joined["sid"]] = joined
+    if left is not None and changes["joined"].pop(left, None) is None:
+        changes["left"].append(left)
+    roster_updates.touch(session_id)
 
-        session = SessionManager.get_session(session_id)
-        if not session:
-            return
 
-        # Only close if still running and question not already closed
-        if session["stage"] == "running" and session["current_question"] is not None:
-            print(f"[TIMER] Time expired for session {session_id}, closing question")
+async def flush_roster(session_id: str) -> None:
+    """
+    Send queued roster changes to the teacher as sequenced deltas.
+
+    Events:
+        session:student_joined {session_id, seq, students: [{sid, name, score}]}
+        session:student_left {session_id, seq, sids: [sid]}
+    """
+    changes = roster_changes.pop(session_id, None)
+    session = await SessionManager.get_session(session_id)
+    if not changes or not session:
+        return
+
+    teacher_sid = session["teacher_sid"]
+    if changes["joined"]:
+        await sio.emit(
+            "session:student_joined",
+            {
+                "session_id": session_id,
+                "seq": await SessionManager.next_roster_seq(session_id),
+                "students": list(changes["joined"].values()),
+            },
+            to=teacher_sid
+        )
+    if changes["left"]:
+        await sio.emit(
+            "session:student_left",
+            {
+                "session_id": session_id,
+                "seq": await SessionManager.next_roster_seq(session_id),
+                "sids": changes["left"],
+            },
+            to=teacher_sid
+        )
+
+
+roster_updates = Throttle(ROSTER_FLUSH_INTERVAL, flush_roster)
+
+
+async def flush_answer_count(session_id: str) -> None:
+    """Send the current question's latest answer count and distribution to the teacher."""
+    session = await SessionManager.get_session(session_id)
+    if not session or session["current_question"] is None:
+        return
+
+    await sio.emit(
+        "session:answer_count",
+        {
+            "answered": SessionManager.answer_count(session),
+            "total": len(session["students"]),
+            "distribution": QuestionManager.build_distribution(session),
+        },
+        to=session["teacher_sid"]
+    )
+
+
+answer_counts = Throttle(ANSWER_COUNT_INTERVAL, flush_answer_count)
+
+
+def discard_session_updates(session_id: str) -> None:
+    """Drop throttled teacher updates of a deleted session."""
+    roster_updates.discard(session_id)
+    roster_changes.pop(session_id, None)
+    answer_counts.discard(session_id)
+
+
+async def build_session_state(session_id: str) -> Optional[dict[str, Any]]:
+    """
+    Build a full session:state snapshot.
+
+    Pending roster changes are sent first, so the snapshot's seq covers
+    every student in its list.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Snapshot payload, or None if session not found
+    """
+    await roster_updates.flush(session_id)
+
+    session = await SessionManager.get_session(session_id)
+    if not session:
+        return None
+
+    return {
+        "session_id": session_id,
+        "stage": session["stage"],
+        "seq": session["roster_seq"],
+        "students": await SessionManager.get_student_list(session_id),
+        "current_question": session["current_question"],
+        "questions_remaining": len(session["question_queue"]),
+    }
 
-            # Notify everyone that time expired
-            room = SessionManager.get_room_name(session_id)
 
-            # Send to all students
-            await sio.emit(
-                "session:timer_expired",
-                {
-                    "question_id": session["current_question"],
-                    "message": "Time is up!"
-                },
-                room=room
-            )
+async def on_question_deadline(session_id: str) -> None:
+    """
+    Auto-close the current question when its deadline passes.
+
+    Started by question_scheduler when the session's deadline is reached.
 
-            # Send to teacher
-            await sio.emit(
-                "session:timer_expired",
-                {
-                    "question_id": session["current_question"],
-                    "message": "Time is up!"
-                },
-                to=session["teacher_sid"]
-            )
+    Args:
+        session_id: The session ID
+    """
+    session = await SessionManager.get_session(session_id)
+    if not session:
+        return
 
-            # Close question and send results (from_timer=True to avoid self-cancellation)
-            await close_question(session_id, from_timer=True)
+    # Only close if still running and question not already closed (or being closed)
+    if (
+        session["stage"] == "running"
+        and session["current_question"] is not None
+        and not session["question_closing"]
+    ):
+        timer_log.info("Time expired for session %s, closing question", session_id, event="timer.expired")
 
-            # Remove timer from dict after completion
-            if session_id in question_timers:
-                del question_timers[session_id]
+        # Notify everyone (students + teacher) that time expired
+        await sio.emit(
+            "session:timer_expired",
+            {
+                "question_id": session["current_question"],
+                "message": "Time is up!"
+            },
+            room=SessionManager.get_audience_rooms(session_id)
+        )
 
-    except asyncio.CancelledError:
-        print(f"[TIMER] Timer cancelled for session {session_id}")
+        # Close question and send results (the timer has already been removed)
+        await close_question(session_id, from_timer=True)
 
 
 def start_question_timer(session_id: str, timeout: int) -> None:
@@ -122,13 +383,9 @@ def start_question_timer(session_id: str, timeout: int) -> None:
         session_id: The session ID
         timeout: Seconds until question closes
     """
-    # Cancel existing timer if any
-    cancel_question_timer(session_id)
-
-    # Create new timer task
-    task = asyncio.create_task(question_timer_task(session_id, timeout))
-    question_timers[session_id] = task
-    print(f"[TIMER] Started {timeout}s timer for session {session_id}")
+    # Replaces any existing timer for the session
+    question_scheduler.schedule(session_id, timeout, on_question_deadline)
+    timer_log.info("Started %ss timer for session %s", timeout, session_id, event="timer.started")
 
 
 def cancel_question_timer(session_id: str) -> None:
@@ -138,10 +395,69 @@ def cancel_question_timer(session_id: str) -> None:
     Args:
         session_id: The session ID
     """
-    if session_id in question_timers:
-        question_timers[session_id].cancel()
-        del question_timers[session_id]
-        print(f"[TIMER] Cancelled timer for session {session_id}")
+    if question_scheduler.cancel(session_id):
+        timer_log.info("Cancelled timer for session %s", session_id, event="timer.cancelled")
+
+
+async def pause_question_timer(session_id: str) -> Optional[float]:
+    """
+    Stop the current question's clock (deadline and timer).
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Seconds that were left, or None if no question is running
+    """
+    remaining = await SessionManager.pause_question(session_id)
+    if remaining is None:
+        return None
+
+    question_scheduler.pause(session_id)
+    timer_log.info("Paused timer for session %s (%.1fs left)", session_id, remaining, event="timer.paused")
+    return remaining
+
+
+async def resume_question_timer(session_id: str) -> Optional[float]:
+    """
+    Restart a paused question's clock with the time it had left.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Seconds left, or None if the question is not paused
+    """
+    deadline = await SessionManager.resume_question(session_id)
+    if deadline is None:
+        return None
+
+    remaining = max(0.0, (deadline - TimeUtils.now()).total_seconds())
+    if not question_scheduler.resume(session_id):
+        # Paused through another worker: start the timer from the session's deadline
+        question_scheduler.schedule(session_id, remaining, on_question_deadline)
+    timer_log.info("Resumed timer for session %s (%.1fs left)", session_id, remaining, event="timer.resumed")
+    return remaining
+
+
+async def extend_question_timer(session_id: str, seconds: float) -> Optional[float]:
+    """
+    Move the current question's deadline and timer by `seconds`.
+
+    Args:
+        session_id: The session ID
+        seconds: Seconds to add (negative values shorten the question)
+
+    Returns:
+        Seconds left, or None if no question is open
+    """
+    remaining = await SessionManager.extend_question(session_id, seconds)
+    if remaining is None:
+        return None
+
+    question_scheduler.extend(session_id, seconds)
+    timer_log.info("Extended timer for session %s by %ss", session_id, seconds, event="timer.extended")
+    return remaining
 
 
 async def send_question(session_id: str, question_id: int) -> bool:
@@ -150,10 +466,10 @@ async def send_question(session_id: str, question_id: int) -> bool:
 
     Steps:
         1. Set session["current_question"] = question_id
-        2. Set session["answers"] = {}
+        2. Set session["answers"] = QuestionAnswers() for the question
         3. Set session["question_started_at"] = now
         4. Set session["question_deadline"] = now + time_per_question
-        5. Load question + options from Django ORM
+        5. Read question + options from the session's snapshot (no DB query)
         6. Emit to ALL students in room
 
     Args:
@@ -163,151 +479,173 @@ async def send_question(session_id: str, question_id: int) -> bool:
     Returns:
         True if question was sent successfully
     """
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         return False
 
-    # Load question from database
-    question_data = await QuestionManager.load_question(question_id)
+    # Read question from the snapshot loaded at session creation
+    question_data = QuestionManager.get_question(session, question_id)
     if not question_data:
         return False
 
     # Setup session state for the question
-    QuestionManager.setup_question(session, question_id)
+    await QuestionManager.open_question(session_id, question_id)
 
-    # Cache correct option ID in session (so we don't need DB query on timer)
-    session["current_correct_option"] = question_data.get("correct_option_id")
-    print(f"[SEND_QUESTION] Cached correct_option_id: {session['current_correct_option']}")
-
-    # Build and send question payload (without correct_option_id!)
-    payload = QuestionManager.build_question_payload(
+    # Send question payload (without correct_option_id!) to students and the
+    # teacher; it is encoded once and shared by every room showing it
+    time_limit = session["time_per_question"]
+    await question_packets.emit(
+        (question_id, time_limit),
         question_data,
-        session["time_per_question"]
+        "session:question",
+        lambda: QuestionManager.build_question_payload(question_data, time_limit),
+        room=SessionManager.get_audience_rooms(session_id),
     )
 
-    room = SessionManager.get_room_name(session_id)
-    await sio.emit("session:question", payload, room=room)
-
     # Start auto-close timer
     start_question_timer(session_id, session["time_per_question"])
 
     return True
 
 
+@close_duration.timed()
 async def close_question(session_id: str, from_timer: bool = False) -> None:
     """
     Close the current question and process all answers.
 
     Event sequence:
         1. session:answer_count (final count) -> Teacher
-        2. answer_result -> Each student
+        2. answer_result -> Each student (scored first, then sent concurrently)
         3. session:question_closed -> Teacher + Students
         4. ranking + session:ranking -> Teacher
 
+    The question is claimed first (SessionManager.claim_question), so when
+    the deadline callback and another close race, points are awarded once.
+    A close that loses the claim returns once the winner is done.
+
     Args:
         session_id: The session ID
-        from_timer: If True, called from timer (don't cancel timer to avoid self-cancellation)
+        from_timer: If True, called from the deadline callback (no timer left to cancel)
     """
-    print(f"[CLOSE_QUESTION] Starting close_question for session {session_id}", flush=True)
+    close_log.info("Starting close_question for session %s", session_id, event="close.start")
+
+    # Only one close scores a question; the others wait until it is done
+    question_id = await SessionManager.claim_question(session_id)
+    if question_id is None:
+        pending = closing_questions.get(session_id)
+        if pending is not None:
+            await asyncio.wait([pending])
+        close_log.info("No open question to close in session %s", session_id, event="close.skipped")
+        return
 
-    # Cancel timer if running (but not if we're called FROM the timer!)
+    done = closing_questions[session_id] = asyncio.get_running_loop().create_future()
+    try:
+        await _close_claimed_question(session_id, question_id, from_timer)
+    finally:
+        del closing_questions[session_id]
+        done.set_result(None)
+
+
+async def _close_claimed_question(session_id: str, question_id: int, from_timer: bool) -> None:
+    """Body of close_question(), run by the close that claimed the question."""
+    # Cancel the timer, or a deadline callback that has not claimed the
+    # question yet (but not if we're called FROM the timer!)
     if not from_timer:
         cancel_question_timer(session_id)
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
-        print(f"[CLOSE_QUESTION] ERROR: Session not found")
-        return
-
-    question_id = session["current_question"]
-    if question_id is None:
-        print(f"[CLOSE_QUESTION] ERROR: current_question is None")
+        close_log.error("Session %s not found", session_id, event="close.error")
         return
 
-    # Get correct answer from cached session data (no DB query needed!)
-    correct_option_id = session.get("current_correct_option")
-    print(f"[CLOSE_QUESTION] Using cached correct_option_id: {correct_option_id}")
+    # Get correct answer from the session's question snapshot (no DB query needed!)
+    question_data = QuestionManager.get_question(session, question_id)
+    correct_option_id = question_data["correct_option_id"] if question_data else None
 
     if correct_option_id is None:
-        print(f"[CLOSE_QUESTION] ERROR: correct_option_id is None for question {question_id}")
+        close_log.error("correct_option_id is None for question %s", question_id, event="close.error")
         return
 
-    print(f"[CLOSE_QUESTION] Processing question {question_id}, correct_option: {correct_option_id}")
+    close_log.info("Processing question %s, correct_option: %s", question_id, correct_option_id, event="close.step")
 
-    room = SessionManager.get_room_name(session_id)
+    audience = SessionManager.get_audience_rooms(session_id)
     teacher_sid = session["teacher_sid"]
 
-    # 1. Send final answer count to teacher
-    answer_count = len(session["answers"])
+    # 1. Send final answer count to teacher (replaces any throttled update)
+    answer_counts.cancel(session_id)
+    answer_count = SessionManager.answer_count(session)
     student_count = len(session["students"])
+    distribution = QuestionManager.build_distribution(session)
     await sio.emit(
         "session:answer_count",
-        {"answered": answer_count, "total": student_count},
+        {"answered": answer_count, "total": student_count, "distribution": distribution},
         to=teacher_sid
     )
-    print(f"[CLOSE_QUESTION] Sent answer_count: {answer_count}/{student_count}", flush=True)
+    close_log.info("Sent answer_count: %s/%s", answer_count, student_count, event="close.step")
 
-    # Record this question for persistence
-    SessionManager.record_answered_question(session_id, question_id, correct_option_id)
+    # Record this question for persistence (correctness follows from correct_option_id)
+    answers = await SessionManager.record_answered_question(session_id, question_id, correct_option_id)
+    if answers is None:
+        close_log.error("Session %s disappeared while closing", session_id, event="close.error")
+        return
 
-    # 2. Process each student's answer and send results
-    print(f"[CLOSE_QUESTION] Processing {student_count} students...", flush=True)
-    for sid, student_data in session["students"].items():
-        print(f"[CLOSE_QUESTION] Processing student {sid}...", flush=True)
-        student_answer = session["answers"].get(sid)
+    # 2. Score every student first, then fan the results out concurrently
+    scored: list[tuple[str, Optional[int], bool, int]] = []
+    for sid, slot in session["students"].slots.items():
+        student_answer = answers.option(slot)
         correct = student_answer == correct_option_id
 
-        # Record answer for persistence (even if None = no answer)
-        if student_answer is not None:
-            SessionManager.record_student_answer(
-                session_id=session_id,
-                sid=sid,
-                question_id=question_id,
-                option_id=student_answer,
-                is_correct=correct,
-            )
-
         # Award points
         score_delta = QuestionManager.POINTS_CORRECT if correct else 0
         if score_delta > 0:
-            SessionManager.update_student_score(session_id, sid, score_delta)
+            await SessionManager.update_student_score(session_id, sid, score_delta)
+
+        scored.append((sid, student_answer, correct, score_delta))
 
-        score_total = SessionManager.get_student_score(session_id, sid)
+    # Rank once; each student gets the top K and their own neighbourhood, the
+    # teacher the full board. Standings are only valid until the board changes,
+    # so every payload is built before the first await.
+    standings = RankingManager.build_standings(session["students"], session["leaderboard"])
+    top = standings.top(RankingManager.TOP_K)
+    ranking_payload = {"type": "ranking", "players": standings.players()}
 
-        # Build and send result to student
-        result = QuestionManager.build_answer_result(
+    results: list[tuple[str, dict[str, Any]]] = []
+    for sid, student_answer, correct, score_delta in scored:
+        results.append((sid, QuestionManager.build_answer_result(
             correct=correct,
             correct_option_id=correct_option_id,
             student_answer=student_answer,
             score_delta=score_delta,
-            score_total=score_total,
-        )
-        print(f"[CLOSE_QUESTION] Sending answer_result to {sid}...", flush=True)
-        await sio.emit("answer_result", result, to=sid)
-        print(f"[CLOSE_QUESTION] Sent answer_result to {sid}", flush=True)
+            score_total=session["students"].score(sid),
+            ranking=RankingManager.build_student_ranking(top, standings[sid], len(standings)),
+        )))
 
-    print(f"[CLOSE_QUESTION] Sent answer_result to all students", flush=True)
+    await emit_each("answer_result", results)
+    close_log.info("Sent answer_result to %s students", len(results), event="close.step")
 
     # 3. Send question closed to everyone (students room + teacher)
-    await sio.emit("session:question_closed", {"question_id": question_id}, room=room)
-    await sio.emit("session:question_closed", {"question_id": question_id}, to=teacher_sid)
-    print(f"[CLOSE_QUESTION] Sent session:question_closed")
-
-    # 4. Build and send ranking to teacher (both event names for compatibility)
-    ranking_payload = RankingManager.build_ranking_payload(session["students"])
-    print(f"[CLOSE_QUESTION] Ranking payload: {ranking_payload}")
+    closed_payload = {"question_id": question_id, "distribution": distribution}
+    await sio.emit("session:question_closed", closed_payload, room=audience)
+    close_log.info("Sent session:question_closed", event="close.step")
 
+    # 4. Send the full board to teacher (both event names for compatibility)
     await sio.emit("ranking", ranking_payload, to=teacher_sid)
     await sio.emit("session:ranking", ranking_payload, to=teacher_sid)
 
-    print(f"[CLOSE_QUESTION] Sent ranking to teacher {teacher_sid}")
+    close_log.info("Sent ranking to teacher %s", teacher_sid, event="close.step")
+
+    # Incremental persistence: stream this question, then forget its answers
+    if PERSISTENCE_MODE == MODE_INCREMENTAL:
+        try:
+            await persistence_queue.submit_question(session, question_id)
+            await SessionManager.release_question_history(session_id, question_id)
+        except Exception as e:
+            close_log.error("Error spooling question %s: %s", question_id, e, event="close.error")
 
     # Clear answers and current question for next question
-    SessionManager.clear_answers(session_id)
-    session["current_question"] = None
-    session["current_correct_option"] = None
+    await SessionManager.clear_answers(session_id)
 
-    print(f"[CLOSE_QUESTION] Done!")
+    close_log.info("Done with session %s", session_id, event="close.done")
 
 
 async def finish_session(session_id: str) -> None:
@@ -318,8 +656,10 @@ async def finish_session(session_id: str) -> None:
         1. Set session stage to finished
         2. Compute final ranking
         3. Determine all winners (max score)
-        4. Emit quiz_finished to all participants
-        5. Persist session to database
+        4. Emit quiz_finished: full scoreboard to the teacher, top K and
+           own position to each student
+        5. Queue session for persistence (spooled, written in the background);
+           in incremental mode only the final scores are left to write
 
     Args:
         session_id: The session ID
@@ -327,30 +667,160 @@ async def finish_session(session_id: str) -> None:
     # Cancel any running timer
     cancel_question_timer(session_id)
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         return
 
     # Set stage to finished
-    SessionManager.set_stage(session_id, SessionManager.STAGE_FINISHED)
+    await SessionManager.set_stage(session_id, SessionManager.STAGE_FINISHED)
+
+    # Rank once: the teacher gets the full scoreboard
+    students = session["students"]
+    leaderboard = session["leaderboard"]
+    standings = RankingManager.build_standings(students, leaderboard)
+    winners = RankingManager.get_winners(students, leaderboard)
+
+    # Students get the winners, the top K and their own position (built
+    # before any await, while the standings still match the board)
+    top = standings.top(RankingManager.TOP_K)
+    student_payloads = [
+        (sid, RankingManager.build_student_finished_payload(
+            winners,
+            RankingManager.build_student_ranking(top, standings[sid], len(standings)),
+        ))
+        for sid in students
+    ]
 
-    # Build final results payload
-    payload = RankingManager.build_quiz_finished_payload(session["students"])
-
-    # Send to all participants (room + teacher)
-    room = SessionManager.get_room_name(session_id)
-    await sio.emit("quiz_finished", payload, room=room)
-    await sio.emit("quiz_finished", payload, to=session["teacher_sid"])
+    await sio.emit(
+        "quiz_finished",
+        {"type": "quiz_finished", "winners": winners, "scoreboard": standings.players()},
+        to=session["teacher_sid"]
+    )
+    await emit_each("quiz_finished", student_payloads)
 
-    # Persist session to database
+    # Queue session for persistence (durable once spooled). If spooling
+    # fails, end_session retries before the reaper deletes the session.
     try:
-        db_session_id = await persist_session(session)
-        if db_session_id:
-            print(f"[FINISH_SESSION] Session {session_id} persisted to DB with ID {db_session_id}")
-        else:
-            print(f"[FINISH_SESSION] Failed to persist session {session_id}")
+        job_id = await submit_for_persistence(session)
+        await SessionManager.mark_session_persisted(session_id)
+        finish_log.info("Session %s queued for persistence (%s)", session_id, job_id)
     except Exception as e:
-        print(f"[FINISH_SESSION] Error persisting session: {e}")
+        finish_log.error("Error spooling session %s, retried on eviction: %s", session_id, e)
+
+
+async def submit_for_persistence(session: dict[str, Any], status: str = STATUS_FINISHED) -> str:
+    """
+    Queue a session's final state for persistence.
+
+    In incremental mode a started session only needs its totals; otherwise
+    the whole session is written.
+
+    Args:
+        session: Session data dictionary
+        status: Final status (STATUS_FINISHED or STATUS_CANCELLED)
+
+    Returns:
+        Persistence job ID
+    """
+    if PERSISTENCE_MODE == MODE_INCREMENTAL and session["started_at"] is not None:
+        return await persistence_queue.submit_finish(session, status)
+    return await persistence_queue.submit(session, status)
+
+
+async def end_session(session: dict[str, Any], message: Optional[str]) -> bool:
+    """
+    Persist and delete a session that will not be continued.
+
+    A quiz abandoned while running is queued as cancelled with the questions
+    closed so far (in incremental mode, its totals, which also moves the
+    running DB row to cancelled). Finished sessions were queued by
+    finish_session; if that failed (session["persisted"] is False) they are
+    queued now. Sessions that never started have nothing to store. If
+    spooling fails the session is kept, so the reaper retries.
+
+    Args:
+        session: Session data dictionary
+        message: session:ended reason sent to the audience, or None
+
+    Returns:
+        True if the session was deleted
+    """
+    session_id = session["session_id"]
+    if session["stage"] == SessionManager.STAGE_RUNNING:
+        status = STATUS_CANCELLED
+    elif session["stage"] == SessionManager.STAGE_FINISHED and not session["persisted"]:
+        status = STATUS_FINISHED
+    else:
+        status = None
+    if status is not None:
+        try:
+            job_id = await submit_for_persistence(session, status)
+            session_log.info("Session %s queued for persistence as %s (%s)", session_id, status, job_id)
+        except Exception as e:
+            session_log.error("Error spooling session %s, keeping it: %s", session_id, e)
+            return False
+
+    cancel_question_timer(session_id)
+    audience = SessionManager.get_audience_rooms(session_id)
+    if message is not None:
+        await sio.emit("session:ended", {"reason": message}, room=audience)
+    # Drop the rooms so sockets still connected no longer reference the session
+    for room in audience:
+        await sio.close_room(room)
+
+    deleted = await SessionManager.delete_session(session_id)
+    discard_session_updates(session_id)
+    return deleted
+
+
+async def evict_session(session: dict[str, Any], reason: str) -> bool:
+    """
+    Persist and delete a session picked by the session reaper.
+
+    Args:
+        session: Session data dictionary
+        reason: Why the session expired (see managers/reaper.py)
+
+    Returns:
+        True if the session was deleted, False to retry on the next sweep
+    """
+    message = None if reason == REASON_FINISHED else "Session expired"
+    return await end_session(session, message)
+
+
+# Evicts finished, idle and teacherless sessions. Teacher sockets are only
+# visible to this worker without a shared client manager.
+session_reaper = SessionReaper(
+    evict_session,
+    interval=SESSION_REAP_INTERVAL,
+    finished_ttl=SESSION_FINISHED_TTL,
+    idle_ttl=SESSION_IDLE_TTL,
+    teacherless_ttl=SESSION_TEACHERLESS_TTL,
+    teacher_connected=(lambda sid: sio.manager.is_connected(sid, "/")) if client_manager is None else None,
+)
+metrics_registry.add_collector(stats_collector(
+    "livequiz_session_reaper", session_reaper.stats, "Session reaper stats",
+    counters=["sweeps", "failures", "reaped_finished", "reaped_idle", "reaped_teacherless", "reclaimed_bytes"],
+))
+
+
+async def startup() -> None:
+    """Start background workers (called from the ASGI lifespan startup)."""
+    if LOG_QUEUE:
+        configure_logging(
+            level=getattr(settings, "LIVE_LOG_LEVEL", "INFO"),
+            fmt=getattr(settings, "LIVE_LOG_FORMAT", "text"),
+            sampling=getattr(settings, "LIVE_LOG_SAMPLING", None),
+        )
+    await persistence_queue.start()
+    session_reaper.start()
+
+
+async def shutdown() -> None:
+    """Stop background workers, letting queued sessions drain first, then the log writer."""
+    await session_reaper.stop()
+    await persistence_queue.stop()
+    stop_logging()
 
 
 # =============================================================================
@@ -358,7 +828,7 @@ async def finish_session(session_id: str) -> None:
 # =============================================================================
 
 
-@sio.event
+@on_event("connect")
 async def connect(sid: str, environ: dict[str, Any], auth: dict[str, Any] | None = None) -> None:
     """
     Handle new socket connection.
@@ -371,13 +841,14 @@ async def connect(sid: str, environ: dict[str, Any], auth: dict[str, Any] | None
         environ: WSGI environ dictionary
         auth: Authentication data sent by client (e.g., {"token": "..."})
     """
-    print(f"[CONNECT] Client connected: {sid}")
+    connect_log.info("Client connected: %s", sid)
+    connected_sockets.inc()
     if auth:
-        print(f"[CONNECT] Auth data received: {auth.get('token', 'N/A')[:20]}...")
+        connect_log.info("Auth data received: %s...", auth.get("token", "N/A")[:20])
 
 
-@sio.event
-async def disconnect(sid: str) -> None:
+@on_event("disconnect")
+async def disconnect(sid: str, reason: Optional[str] = None) -> None:
     """
     Handle socket disconnection.
 
@@ -385,38 +856,28 @@ async def disconnect(sid: str) -> None:
 
     Args:
         sid: Socket ID of the disconnected client
+        reason: Disconnect reason (python-socketio 5.12+)
     """
-    print(f"[DISCONNECT] Client disconnected: {sid}")
+    disconnect_log.info("Client disconnected: %s", sid)
+    connected_sockets.dec()
 
     # Check if this was a student
-    session = SessionManager.get_session_by_student(sid)
+    session = await SessionManager.get_session_by_student(sid)
     if session:
         session_id = session["session_id"]
-        SessionManager.remove_student(session_id, sid)
+        await SessionManager.remove_student(session_id, sid)
 
-        # Notify teacher of updated student list
-        student_list = SessionManager.get_student_list(session_id)
-        await sio.emit(
-            "session:state",
-            {"students": student_list},
-            to=session["teacher_sid"]
-        )
-        print(f"[DISCONNECT] Student removed from session {session_id}")
+        # Notify teacher (coalesced into the next roster delta)
+        queue_roster_change(session_id, left=sid)
+        disconnect_log.info("Student removed from session %s", session_id)
 
     # Check if this was a teacher
-    session = SessionManager.get_session_by_teacher(sid)
+    session = await SessionManager.get_session_by_teacher(sid)
     if session:
         session_id = session["session_id"]
-        # Notify all students that session ended
-        room = SessionManager.get_room_name(session_id)
-        await sio.emit(
-            "session:ended",
-            {"reason": "Teacher disconnected"},
-            room=room
-        )
-        # Clean up session
-        SessionManager.delete_session(session_id)
-        print(f"[DISCONNECT] Teacher disconnected, session {session_id} deleted")
+        # Store a quiz left running as cancelled, notify everyone, clean up
+        if await end_session(session, "Teacher disconnected"):
+            disconnect_log.info("Teacher disconnected, session %s deleted", session_id)
 
 
 # =============================================================================
@@ -424,7 +885,7 @@ async def disconnect(sid: str) -> None:
 # =============================================================================
 
 
-@sio.on("teacher:create_session")
+@on_event("teacher:create_session")
 async def teacher_create_session(sid: str, data: dict[str, Any]) -> None:
     """
     Handle teacher creating a new quiz session.
@@ -433,8 +894,8 @@ async def teacher_create_session(sid: str, data: dict[str, Any]) -> None:
 
     Steps:
         1. Extract topic_id
-        2. Load Topic from Django ORM
-        3. Load all questions for the topic
+        2. Load Topic from the topic cache (Django ORM on a miss)
+        3. Load all questions with their options in one bulk query (same snapshot)
         4. Shuffle question list
         5. Load time_per_question
         6. Generate 4-character session_id
@@ -447,36 +908,43 @@ async def teacher_create_session(sid: str, data: dict[str, Any]) -> None:
         sid: Teacher's socket ID
         data: {topic_id: int}
     """
-    print(f"[TEACHER] Create session request from {sid}: {data}")
+    teacher_log.info("Create session request from %s: %s", sid, data, event="teacher.create_session")
 
     topic_id = data.get("topic_id")
     if not topic_id:
         await sio.emit("error", {"message": "topic_id is required"}, to=sid)
         return
 
-    # Load topic data
-    topic_data = await QuestionManager.load_topic_data(topic_id)
-    if not topic_data:
+    # Load topic + whole question set (shared cache); it is frozen for the session
+    snapshot = await QuestionManager.load_topic_snapshot(topic_id)
+    if not snapshot:
         await sio.emit("error", {"message": "Topic not found"}, to=sid)
         return
 
-    # Load question IDs
-    question_ids = await QuestionManager.load_question_ids(topic_id)
-    if not question_ids:
+    topic_data = snapshot["topic"]
+    questions = snapshot["questions"]
+    if not questions:
         await sio.emit("error", {"message": "No questions found for topic"}, to=sid)
         return
+    question_ids = list(questions)
 
     # Create session
-    session = SessionManager.create_session(
-        topic_id=topic_id,
-        teacher_sid=sid,
-        time_per_question=topic_data["time_per_question"],
-        question_ids=question_ids,
-    )
+    try:
+        session = await SessionManager.create_session(
+            topic_id=topic_id,
+            teacher_sid=sid,
+            time_per_question=topic_data["time_per_question"],
+            question_ids=question_ids,
+            questions=questions,
+        )
+    except RuntimeError as e:
+        # Every session code is in use
+        teacher_log.error("Cannot create session: %s", e, event="teacher.create_session")
+        await sio.emit("error", {"message": "No session codes available, try again later"}, to=sid)
+        return
 
-    # Add teacher to room
-    room = SessionManager.get_room_name(session["session_id"])
-    await sio.enter_room(sid, room)
+    # Add teacher to the teacher room (students have their own room)
+    await sio.enter_room(sid, SessionManager.get_teacher_room_name(session["session_id"]))
 
     # Send session created event
     await sio.emit(
@@ -490,10 +958,10 @@ async def teacher_create_session(sid: str, data: dict[str, Any]) -> None:
         to=sid
     )
 
-    print(f"[TEACHER] Session created: {session['session_id']}")
+    teacher_log.info("Session created: %s", session["session_id"], event="teacher.create_session")
 
 
-@sio.on("teacher:join_session")
+@on_event("teacher:join_session")
 async def teacher_join_session(sid: str, data: dict[str, Any]) -> None:
     """
     Handle teacher joining/reconnecting to an existing session.
@@ -508,50 +976,38 @@ async def teacher_join_session(sid: str, data: dict[str, Any]) -> None:
         data: {session_id: str}
     """
     try:
-        print(f"[TEACHER] Join session request from {sid}: {data}", flush=True)
+        teacher_log.info("Join session request from %s: %s", sid, data, event="teacher.join_session")
 
         session_id = data.get("session_id")
         if not session_id:
             await sio.emit("error", {"message": "session_id is required"}, to=sid)
             return
 
-        session = SessionManager.get_session(session_id)
+        session = await SessionManager.get_session(session_id)
         if not session:
             await sio.emit("error", {"message": "Session not found"}, to=sid)
             return
 
         # Update teacher_sid to current socket
-        old_sid = session["teacher_sid"]
-        session["teacher_sid"] = sid
-        print(f"[TEACHER] Updated teacher_sid: {old_sid} -> {sid}", flush=True)
+        old_sid = await SessionManager.set_teacher_sid(session_id, sid)
+        teacher_log.info("Updated teacher_sid: %s -> %s", old_sid, sid, event="teacher.join_session")
 
-        # Add current socket to room
-        room = SessionManager.get_room_name(session_id)
+        # Move the teacher room to the current socket
+        room = SessionManager.get_teacher_room_name(session_id)
+        if old_sid and old_sid != sid:
+            await sio.leave_room(old_sid, room)
         await sio.enter_room(sid, room)
-        print(f"[TEACHER] Added {sid} to room {room}", flush=True)
+        teacher_log.info("Added %s to room %s", sid, room, event="teacher.join_session")
 
-        # Send current session state
-        student_list = SessionManager.get_student_list(session_id)
-        await sio.emit(
-            "session:state",
-            {
-                "session_id": session_id,
-                "stage": session["stage"],
-                "students": student_list,
-                "current_question": session["current_question"],
-                "questions_remaining": len(session["question_queue"]),
-            },
-            to=sid
-        )
+        # Send current session state (full snapshot; deltas follow from its seq)
+        await sio.emit("session:state", await build_session_state(session_id), to=sid)
 
-        print(f"[TEACHER] Joined session {session_id}", flush=True)
+        teacher_log.info("Joined session %s", session_id, event="teacher.join_session")
     except Exception as e:
-        print(f"[TEACHER] ERROR in join_session: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
+        teacher_log.exception("ERROR in join_session: %s", e, event="teacher.join_session")
 
 
-@sio.on("teacher:start_session")
+@on_event("teacher:start_session")
 async def teacher_start_session(sid: str, data: dict[str, Any]) -> None:
     """
     Handle teacher starting the quiz session.
@@ -568,14 +1024,14 @@ async def teacher_start_session(sid: str, data: dict[str, Any]) -> None:
         sid: Teacher's socket ID
         data: {session_id: str}
     """
-    print(f"[TEACHER] Start session request from {sid}: {data}")
+    teacher_log.info("Start session request from %s: %s", sid, data, event="teacher.start_session")
 
     session_id = data.get("session_id")
     if not session_id:
         await sio.emit("error", {"message": "session_id is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         await sio.emit("error", {"message": "Session not found"}, to=sid)
         return
@@ -596,11 +1052,18 @@ async def teacher_start_session(sid: str, data: dict[str, Any]) -> None:
         return
 
     # Set stage to running and mark start time
-    SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
-    SessionManager.mark_session_started(session_id)
+    await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+    await SessionManager.mark_session_started(session_id)
+
+    # Incremental persistence: store the session and its roster now
+    if PERSISTENCE_MODE == MODE_INCREMENTAL:
+        try:
+            await persistence_queue.submit_start(session)
+        except Exception as e:
+            teacher_log.error("Error spooling start of session %s: %s", session_id, e, event="teacher.start_session")
 
     # Pop and send first question
-    question_id = SessionManager.pop_next_question(session_id)
+    question_id = await SessionManager.pop_next_question(session_id)
     if question_id:
         await send_question(session_id, question_id)
         await sio.emit(
@@ -608,12 +1071,12 @@ async def teacher_start_session(sid: str, data: dict[str, Any]) -> None:
             {"session_id": session_id},
             to=sid
         )
-        print(f"[TEACHER] Session {session_id} started")
+        teacher_log.info("Session %s started", session_id, event="teacher.start_session")
     else:
         await sio.emit("error", {"message": "No questions available"}, to=sid)
 
 
-@sio.on("teacher:next_question")
+@on_event("teacher:next_question")
 async def teacher_next_question(sid: str, data: dict[str, Any]) -> None:
     """
     Handle teacher requesting next question.
@@ -628,14 +1091,14 @@ async def teacher_next_question(sid: str, data: dict[str, Any]) -> None:
         sid: Teacher's socket ID
         data: {session_id: str}
     """
-    print(f"[TEACHER] Next question request from {sid}: {data}")
+    teacher_log.info("Next question request from %s: %s", sid, data, event="teacher.next_question")
 
     session_id = data.get("session_id")
     if not session_id:
         await sio.emit("error", {"message": "session_id is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         await sio.emit("error", {"message": "Session not found"}, to=sid)
         return
@@ -654,17 +1117,17 @@ async def teacher_next_question(sid: str, data: dict[str, Any]) -> None:
     await close_question(session_id)
 
     # Check if there are more questions
-    if SessionManager.has_questions_remaining(session_id):
-        question_id = SessionManager.pop_next_question(session_id)
+    if await SessionManager.has_questions_remaining(session_id):
+        question_id = await SessionManager.pop_next_question(session_id)
         if question_id:
             await send_question(session_id, question_id)
-            print(f"[TEACHER] Next question sent for session {session_id}")
+            teacher_log.info("Next question sent for session %s", session_id, event="teacher.next_question")
     else:
         await finish_session(session_id)
-        print(f"[TEACHER] Session {session_id} finished - no more questions")
+        teacher_log.info("Session %s finished - no more questions", session_id, event="teacher.next_question")
 
 
-@sio.on("teacher:finish_session")
+@on_event("teacher:finish_session")
 async def teacher_finish_session(sid: str, data: dict[str, Any]) -> None:
     """
     Handle teacher manually finishing the session.
@@ -675,14 +1138,14 @@ async def teacher_finish_session(sid: str, data: dict[str, Any]) -> None:
         sid: Teacher's socket ID
         data: {session_id: str}
     """
-    print(f"[TEACHER] Finish session request from {sid}: {data}")
+    teacher_log.info("Finish session request from %s: %s", sid, data, event="teacher.finish_session")
 
     session_id = data.get("session_id")
     if not session_id:
         await sio.emit("error", {"message": "session_id is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         await sio.emit("error", {"message": "Session not found"}, to=sid)
         return
@@ -698,7 +1161,159 @@ async def teacher_finish_session(sid: str, data: dict[str, Any]) -> None:
 
     # Finish session
     await finish_session(session_id)
-    print(f"[TEACHER] Session {session_id} manually finished")
+    teacher_log.info("Session %s manually finished", session_id, event="teacher.finish_session")
+
+
+@on_event("teacher:get_scoreboard")
+async def teacher_get_scoreboard(sid: str, data: dict[str, Any]) -> None:
+    """
+    Handle teacher requesting a page of the full scoreboard.
+
+    Event: teacher:get_scoreboard
+
+    Args:
+        sid: Teacher's socket ID
+        data: {session_id: str, offset: int = 0, limit: int = 50}
+    """
+    session_id = data.get("session_id")
+    if not session_id:
+        await sio.emit("error", {"message": "session_id is required"}, to=sid)
+        return
+
+    session = await SessionManager.get_session(session_id)
+    if not session:
+        await sio.emit("error", {"message": "Session not found"}, to=sid)
+        return
+
+    # Verify teacher
+    if session["teacher_sid"] != sid:
+        await sio.emit("error", {"message": "Not authorized"}, to=sid)
+        return
+
+    try:
+        offset = int(data.get("offset", 0))
+        limit = int(data.get("limit", 50))
+    except (TypeError, ValueError):
+        await sio.emit("error", {"message": "offset and limit must be integers"}, to=sid)
+        return
+
+    page = RankingManager.build_scoreboard_page(
+        session["students"], session["leaderboard"], offset, limit
+    )
+    await sio.emit("session:scoreboard", page, to=sid)
+
+
+async def get_timer_request_session(sid: str, data: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    Validate a teacher's question timer request.
+
+    Args:
+        sid: Teacher's socket ID
+        data: {session_id: str, ...}
+
+    Returns:
+        The session, or None after sending the error to the teacher
+    """
+    session_id = data.get("session_id")
+    if not session_id:
+        await sio.emit("error", {"message": "session_id is required"}, to=sid)
+        return None
+
+    session = await SessionManager.get_session(session_id)
+    if not session:
+        await sio.emit("error", {"message": "Session not found"}, to=sid)
+        return None
+
+    # Verify teacher
+    if session["teacher_sid"] != sid:
+        await sio.emit("error", {"message": "Not authorized"}, to=sid)
+        return None
+
+    return session
+
+
+async def emit_question_timer(session: dict[str, Any], paused: bool, remaining: float) -> None:
+    """Tell everyone in the session how long the current question has left."""
+    await sio.emit(
+        "session:question_timer",
+        {"question_id": session["current_question"], "paused": paused, "remaining": round(remaining, 1)},
+        room=SessionManager.get_audience_rooms(session["session_id"]),
+    )
+
+
+@on_event("teacher:pause_question")
+async def teacher_pause_question(sid: str, data: dict[str, Any]) -> None:
+    """
+    Handle teacher pausing the current question's clock.
+
+    Event: teacher:pause_question
+
+    Args:
+        sid: Teacher's socket ID
+        data: {session_id: str}
+    """
+    session = await get_timer_request_session(sid, data)
+    if not session:
+        return
+
+    remaining = await pause_question_timer(session["session_id"])
+    if remaining is None:
+        await sio.emit("error", {"message": "No running question to pause"}, to=sid)
+        return
+
+    await emit_question_timer(session, True, remaining)
+
+
+@on_event("teacher:resume_question")
+async def teacher_resume_question(sid: str, data: dict[str, Any]) -> None:
+    """
+    Handle teacher resuming a paused question.
+
+    Event: teacher:resume_question
+
+    Args:
+        sid: Teacher's socket ID
+        data: {session_id: str}
+    """
+    session = await get_timer_request_session(sid, data)
+    if not session:
+        return
+
+    remaining = await resume_question_timer(session["session_id"])
+    if remaining is None:
+        await sio.emit("error", {"message": "Question is not paused"}, to=sid)
+        return
+
+    await emit_question_timer(session, False, remaining)
+
+
+@on_event("teacher:extend_question")
+async def teacher_extend_question(sid: str, data: dict[str, Any]) -> None:
+    """
+    Handle teacher giving the current question more (or less) time.
+
+    Event: teacher:extend_question
+
+    Args:
+        sid: Teacher's socket ID
+        data: {session_id: str, seconds: int}
+    """
+    session = await get_timer_request_session(sid, data)
+    if not session:
+        return
+
+    try:
+        seconds = int(data.get("seconds"))
+    except (TypeError, ValueError):
+        await sio.emit("error", {"message": "seconds must be an integer"}, to=sid)
+        return
+
+    remaining = await extend_question_timer(session["session_id"], seconds)
+    if remaining is None:
+        await sio.emit("error", {"message": "No open question to extend"}, to=sid)
+        return
+
+    await emit_question_timer(session, session["question_remaining"] is not None, remaining)
 
 
 # =============================================================================
@@ -706,7 +1321,7 @@ async def teacher_finish_session(sid: str, data: dict[str, Any]) -> None:
 # =============================================================================
 
 
-@sio.on("student:join")
+@on_event("student:join")
 async def student_join(sid: str, data: dict[str, Any]) -> None:
     """
     Handle student joining a quiz session.
@@ -725,7 +1340,7 @@ async def student_join(sid: str, data: dict[str, Any]) -> None:
         sid: Student's socket ID
         data: {session_id: str, name: str}
     """
-    print(f"[STUDENT] Join request from {sid}: {data}")
+    student_log.info("Join request from %s: %s", sid, data, event="student.join")
 
     session_id = data.get("session_id")
     name = data.get("name", "").strip()
@@ -738,7 +1353,7 @@ async def student_join(sid: str, data: dict[str, Any]) -> None:
         await sio.emit("error", {"message": "name is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         await sio.emit("error", {"message": "Session not found"}, to=sid)
         return
@@ -753,7 +1368,7 @@ async def student_join(sid: str, data: dict[str, Any]) -> None:
         return
 
     # Add student
-    if not SessionManager.add_student(session_id, sid, name):
+    if not await SessionManager.add_student(session_id, sid, name):
         await sio.emit("error", {"message": "Could not join session"}, to=sid)
         return
 
@@ -772,18 +1387,13 @@ async def student_join(sid: str, data: dict[str, Any]) -> None:
         to=sid
     )
 
-    # Send updated student list to teacher
-    student_list = SessionManager.get_student_list(session_id)
-    await sio.emit(
-        "session:state",
-        {"students": student_list},
-        to=session["teacher_sid"]
-    )
+    # Notify teacher (coalesced into the next roster delta)
+    queue_roster_change(session_id, joined={"sid": sid, "name": name, "score": 0})
 
-    print(f"[STUDENT] {name} joined session {session_id}")
+    student_log.info("%s joined session %s", name, session_id, event="student.join")
 
 
-@sio.on("student:answer")
+@on_event("student:answer")
 async def student_answer(sid: str, data: dict[str, Any]) -> None:
     """
     Handle student submitting an answer.
@@ -793,15 +1403,16 @@ async def student_answer(sid: str, data: dict[str, Any]) -> None:
     Rules:
         1. Session stage must be "running"
         2. Question deadline must NOT be expired
-        3. Student must NOT have already answered this question
-        4. Save answer
-        5. If all students answered -> close_question()
+        3. option_id must be one of the current question's options
+        4. Student must NOT have already answered this question
+        5. Save answer
+        6. If all students answered -> close_question()
 
     Args:
         sid: Student's socket ID
         data: {session_id: str, option_id: int}
     """
-    print(f"[STUDENT] Answer from {sid}: {data}")
+    student_log.info("Answer from %s: %s", sid, data, event="student.answer")
 
     session_id = data.get("session_id")
     option_id = data.get("option_id")
@@ -814,7 +1425,11 @@ async def student_answer(sid: str, data: dict[str, Any]) -> None:
         await sio.emit("error", {"message": "option_id is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    if not isinstance(option_id, int) or isinstance(option_id, bool):
+        await sio.emit("error", {"message": "option_id must be an integer"}, to=sid)
+        return
+
+    session = await SessionManager.get_session(session_id)
     if not session:
         await sio.emit("error", {"message": "Session not found"}, to=sid)
         return
@@ -833,8 +1448,12 @@ async def student_answer(sid: str, data: dict[str, Any]) -> None:
         )
         return
 
+    if option_id not in session["option_counts"]:
+        await sio.emit("error", {"message": "Invalid option"}, to=sid)
+        return
+
     # Check if already answered
-    if SessionManager.has_student_answered(session_id, sid):
+    if await SessionManager.has_student_answered(session_id, sid):
         await sio.emit(
             "error",
             {"message": "Already answered this question"},
@@ -843,7 +1462,7 @@ async def student_answer(sid: str, data: dict[str, Any]) -> None:
         return
 
     # Record answer
-    if not SessionManager.record_answer(session_id, sid, option_id):
+    if not await SessionManager.record_answer(session_id, sid, option_id):
         await sio.emit("error", {"message": "Could not record answer"}, to=sid)
         return
 
@@ -854,27 +1473,21 @@ async def student_answer(sid: str, data: dict[str, Any]) -> None:
         to=sid
     )
 
-    # Notify teacher of answer count
-    answer_count = len(session["answers"])
-    student_count = len(session["students"])
-    await sio.emit(
-        "session:answer_count",
-        {
-            "answered": answer_count,
-            "total": student_count
-        },
-        to=session["teacher_sid"]
-    )
+    # Notify teacher of answer count (throttled, see ANSWER_COUNT_INTERVAL)
+    answer_counts.touch(session_id)
 
-    print(f"[STUDENT] Answer recorded: {answer_count}/{student_count}")
+    student_log.info(
+        "Answer recorded: %s/%s", SessionManager.answer_count(session), len(session["students"]),
+        event="student.answer_recorded",
+    )
 
     # Check if all students answered
-    if SessionManager.all_students_answered(session_id):
-        print(f"[SESSION] All students answered, closing question")
+    if await SessionManager.all_students_answered(session_id):
+        session_log.info("All students answered in session %s, closing question", session_id)
         await close_question(session_id)
 
 
-@sio.on("student:leave")
+@on_event("student:leave")
 async def student_leave(sid: str, data: dict[str, Any]) -> None:
     """
     Handle student leaving a quiz session.
@@ -885,19 +1498,19 @@ async def student_leave(sid: str, data: dict[str, Any]) -> None:
         sid: Student's socket ID
         data: {session_id: str}
     """
-    print(f"[STUDENT] Leave request from {sid}: {data}")
+    student_log.info("Leave request from %s: %s", sid, data, event="student.leave")
 
     session_id = data.get("session_id")
     if not session_id:
         await sio.emit("error", {"message": "session_id is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         return
 
     # Remove student
-    if SessionManager.remove_student(session_id, sid):
+    if await SessionManager.remove_student(session_id, sid):
         # Leave room
         room = SessionManager.get_room_name(session_id)
         await sio.leave_room(sid, room)
@@ -905,15 +1518,10 @@ async def student_leave(sid: str, data: dict[str, Any]) -> None:
         # Confirm leave
         await sio.emit("student:left", {"message": "Left the quiz"}, to=sid)
 
-        # Notify teacher
-        student_list = SessionManager.get_student_list(session_id)
-        await sio.emit(
-            "session:state",
-            {"students": student_list},
-            to=session["teacher_sid"]
-        )
+        # Notify teacher (coalesced into the next roster delta)
+        queue_roster_change(session_id, left=sid)
 
-        print(f"[STUDENT] Left session {session_id}")
+        student_log.info("Left session %s", session_id, event="student.leave")
 
 
 # =============================================================================
@@ -921,7 +1529,7 @@ async def student_leave(sid: str, data: dict[str, Any]) -> None:
 # =============================================================================
 
 
-@sio.event
+@on_event("get_session_state")
 async def get_session_state(sid: str, data: dict[str, Any]) -> None:
     """
     Get current session state (for reconnection or debugging).
@@ -935,21 +1543,9 @@ async def get_session_state(sid: str, data: dict[str, Any]) -> None:
         await sio.emit("error", {"message": "session_id is required"}, to=sid)
         return
 
-    session = SessionManager.get_session(session_id)
+    session = await SessionManager.get_session(session_id)
     if not session:
         await sio.emit("error", {"message": "Session not found"}, to=sid)
         return
 
-    student_list = SessionManager.get_student_list(session_id)
-
-    await sio.emit(
-        "session:state",
-        {
-            "session_id": session_id,
-            "stage": session["stage"],
-            "students": student_list,
-            "current_question": session["current_question"],
-            "questions_remaining": len(session["question_queue"]),
-        },
-        to=sid
-    )
+    await sio.emit("session:state", await build_session_state(session_id), to=sid)
@@ -0,0 +1,1490 @@
+import asyncio
+import json
+import random
+import tempfile
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from unittest import mock, skipIf
+
+from django.db import IntegrityError, OperationalError
+from django.test import SimpleTestCase, TestCase
+
+from .managers import (
+    CodeAllocator, MemorySessionStore, QuestionManager, RankingManager, RedisSessionStore, SessionManager,
+)
+from .managers import persistence
+from .managers.answers import QuestionAnswers
+from .managers.codes import FeistelPermutation, RedisCodeAllocator
+from .managers.persistence import STATUS_CANCELLED, STATUS_FINISHED, PersistenceQueue
+from .managers.ranking import Leaderboard
+from .managers.reaper import REASON_FINISHED, REASON_IDLE, REASON_TEACHERLESS, SessionReaper
+from .managers.students import StudentTable
+from .managers.sessions import active_sessions
+from .managers.store import build_store
+from .utils.packets import PacketCache
+from .utils.scheduler import DeadlineScheduler
+from .utils.serializers import build_serializer
+from .utils.throttle import Throttle
+
+try:
+    import fakeredis
+except ImportError:  # optional, like redis itself
+    fakeredis = None
+
+try:
+    import msgpack
+except ImportError:  # optional wire encoding
+    msgpack = None
+
+
+class ManagerTestMixin:
+    """Run SessionManager against a fresh store and code allocator."""
+
+    def setUp(self):
+        self._previous = SessionManager.store, SessionManager.codes
+        self.store = self.make_store()
+        SessionManager.configure_store(self.store)
+        SessionManager.configure_codes(CodeAllocator(seed=1))
+
+    def tearDown(self):
+        SessionManager.configure_store(self._previous[0])
+        SessionManager.configure_codes(self._previous[1])
+
+    def make_store(self):
+        return MemorySessionStore()
+
+
+class MemoryIndexTests(ManagerTestMixin, SimpleTestCase):
+    """Socket ID indexes stay consistent with the sessions they point at."""
+
+    async def index(self, role):
+        return dict(self.store.indexes[role])
+
+    async def assert_indexes_consistent(self, sessions):
+        students = await self.index("student")
+        teachers = await self.index("teacher")
+
+        expected_students = {
+            sid: session_id
+            for session_id in sessions
+            for sid in (await SessionManager.get_session(session_id))["students"]
+        }
+        expected_teachers = {
+            (await SessionManager.get_session(session_id))["teacher_sid"]: session_id
+            for session_id in sessions
+        }
+        self.assertEqual(students, expected_students)
+        self.assertEqual(teachers, expected_teachers)
+
+        for sid, session_id in students.items():
+            self.assertEqual((await SessionManager.get_session_by_student(sid))["session_id"], session_id)
+        for sid, session_id in teachers.items():
+            self.assertEqual((await SessionManager.get_session_by_teacher(sid))["session_id"], session_id)
+
+    async def test_indexes_survive_churn(self):
+        rng = random.Random(7)
+        sessions: list[str] = []
+        counter = 0
+        gone: list[str] = []  # socket IDs removed, reassigned or deleted
+
+        for _ in range(300):
+            counter += 1
+            op = rng.choice(["create", "add", "add", "add", "remove", "reassign", "delete"])
+            if op == "create" or not sessions:
+                session = await SessionManager.create_session(1, f"teacher-{counter}", 30, [1, 2])
+                sessions.append(session["session_id"])
+                continue
+
+            session_id = rng.choice(sessions)
+            session = await SessionManager.get_session(session_id)
+            if op == "add":
+                self.assertTrue(await SessionManager.add_student(session_id, f"student-{counter}", "S"))
+            elif op == "remove" and session["students"]:
+                sid = rng.choice(list(session["students"]))
+                self.assertTrue(await SessionManager.remove_student(session_id, sid))
+                gone.append(sid)
+            elif op == "reassign":
+                old_sid = await SessionManager.set_teacher_sid(session_id, f"teacher-{counter}")
+                gone.append(old_sid)
+            elif op == "delete":
+                gone.extend(session["students"])
+                gone.append(session["teacher_sid"])
+                self.assertTrue(await SessionManager.delete_session(session_id))
+                sessions.remove(session_id)
+
+            await self.assert_indexes_consistent(sessions)
+
+        for sid in gone:
+            self.assertIsNone(await SessionManager.get_session_by_student(sid))
+            self.assertIsNone(await SessionManager.get_session_by_teacher(sid))
+
+    async def test_unbind_only_if_still_pointing(self):
+        await self.store.bind_sid("student", "sid-1", "AAAA")
+        await self.store.bind_sid("student", "sid-1", "BBBB")
+
+        # A late cleanup of the first session must not drop the newer entry
+        await self.store.unbind_sid("student", "sid-1", "AAAA")
+        self.assertEqual(await self.store.lookup_sid("student", "sid-1"), "BBBB")
+
+        await self.store.unbind_sid("student", "sid-1", "BBBB")
+        self.assertIsNone(await self.store.lookup_sid("student", "sid-1"))
+
+    async def test_stale_entries_are_dropped_on_lookup(self):
+        session = await SessionManager.create_session(1, "teacher", 30, [1])
+        session_id = session["session_id"]
+        await SessionManager.add_student(session_id, "student", "S")
+
+        # Left behind by a crash between the session change and the unbind
+        await self.store.bind_sid("student", "ghost", session_id)
+        await self.store.bind_sid("teacher", "old-teacher", session_id)
+
+        self.assertIsNone(await SessionManager.get_session_by_student("ghost"))
+        self.assertIsNone(await SessionManager.get_session_by_teacher("old-teacher"))
+        self.assertIsNone(await self.store.lookup_sid("student", "ghost"))
+        self.assertIsNone(await self.store.lookup_sid("teacher", "old-teacher"))
+        self.assertEqual(await self.store.lookup_sid("student", "student"), session_id)
+
+    async def test_disconnect_does_not_scan_sessions(self):
+        from . import server
+
+        sessions = []
+        for i in range(20):
+            session_id = (await SessionManager.create_session(1, f"teacher-{i}", 30, [1]))["session_id"]
+            await SessionManager.add_student(session_id, f"student-{i}", "S")
+            sessions.append(session_id)
+
+        with mock.patch.object(type(self.store), "sessions", side_effect=AssertionError("scanned")), \
+                mock.patch.object(server, "queue_roster_change") as roster:
+            await server.disconnect("student-7")
+            await server.disconnect("teacher-3")
+
+        roster.assert_called_once_with(sessions[7], left="student-7")
+        self.assertNotIn("student-7", (await SessionManager.get_session(sessions[7]))["students"])
+        self.assertIsNone(await SessionManager.get_session(sessions[3]))
+        await self.assert_indexes_consistent([s for s in sessions if s != sessions[3]])
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class RedisIndexTests(MemoryIndexTests):
+    """The same invariants on the Redis store (fakeredis)."""
+
+    def make_store(self):
+        return RedisSessionStore(client=fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer()))
+
+    async def index(self, role):
+        entries = await self.store.client.hgetall(f"{self.store.index_prefix}{role}")
+        return {sid.decode(): session_id.decode() for sid, session_id in entries.items()}
+
+
+class BuildStoreTests(SimpleTestCase):
+    """build_store() picks the backend named by LIVE_SESSION_STORE_URL."""
+
+    def test_memory_store_is_backed_by_active_sessions(self):
+        for url in (None, "memory"):
+            self.assertIs(build_store(url).data, active_sessions)
+
+    def test_unknown_url_is_rejected(self):
+        with self.assertRaises(ValueError):
+            build_store("mongodb://localhost")
+
+
+class PersistenceQueueTests(SimpleTestCase):
+    """Failed records back off per session and end up in the dead-letter file."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.spool = Path(self.dir.name) / "spool.jsonl"
+        self.queue = PersistenceQueue(self.spool, backoff_base=0.01, backoff_max=0.05, max_attempts=3)
+        self.errors: dict[str, list[Exception]] = {}  # session_id -> errors to raise, in order
+        self.written: list[str] = []
+
+        def writer(record, replayed):
+            errors = self.errors.get(record["session_id"])
+            if errors:
+                raise errors.pop(0)
+            self.written.append(record["session_id"])
+            return 1
+
+        patcher = mock.patch.dict(persistence.RECORD_WRITERS, {"start": writer})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def submit(self, session_id):
+        await self.queue._submit("start", {"session_id": session_id, "topic_id": 1, "started_at": None})
+
+    async def drain(self):
+        for _ in range(200):
+            if self.queue._outstanding == 0 and self.spool.read_text() == "":
+                break
+            await asyncio.sleep(0.01)
+        await self.queue.stop()
+
+    def dead_letters(self):
+        if not self.queue.dead_letter_path.exists():
+            return []
+        with open(self.queue.dead_letter_path) as dead:
+            return [json.loads(line) for line in dead]
+
+    async def test_transient_error_backs_off_only_its_session(self):
+        self.errors["AAAA"] = [OperationalError("gone away")]
+        await self.submit("AAAA")
+        await self.submit("BBBB")
+        await self.drain()
+
+        self.assertEqual(self.written, ["BBBB", "AAAA"])
+        self.assertEqual(self.queue.stats()["retries"], 1)
+        self.assertEqual(self.dead_letters(), [])
+        self.assertEqual(self.spool.read_text(), "")
+
+    async def test_permanent_error_is_dead_lettered(self):
+        self.errors["AAAA"] = [IntegrityError("duplicate")]
+        await self.submit("AAAA")
+        await self.submit("BBBB")
+        await self.drain()
+
+        self.assertEqual(self.written, ["BBBB"])
+        self.assertEqual([entry["record"]["session_id"] for entry in self.dead_letters()], ["AAAA"])
+        self.assertEqual(self.queue.stats()["dead"], 1)
+        self.assertEqual(self.spool.read_text(), "")
+
+    async def test_attempts_are_capped(self):
+        self.errors["AAAA"] = [OperationalError("gone away")] * 5
+        await self.submit("AAAA")
+        await self.drain()
+
+        self.assertEqual(self.written, [])
+        self.assertEqual(self.dead_letters()[0]["attempts"], 3)
+        self.assertEqual(self.spool.read_text(), "")
+
+
+class PersistSessionTests(TestCase):
+    """A finished session is written with a query count that does not grow with its size."""
+
+    def setUp(self):
+        from quizzes.models import AnswerOption, Question, Topic
+        from users.models import User
+
+        teacher = User.objects.create_user("teacher@example.com", "secret")
+        self.topic = Topic.objects.create(teacher=teacher, title="Topic")
+        self.questions = {}  # question_id -> (correct option, wrong option)
+        for i in range(3):
+            question = Question.objects.create(topic=self.topic, text=f"Question {i}")
+            correct, wrong = AnswerOption.objects.bulk_create([
+                AnswerOption(question=question, text="Right", is_correct=True),
+                AnswerOption(question=question, text="Wrong"),
+            ])
+            self.questions[question.id] = (correct.id, wrong.id)
+
+    def record(self, code, student_count):
+        sids = [f"sid-{i}" for i in range(student_count)]
+        return {
+            "session_id": code,
+            "topic_id": self.topic.id,
+            "status": STATUS_FINISHED,
+            "time_per_question": 30,
+            "started_at": datetime(2026, 1, 1),
+            "students": {sid: {"name": sid, "score": 10} for sid in sids},
+            "questions": [
+                {
+                    "question_id": question_id,
+                    "correct_option_id": correct,
+                    "question_started_at": "2026-01-01T00:00:00",
+                    "sids": sids,
+                    # Even students are right
+                    "options": [correct if i % 2 == 0 else wrong for i in range(student_count)],
+                    "response_ms": [1000] * student_count,
+                }
+                for question_id, (correct, wrong) in self.questions.items()
+            ],
+        }
+
+    def test_bulk_insert(self):
+        from live.models import Session, SessionAnswer, SessionParticipant
+
+        with self.assertNumQueries(7) as small:
+            persistence._persist_session_sync(self.record("AAAA", 2))
+        with self.assertNumQueries(len(small.captured_queries)):
+            session_id = persistence._persist_session_sync(self.record("BBBB", 40))
+
+        session = Session.objects.get(pk=session_id)
+        self.assertEqual(session.total_questions, 3)
+        self.assertEqual(SessionAnswer.objects.filter(session_question__session=session).count(), 120)
+        participant = SessionParticipant.objects.get(session=session, socket_id="sid-1")
+        self.assertEqual((participant.correct_answers, participant.wrong_answers), (0, 3))
+        self.assertEqual(
+            SessionAnswer.objects.filter(participant__session=session, is_correct=True).count(), 60
+        )
+
+
+class EndSessionTests(ManagerTestMixin, SimpleTestCase):
+    """Sessions ended by a teacher disconnect or the reaper are persisted with the right status first."""
+
+    def setUp(self):
+        super().setUp()
+        from . import server
+
+        self.server = server
+        self.submit = mock.AsyncMock(return_value="job")
+        for target, value in [
+            (server.persistence_queue, {"submit": self.submit, "submit_finish": self.submit}),
+            (server.sio, {"emit": mock.AsyncMock(), "close_room": mock.AsyncMock()}),
+        ]:
+            patcher = mock.patch.multiple(target, **value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def running_session(self):
+        session = await SessionManager.create_session(1, "teacher", 30, [1])
+        session_id = session["session_id"]
+        await SessionManager.add_student(session_id, "student", "S")
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+        await SessionManager.mark_session_started(session_id)
+        return session_id
+
+    async def test_running_session_is_persisted_as_cancelled(self):
+        session_id = await self.running_session()
+        await self.server.disconnect("teacher")
+
+        self.assertEqual(self.submit.await_args.args[1], STATUS_CANCELLED)
+        self.assertIsNone(await SessionManager.get_session(session_id))
+        self.server.sio.emit.assert_awaited_with(
+            "session:ended", {"reason": "Teacher disconnected"},
+            room=SessionManager.get_audience_rooms(session_id),
+        )
+
+    async def test_session_is_kept_if_spooling_fails(self):
+        session_id = await self.running_session()
+        self.submit.side_effect = OSError("disk full")
+        await self.server.disconnect("teacher")
+
+        self.assertIsNotNone(await SessionManager.get_session(session_id))
+        self.server.sio.emit.assert_not_awaited()
+
+    async def test_waiting_session_is_not_persisted(self):
+        session = await SessionManager.create_session(1, "teacher", 30, [1])
+        await self.server.disconnect("teacher")
+
+        self.submit.assert_not_awaited()
+        self.assertIsNone(await SessionManager.get_session(session["session_id"]))
+
+    async def test_abandoned_session_is_evicted_as_cancelled(self):
+        session_id = await self.running_session()
+        session = await SessionManager.get_session(session_id)
+
+        self.assertTrue(await self.server.evict_session(session, REASON_IDLE))
+        self.assertEqual(self.submit.await_args.args[1], STATUS_CANCELLED)
+        self.assertIsNone(await SessionManager.get_session(session_id))
+
+    async def test_failed_finish_spool_is_retried_before_eviction(self):
+        session_id = await self.running_session()
+        self.submit.side_effect = OSError("disk full")
+        await self.server.finish_session(session_id)
+        session = await SessionManager.get_session(session_id)
+        self.assertFalse(session["persisted"])
+
+        # Still failing: the reaper keeps the session
+        self.assertFalse(await self.server.evict_session(session, REASON_FINISHED))
+        self.assertIsNotNone(await SessionManager.get_session(session_id))
+
+        self.submit.side_effect = None
+        self.submit.reset_mock()
+        self.assertTrue(await self.server.evict_session(session, REASON_FINISHED))
+        self.assertEqual(self.submit.await_args.args[1], STATUS_FINISHED)
+        self.assertIsNone(await SessionManager.get_session(session_id))
+
+    async def test_persisted_finished_session_is_not_queued_again(self):
+        session_id = await self.running_session()
+        await self.server.finish_session(session_id)
+        self.assertTrue((await SessionManager.get_session(session_id))["persisted"])
+        self.submit.reset_mock()
+
+        session = await SessionManager.get_session(session_id)
+        self.assertTrue(await self.server.evict_session(session, REASON_FINISHED))
+        self.submit.assert_not_awaited()
+
+
+class SessionReaperTests(ManagerTestMixin, SimpleTestCase):
+    """The reaper evicts finished, teacherless and idle sessions once they age past their TTL."""
+
+    async def session(self, teacher_sid, stage, age):
+        session = await SessionManager.create_session(1, teacher_sid, 30, [1])
+        session_id = session["session_id"]
+        await SessionManager.set_stage(session_id, stage)
+        self.store.data[session_id]["last_activity"] -= age
+        return session_id
+
+    def reaper(self, evict):
+        return SessionReaper(
+            evict, finished_ttl=600, idle_ttl=3600, teacherless_ttl=120,
+            teacher_connected=lambda sid: sid.startswith("live"),
+        )
+
+    async def test_sweep_evicts_by_reason(self):
+        waiting, finished = SessionManager.STAGE_WAITING, SessionManager.STAGE_FINISHED
+        expected = {
+            await self.session("live-1", finished, 700): REASON_FINISHED,
+            await self.session("gone-1", waiting, 200): REASON_TEACHERLESS,
+            await self.session("live-2", waiting, 4000): REASON_IDLE,
+        }
+        kept = [
+            await self.session("live-3", finished, 300),
+            await self.session("gone-2", waiting, 60),
+            await self.session("live-4", waiting, 3000),
+        ]
+        evicted = {}
+
+        async def evict(session, reason):
+            evicted[session["session_id"]] = reason
+            return await SessionManager.delete_session(session["session_id"])
+
+        reaper = self.reaper(evict)
+        result = await reaper.sweep()
+        self.assertEqual(evicted, expected)
+        self.assertEqual(sorted(self.store.data), sorted(kept))
+        self.assertEqual(
+            {reason: result[reason] for reason in reaper.reaped},
+            {REASON_FINISHED: 1, REASON_IDLE: 1, REASON_TEACHERLESS: 1},
+        )
+        self.assertGreater(result["bytes"], 0)
+        self.assertEqual(reaper.stats()["reclaimed_bytes"], result["bytes"])
+
+    async def test_failed_eviction_keeps_the_session(self):
+        session_id = await self.session("live", SessionManager.STAGE_WAITING, 4000)
+        reaper = self.reaper(mock.AsyncMock(side_effect=[False, RuntimeError("boom"), True]))
+
+        for _ in range(2):
+            self.assertEqual((await reaper.sweep())[REASON_IDLE], 0)
+            self.assertIn(session_id, self.store.data)
+        self.assertEqual((await reaper.sweep())[REASON_IDLE], 1)
+        self.assertEqual(reaper.stats()["failures"], 2)
+
+
+class ThrottleTests(SimpleTestCase):
+    """Flushes started by the timer are referenced until they finish."""
+
+    async def test_fired_flush_is_held_until_done(self):
+        release = asyncio.Event()
+        flushed = []
+
+        async def callback(key):
+            await release.wait()
+            flushed.append(key)
+
+        throttle = Throttle(0.01, callback)
+        throttle.touch("AAAA")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        self.assertEqual(len(throttle._running), 1)
+
+        release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(flushed, ["AAAA"])
+        self.assertEqual(throttle._running, set())
+
+
+class EmitEachTests(SimpleTestCase):
+    """answer_result fan-out sends every payload once with bounded concurrency."""
+
+    async def test_bounded_concurrent_fan_out(self):
+        from . import server
+
+        sent = []
+        in_flight = 0
+        peak = 0
+
+        async def emit(event, payload, to):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if to == "sid-13":
+                raise ConnectionError("gone")
+            sent.append((event, to, payload["n"]))
+
+        payloads = [(f"sid-{n}", {"n": n}) for n in range(100)]
+        with mock.patch.object(server.sio, "emit", emit), mock.patch.object(server, "FANOUT_CONCURRENCY", 8):
+            await server.emit_each("answer_result", payloads)
+
+        self.assertEqual(peak, 8)
+        self.assertEqual(
+            sorted(sent, key=lambda entry: entry[2]),
+            [("answer_result", f"sid-{n}", n) for n in range(100) if n != 13],
+        )
+
+
+class DeadlineSchedulerTests(SimpleTestCase):
+    """cancel() also stops a callback whose deadline already passed."""
+
+    async def test_cancel_stops_a_started_callback(self):
+        started = asyncio.Event()
+        cancelled = []
+
+        async def callback(key):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(key)
+                raise
+
+        scheduler = DeadlineScheduler()
+        scheduler.schedule("AAAA", 0, callback)
+        await started.wait()
+        self.assertNotIn("AAAA", scheduler)
+        self.assertEqual(scheduler.stats()["running"], 1)
+
+        self.assertTrue(scheduler.cancel("AAAA"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(cancelled, ["AAAA"])
+        self.assertEqual(scheduler.stats()["running"], 0)
+        self.assertFalse(scheduler.cancel("AAAA"))
+
+    async def test_pause_resume_and_extend(self):
+        fired = []
+
+        async def callback(key):
+            fired.append(key)
+
+        scheduler = DeadlineScheduler()
+        scheduler.schedule("AAAA", 0.05, callback)
+        self.assertAlmostEqual(scheduler.pause("AAAA"), 0.05, delta=0.02)
+        await asyncio.sleep(0.1)
+        self.assertEqual(fired, [])
+        self.assertEqual(scheduler.stats()["paused"], 1)
+
+        self.assertTrue(scheduler.resume("AAAA"))
+        self.assertTrue(scheduler.extend("AAAA", 0.1))
+        await asyncio.sleep(0.1)
+        self.assertEqual(fired, [])
+        await asyncio.sleep(0.1)
+        self.assertEqual(fired, ["AAAA"])
+        self.assertFalse(scheduler.extend("AAAA", 1))
+
+    async def test_callback_does_not_cancel_itself(self):
+        finished = asyncio.Event()
+
+        async def callback(key):
+            scheduler.cancel(key)
+            await asyncio.sleep(0)
+            finished.set()
+
+        scheduler = DeadlineScheduler()
+        scheduler.schedule("AAAA", 0, callback)
+        await asyncio.wait_for(finished.wait(), 1)
+
+
+SNAPSHOT = {
+    "topic": {"id": 1, "title": "Topic", "description": "", "time_per_question": 30},
+    "questions": {
+        question_id: {
+            "id": question_id,
+            "text": f"Question {question_id}",
+            "options": [{"id": option_id, "text": f"Option {option_id}"} for option_id in (1, 2, 3, 4)],
+            "correct_option_id": 1,
+        }
+        for question_id in (1, 2, 3)
+    },
+}
+
+
+class BroadcastTests(ManagerTestMixin, SimpleTestCase):
+    """Every recipient gets exactly one packet per broadcast event."""
+
+    BROADCASTS = {"session:question", "session:timer_expired", "session:question_closed", "quiz_finished"}
+
+    def setUp(self):
+        super().setUp()
+        from . import server
+        self.server = server
+        self.sio = server.sio
+        self.sent: list[tuple[str, str]] = []  # (socket name, event)
+        self.names: dict[str, str] = {}  # eio_sid -> socket name
+
+        async def send(eio_sid, pkt):
+            event = self.sio.packet_class(encoded_packet=pkt.data).data[0]
+            self.sent.append((self.names[eio_sid], event))
+
+        for patcher in [
+            mock.patch.object(self.sio, "_send_eio_packet", send),
+            mock.patch.object(self.sio.manager, "rooms", {}),
+            mock.patch.object(QuestionManager, "load_topic_snapshot", mock.AsyncMock(return_value=SNAPSHOT)),
+            mock.patch.multiple(
+                server.persistence_queue,
+                submit=mock.AsyncMock(), submit_start=mock.AsyncMock(),
+                submit_question=mock.AsyncMock(), submit_finish=mock.AsyncMock(),
+            ),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def connect(self, name):
+        self.names[f"eio-{name}"] = name
+        return await self.sio.manager.connect(f"eio-{name}", "/")
+
+    def received(self, events=None):
+        """Packets per (socket name, event) since the last call."""
+        events = events or self.BROADCASTS
+        counts = Counter(sent for sent in self.sent if sent[1] in events)
+        self.sent.clear()
+        return counts
+
+    async def test_one_packet_per_recipient(self):
+        teacher = await self.connect("teacher")
+        await self.server.teacher_create_session(teacher, {"topic_id": 1})
+        session_id = next(iter(self.store.data))
+        for name in ("s1", "s2"):
+            await self.server.student_join(await self.connect(name), {"session_id": session_id, "name": name})
+        everyone = ["teacher", "s1", "s2"]
+
+        self.received()
+        await self.server.teacher_start_session(teacher, {"session_id": session_id})
+        self.assertEqual(self.received(), Counter({(name, "session:question"): 1 for name in everyone}))
+
+        await self.server.on_question_deadline(session_id)
+        expected = Counter({
+            (name, event): 1
+            for name in everyone
+            for event in ("session:timer_expired", "session:question_closed")
+        })
+        expected.update({("s1", "answer_result"): 1, ("s2", "answer_result"): 1})
+        expected.update({("teacher", "ranking"): 1, ("teacher", "session:ranking"): 1})
+        self.assertEqual(
+            self.received(self.BROADCASTS | {"answer_result", "ranking", "session:ranking"}), expected
+        )
+
+        # The teacher comes back on a new socket; the old one is still connected
+        new_teacher = await self.connect("teacher2")
+        await self.server.teacher_join_session(new_teacher, {"session_id": session_id})
+        everyone = ["teacher2", "s1", "s2"]
+
+        self.received()
+        await self.server.teacher_next_question(new_teacher, {"session_id": session_id})
+        self.assertEqual(self.received(), Counter({(name, "session:question"): 1 for name in everyone}))
+
+        # Finishing closes the open question first
+        await self.server.teacher_finish_session(new_teacher, {"session_id": session_id})
+        self.assertEqual(self.received(), Counter({
+            (name, event): 1
+            for name in everyone
+            for event in ("session:question_closed", "quiz_finished")
+        }))
+
+
+class StudentTableTests(SimpleTestCase):
+    """The slot table reads like the {sid: {"name", "score"}} dict it replaced."""
+
+    def setUp(self):
+        self.table = StudentTable.from_dict({
+            "a": {"name": "Ann", "score": 0},
+            "b": {"name": "Bob", "score": 5},
+            "c": {"name": "Cy", "score": 10},
+        })
+
+    def test_freed_slots_are_reused(self):
+        slot = self.table.slot("b")
+        self.assertTrue(self.table.remove("b"))
+        self.assertFalse(self.table.remove("b"))
+        self.assertNotIn("b", self.table)
+        self.assertEqual(self.table.add("d", "Dee"), slot)
+        self.assertEqual((self.table.name("d"), self.table.score("d")), ("Dee", 0))
+        self.assertEqual(self.table.add("e", "Eve"), 3)
+        self.assertEqual(len(self.table), 4)
+        with self.assertRaises(KeyError):
+            self.table.score("b")
+
+    def test_iteration_follows_join_order(self):
+        self.table.remove("a")
+        self.table.add("d", "Dee")  # takes a's slot, joins last
+        self.table.add("b", "Bobby", 7)  # rejoin keeps b's place
+        self.assertEqual(list(self.table), ["b", "c", "d"])
+        self.assertEqual([sid for sid, _, _ in self.table.entries()], ["b", "c", "d"])
+        self.assertEqual(self.table.roster()[0], {"sid": "b", "name": "Bobby", "score": 7})
+        self.assertEqual(self.table.to_dict(), {
+            "b": {"name": "Bobby", "score": 7},
+            "c": {"name": "Cy", "score": 10},
+            "d": {"name": "Dee", "score": 0},
+        })
+
+    def test_add_points(self):
+        self.assertEqual(self.table.add_points("b", 20), 25)
+        self.assertEqual(self.table.add_points("b", -5), 20)
+        self.assertEqual(self.table.score("b"), 20)
+        with self.assertRaises(KeyError):
+            self.table.add_points("missing", 1)
+
+    def test_state_round_trip_keeps_slots_and_free_list(self):
+        self.table.remove("a")
+        restored = StudentTable.from_state(json.loads(json.dumps(self.table.to_state())))
+        self.assertEqual(list(restored.entries()), list(self.table.entries()))
+        self.assertEqual(restored.slots, self.table.slots)
+        self.assertEqual(restored.sids, self.table.sids)
+        self.assertEqual(restored.add("d", "Dee"), 0)  # a's freed slot
+
+
+class StandingsTests(SimpleTestCase):
+    """Standings read from bucket offsets match a full walk of the board."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.students = StudentTable()
+        self.board = Leaderboard(self.students)
+        for i in range(40):
+            self.students.add(f"sid-{i}", f"S{i}")
+            self.board.add(f"sid-{i}")
+        for _ in range(6):
+            for sid in list(self.students):
+                if rng.random() < 0.5:
+                    self.board.add_points(sid, 20)
+        for sid in ("sid-3", "sid-17"):
+            self.board.remove(sid)
+            self.students.remove(sid)
+
+    def expected(self):
+        """The whole board, walked in order, with each player's neighbours."""
+        board = [
+            {"name": self.students.name(sid), "score": score, "position": position}
+            for sid, score, position in self.board.ranked()
+        ]
+        sids = [sid for sid, _, _ in self.board.ranked()]
+        return board, {
+            sid: {
+                "position": board[i]["position"],
+                "above": board[i - 1] if i > 0 else None,
+                "below": board[i + 1] if i < len(board) - 1 else None,
+            }
+            for i, sid in enumerate(sids)
+        }
+
+    def test_matches_a_full_walk(self):
+        board, expected = self.expected()
+        standings = self.board.standings()
+        self.assertEqual(len(standings), 38)
+        self.assertEqual(standings.players(), board)
+        self.assertEqual(standings.top(10), board[:10])
+        self.assertEqual(standings.top(100), board)
+        for sid, standing in expected.items():
+            self.assertEqual(standings[sid], standing)
+            self.assertEqual(standings.position(sid), self.board.position(sid))
+
+    def test_ties_follow_arrival_in_the_bucket(self):
+        for sid in ("early", "late"):
+            self.students.add(sid, sid)
+            self.board.add(sid)
+        self.board.add_points("late", 200)
+        self.board.add_points("early", 200)
+        self.assertEqual([entry["name"] for entry in self.board.standings().top(2)], ["late", "early"])
+
+    def test_scores_live_in_the_table(self):
+        self.assertEqual(self.board.add_points("sid-0", 20), self.students.score("sid-0"))
+        restored = Leaderboard.from_state(self.students, json.loads(json.dumps(self.board.to_state())))
+        self.assertEqual(list(restored.ranked()), list(self.board.ranked()))
+
+
+class SerializerTests(SimpleTestCase):
+    """LIVE_SOCKET_SERIALIZER selects the packet class; msgpack frames round-trip."""
+
+    def test_names(self):
+        self.assertEqual(build_serializer("default"), "default")
+        with self.assertRaisesMessage(ValueError, "Unsupported socket serializer"):
+            build_serializer("json5")
+        with mock.patch.dict("sys.modules", {"socketio.msgpack_packet": None}):
+            with self.assertRaisesMessage(RuntimeError, "pip install msgpack"):
+                build_serializer("msgpack")
+
+    @skipIf(msgpack is None, "msgpack is not installed")
+    def test_cached_question_is_one_binary_frame(self):
+        from .metrics import MeteredAsyncServer
+
+        server = MeteredAsyncServer(serializer=build_serializer("msgpack"))
+        payload = QuestionManager.build_question_payload(SNAPSHOT["questions"][1], 30)
+        packets = PacketCache(server).get(1, SNAPSHOT["questions"][1], "session:question", lambda: payload)
+
+        self.assertEqual(len(packets), 1)
+        self.assertIsInstance(packets[0].data, bytes)
+        decoded = server.packet_class(encoded_packet=packets[0].data)
+        self.assertEqual(decoded.data, ["session:question", payload])
+
+
+class SocketIOInternalsTests(SimpleTestCase):
+    """Private python-socketio methods we rely on are checked up front."""
+
+    def test_packet_cache_requires_send_eio_packet(self):
+        from . import server
+
+        PacketCache(server.sio)
+        with self.assertRaisesMessage(RuntimeError, "_send_eio_packet"):
+            PacketCache(object())
+
+    def test_metered_server_overrides_existing_methods(self):
+        from .metrics import MeteredAsyncServer
+
+        for name in ("_send_packet", "_send_eio_packet"):
+            base = getattr(MeteredAsyncServer.__mro__[1], name)
+            self.assertIsNot(getattr(MeteredAsyncServer, name), base)
+
+
+    async def test_send_packet_counts_around_the_inherited_send(self):
+        from socketio import packet
+
+        from . import metrics
+
+        server = metrics.MeteredAsyncServer()
+        pkt = packet.Packet(packet.EVENT, data=["ping", {"n": 1}])
+        packets, size = metrics.emit_packets.value(), metrics.emit_bytes.value()
+        with mock.patch.object(server.eio, "send", mock.AsyncMock()) as send:
+            await server._send_packet("eio-1", pkt)
+
+        send.assert_awaited_once_with("eio-1", pkt.encode())
+        self.assertEqual(metrics.emit_packets.value() - packets, 1)
+        self.assertEqual(metrics.emit_bytes.value() - size, len(pkt.encode()))
+
+class CodeAllocatorTests(SimpleTestCase):
+    """Session codes are a keyed permutation: unique, and not predictable from each other."""
+
+    def test_permutation_is_a_bijection(self):
+        for size in (1, 2, 37, 1000, 36 ** 2):
+            permutation = FeistelPermutation(size, b"k" * 16)
+            self.assertEqual(sorted(permutation(n) for n in range(size)), list(range(size)))
+
+    async def test_every_code_once_before_reuse(self):
+        codes = CodeAllocator(length=2, seed=1)
+        allocated = [await codes.allocate() for _ in range(codes.capacity)]
+        self.assertEqual(len(set(allocated)), codes.capacity)
+        with self.assertRaises(RuntimeError):
+            await codes.allocate()
+
+        await codes.release(allocated[5])
+        await codes.release(allocated[2])
+        self.assertEqual([await codes.allocate(), await codes.allocate()], [allocated[5], allocated[2]])
+
+    async def test_order_depends_on_the_key(self):
+        first = [await CodeAllocator(seed=1).allocate() for _ in range(5)]
+        again = [await CodeAllocator(seed=1).allocate() for _ in range(5)]
+        other = [await CodeAllocator(seed=2).allocate() for _ in range(5)]
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+
+    @skipIf(fakeredis is None, "fakeredis is not installed")
+    async def test_redis_workers_share_the_key(self):
+        client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+        workers = [RedisCodeAllocator(client, length=2), RedisCodeAllocator(client, length=2)]
+        allocated = [await workers[i % 2].allocate() for i in range(200)]
+        self.assertEqual(len(set(allocated)), 200)
+        self.assertEqual(workers[0].permutation.key, workers[1].permutation.key)
+
+        # A code already in use is skipped rather than handed out twice
+        await client.delete(workers[0].key_key)
+        fresh = RedisCodeAllocator(client, length=2)
+        more = [await fresh.allocate() for _ in range(300)]
+        self.assertFalse(set(more) & set(allocated))
+
+
+class QuestionAnswersTests(SimpleTestCase):
+    """Answer columns score from the correct option and survive a state round trip."""
+
+    def setUp(self):
+        self.answers = QuestionAnswers(1, datetime(2026, 1, 1), capacity=2)
+        for slot, option_id, response_ms in [(1, 3, 1500), (0, 2, 2500), (4, 3, 900)]:
+            self.assertTrue(self.answers.add(slot, option_id, response_ms))
+
+    def test_one_answer_per_slot(self):
+        self.assertFalse(self.answers.add(1, 2, 100))
+        self.assertEqual(len(self.answers), 3)
+        self.assertEqual(self.answers.option(1), 3)
+        self.assertTrue(self.answers.answered(4))  # past the initial capacity
+        self.assertFalse(self.answers.answered(2))
+        self.assertIsNone(self.answers.option(9))
+
+    def test_correctness_follows_close(self):
+        self.assertEqual(self.answers.correct_count(), 0)
+        self.answers.close(3)
+        self.assertEqual(self.answers.correct_count(), 2)
+        self.assertEqual(list(self.answers.rows()), [(1, 3, True, 1500), (0, 2, False, 2500), (4, 3, True, 900)])
+        self.assertEqual(self.answers.answered_at(1), datetime(2026, 1, 1, 0, 0, 2, 500000))
+
+    def test_state_round_trip(self):
+        restored = QuestionAnswers.from_state(json.loads(json.dumps(self.answers.to_state())))
+        self.assertEqual(list(restored.rows()), list(self.answers.rows()))
+        self.assertEqual(restored.started_at, self.answers.started_at)
+        self.assertFalse(restored.add(4, 1, 100))  # the open-question index is rebuilt
+
+        self.answers.close(3)
+        self.answers.drop_index()
+        restored = QuestionAnswers.from_state(self.answers.to_state())
+        self.assertIsNone(restored.chosen)
+        self.assertEqual(restored.correct_count(), 2)
+
+
+class AnswerTests(ManagerTestMixin, SimpleTestCase):
+    """Only options of the current question are accepted."""
+
+    async def running_session(self, *sids):
+        session = await SessionManager.create_session(1, "teacher", 30, [1, 2], SNAPSHOT["questions"])
+        session_id = session["session_id"]
+        for sid in ("student",) + sids:
+            await SessionManager.add_student(session_id, sid, sid)
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+        await QuestionManager.open_question(session_id, 1)
+        return session_id
+
+    async def test_unknown_option_is_rejected(self):
+        session_id = await self.running_session()
+
+        self.assertFalse(await SessionManager.record_answer(session_id, "student", 9))
+        self.assertFalse(await SessionManager.has_student_answered(session_id, "student"))
+
+        self.assertTrue(await SessionManager.record_answer(session_id, "student", 2))
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual(session["option_counts"], {1: 0, 2: 1, 3: 0, 4: 0})
+
+    async def test_second_answer_and_unknown_student_are_refused(self):
+        session_id = await self.running_session()
+
+        self.assertTrue(await SessionManager.record_answer(session_id, "student", 2))
+        self.assertFalse(await SessionManager.record_answer(session_id, "student", 3))
+        self.assertFalse(await SessionManager.record_answer(session_id, "stranger", 2))
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual(session["option_counts"], {1: 0, 2: 1, 3: 0, 4: 0})
+        self.assertEqual(len(session["answers"]), 1)
+
+    async def test_distribution_follows_the_answers(self):
+        session_id = await self.running_session("s1", "s2", "s3")
+        for sid, option_id in [("s1", 3), ("s2", 1), ("s3", 3)]:
+            self.assertTrue(await SessionManager.record_answer(session_id, sid, option_id))
+
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual(QuestionManager.build_distribution(session), [
+            {"option_id": 1, "count": 1},
+            {"option_id": 2, "count": 0},
+            {"option_id": 3, "count": 2},
+            {"option_id": 4, "count": 0},
+        ])
+
+        # The next question starts from zero
+        await SessionManager.clear_answers(session_id)
+        await QuestionManager.open_question(session_id, 2)
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual([entry["count"] for entry in QuestionManager.build_distribution(session)], [0] * 4)
+
+    async def test_student_gets_invalid_option_error(self):
+        from . import server
+
+        session_id = await self.running_session()
+        with mock.patch.object(server.sio, "emit", mock.AsyncMock()) as emit:
+            await server.student_answer("student", {"session_id": session_id, "option_id": 9})
+
+        emit.assert_awaited_once_with("error", {"message": "Invalid option"}, to="student")
+        self.assertFalse(await SessionManager.has_student_answered(session_id, "student"))
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class RedisAnswerTests(AnswerTests):
+    """The same checks on the Redis store (fakeredis)."""
+
+    def make_store(self):
+        return RedisSessionStore(client=fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer()))
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class RedisSessionStoreTests(SimpleTestCase):
+    """Two workers share sessions through Redis without pickles or whole-session answer writes."""
+
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        self.snapshots = {}
+        self.workers = [
+            RedisSessionStore(client=fakeredis.FakeAsyncRedis(server=server), peek_snapshot=self.snapshots.get)
+            for _ in range(2)
+        ]
+        self._previous = SessionManager.store, SessionManager.codes
+        SessionManager.configure_codes(CodeAllocator(seed=1))
+
+    def tearDown(self):
+        SessionManager.configure_store(self._previous[0])
+        SessionManager.configure_codes(self._previous[1])
+
+    def on(self, worker):
+        SessionManager.configure_store(self.workers[worker])
+
+    async def settle(self):
+        await asyncio.sleep(0)  # let the stores start their flush tasks
+        for store in self.workers:
+            if store._flush_task is not None:
+                await store._flush_task
+            await store.flush()
+        await asyncio.sleep(0)  # end the tick: versions are checked again
+
+    async def running_session(self):
+        self.on(0)
+        session = await SessionManager.create_session(1, "teacher", 30, [1, 2, 3], SNAPSHOT["questions"])
+        session_id = session["session_id"]
+        for name in ("a", "b", "c"):
+            await SessionManager.add_student(session_id, name, name.upper())
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+        await QuestionManager.open_question(session_id, 1)
+        await self.settle()
+        return session_id
+
+    async def test_state_is_json_without_detached_fields(self):
+        session_id = await self.running_session()
+        await SessionManager.update_student_score(session_id, "b", 20)
+        await self.settle()
+
+        data = await self.workers[0].client.hget(self.workers[0].key(session_id), "data")
+        state = json.loads(data)
+        for name in ("questions", "answers", "option_counts"):
+            self.assertNotIn(name, state)
+
+        local = await self.workers[0].get(session_id)
+        remote = await self.workers[1].get(session_id)
+        self.assertEqual(remote["students"].roster(), local["students"].roster())
+        self.assertEqual(list(remote["leaderboard"].ranked()), list(local["leaderboard"].ranked()))
+        self.assertEqual(remote["question_queue"], local["question_queue"])
+        self.assertEqual(remote["question_started_at"], local["question_started_at"])
+        self.assertEqual(remote["questions"], SNAPSHOT["questions"])
+        self.assertEqual(remote["option_counts"], {1: 0, 2: 0, 3: 0, 4: 0})
+
+    async def test_question_snapshot_is_shared(self):
+        first = await self.running_session()
+        second = (await SessionManager.create_session(1, "teacher-2", 30, [1], SNAPSHOT["questions"]))["session_id"]
+        await self.settle()
+
+        questions = (await self.workers[1].get(first))["questions"]
+        self.assertIs((await self.workers[1].get(second))["questions"], questions)
+
+    async def test_question_snapshot_comes_from_the_topic_cache(self):
+        session_id = await self.running_session()
+        cached = json.loads(json.dumps(SNAPSHOT["questions"]))  # an equal copy, as another process loads it
+        self.snapshots[1] = {"questions": {int(question_id): question for question_id, question in cached.items()}}
+
+        self.assertIs((await self.workers[1].get(session_id))["questions"], self.snapshots[1]["questions"])
+
+    async def test_answers_through_two_workers(self):
+        session_id = await self.running_session()
+        key = self.workers[0].key(session_id)
+        version = await self.workers[0].client.hget(key, "version")
+
+        self.assertTrue(await SessionManager.record_answer(session_id, "a", 1))
+        self.on(1)
+        self.assertTrue(await SessionManager.record_answer(session_id, "b", 2))
+        self.assertFalse(await SessionManager.record_answer(session_id, "a", 3))  # answered on worker 0
+        await self.settle()
+        self.assertEqual(await self.workers[0].client.hget(key, "version"), version)
+
+        self.on(0)
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual(session["option_counts"], {1: 1, 2: 1, 3: 0, 4: 0})
+        self.assertEqual(len(session["answers"]), 1)  # worker 1's answer is only counted so far
+
+        answers = await SessionManager.record_answered_question(session_id, 1, 1)
+        self.assertEqual(sorted(answers.rows()), [(0, 1, True, answers.response_ms[0]), (1, 2, False, answers.response_ms[1])])
+
+        await SessionManager.clear_answers(session_id)
+        self.assertFalse(await self.workers[0].client.exists(self.workers[0].answers_key(session_id, 1)))
+
+
+class ServerTestMixin(ManagerTestMixin):
+    """Drive sockets/server.py handlers with packets dropped and answer_result held by a gate."""
+
+    def setUp(self):
+        super().setUp()
+        from . import server
+
+        self.server = server
+        self.gate = asyncio.Event()  # holds a close while it sends answer_result
+
+        async def emit_each(event, items):
+            await self.gate.wait()
+
+        for patcher in [
+            mock.patch.object(server.sio, "_send_eio_packet", mock.AsyncMock()),
+            mock.patch.object(server.sio.manager, "rooms", {}),
+            mock.patch.object(server, "emit_each", emit_each),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def running_session(self):
+        session = await SessionManager.create_session(1, "teacher", 30, [1, 2], SNAPSHOT["questions"])
+        session_id = session["session_id"]
+        await SessionManager.add_student(session_id, "student", "S")
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+        await self.server.send_question(session_id, await SessionManager.pop_next_question(session_id))
+        self.addCleanup(self.server.question_scheduler.cancel, session_id)
+        self.assertTrue(await SessionManager.record_answer(session_id, "student", 1))
+        return session_id
+
+
+class CloseQuestionTests(ServerTestMixin, SimpleTestCase):
+    """A question is scored once when the deadline and another close race."""
+
+    async def hold_first_close(self, close):
+        """Start `close` and wait until it has claimed the question."""
+        task = asyncio.ensure_future(close)
+        for _ in range(100):
+            if self.server.closing_questions:
+                return task
+            await asyncio.sleep(0)
+        self.fail("close_question did not claim the question")
+
+    async def test_deadline_and_teacher_close_score_once(self):
+        session_id = await self.running_session()
+
+        deadline = await self.hold_first_close(self.server.on_question_deadline(session_id))
+        teacher = asyncio.ensure_future(self.server.close_question(session_id))
+        await asyncio.sleep(0.01)
+        self.assertFalse(teacher.done())  # waits for the deadline's close
+
+        self.gate.set()
+        await asyncio.gather(deadline, teacher)
+
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual(session["students"].score("student"), QuestionManager.POINTS_CORRECT)
+        self.assertEqual(len(session["answer_history"]), 1)
+        self.assertIsNone(session["current_question"])
+        self.assertFalse(session["question_closing"])
+
+    async def test_answers_are_rejected_while_closing(self):
+        session_id = await self.running_session()
+
+        close = await self.hold_first_close(self.server.close_question(session_id))
+        session = await SessionManager.get_session(session_id)
+        self.assertFalse(QuestionManager.is_answer_valid(session))
+
+        self.gate.set()
+        await close
+
+    async def test_next_question_waits_for_the_running_close(self):
+        session_id = await self.running_session()
+
+        deadline = await self.hold_first_close(self.server.close_question(session_id, from_timer=True))
+        teacher = asyncio.ensure_future(self.server.teacher_next_question("teacher", {"session_id": session_id}))
+        await asyncio.sleep(0.01)
+        self.assertFalse(teacher.done())
+
+        self.gate.set()
+        await asyncio.gather(deadline, teacher)
+
+        session = await SessionManager.get_session(session_id)
+        self.assertEqual(session["students"].score("student"), QuestionManager.POINTS_CORRECT)
+        self.assertIsNotNone(session["current_question"])  # the next question stayed open
+        self.assertFalse(session["question_closing"])
+        self.assertEqual(session["option_counts"], {1: 0, 2: 0, 3: 0, 4: 0})
+
+
+class QuestionTimerTests(ServerTestMixin, SimpleTestCase):
+    """Pausing and extending a question moves its deadline and its timer together."""
+
+    def remaining(self, session):
+        return (session["question_deadline"] - datetime.utcnow()).total_seconds()
+
+    async def test_pause_and_resume(self):
+        session_id = await self.running_session()
+        scheduler = self.server.question_scheduler
+
+        await self.server.teacher_pause_question("teacher", {"session_id": session_id})
+        session = await SessionManager.get_session(session_id)
+        self.assertIsNone(session["question_deadline"])
+        self.assertAlmostEqual(session["question_remaining"], 30, delta=1)
+        self.assertFalse(QuestionManager.is_answer_valid(session))
+        self.assertAlmostEqual(scheduler.remaining(session_id), 30, delta=1)
+        self.assertIsNone(await self.server.pause_question_timer(session_id))  # already paused
+
+        await self.server.teacher_resume_question("teacher", {"session_id": session_id})
+        self.assertIsNone(session["question_remaining"])
+        self.assertAlmostEqual(self.remaining(session), 30, delta=1)
+        self.assertTrue(QuestionManager.is_answer_valid(session))
+        self.assertAlmostEqual(scheduler.remaining(session_id), self.remaining(session), delta=1)
+        self.assertIsNone(await self.server.resume_question_timer(session_id))  # not paused
+
+    async def test_extend(self):
+        session_id = await self.running_session()
+        scheduler = self.server.question_scheduler
+
+        await self.server.teacher_extend_question("teacher", {"session_id": session_id, "seconds": 15})
+        session = await SessionManager.get_session(session_id)
+        self.assertAlmostEqual(self.remaining(session), 45, delta=1)
+        self.assertAlmostEqual(scheduler.remaining(session_id), 45, delta=1)
+
+        # A paused question keeps its clock stopped with the new time left
+        await self.server.pause_question_timer(session_id)
+        await self.server.extend_question_timer(session_id, -40)
+        self.assertAlmostEqual(session["question_remaining"], 5, delta=1)
+        self.assertAlmostEqual(scheduler.remaining(session_id), 5, delta=1)
+        self.assertIsNone(session["question_deadline"])
+
+    async def test_closing_question_cannot_be_paused(self):
+        session_id = await self.running_session()
+        await SessionManager.claim_question(session_id)
+
+        with mock.patch.object(self.server.sio, "emit", mock.AsyncMock()) as emit:
+            await self.server.teacher_pause_question("teacher", {"session_id": session_id})
+        emit.assert_awaited_once_with("error", {"message": "No running question to pause"}, to="teacher")
+
+
+class TopicSnapshotTests(ServerTestMixin, SimpleTestCase):
+    """A session loads its whole question set once, at teacher:create_session."""
+
+    def setUp(self):
+        super().setUp()
+        self.load_topic_snapshot = QuestionManager.load_topic_snapshot  # unpatched
+        self.load = mock.AsyncMock(return_value=SNAPSHOT)
+        for patcher in [
+            mock.patch.object(QuestionManager, "load_topic_snapshot", self.load),
+            mock.patch.multiple(
+                self.server.persistence_queue,
+                submit=mock.AsyncMock(), submit_start=mock.AsyncMock(),
+                submit_question=mock.AsyncMock(), submit_finish=mock.AsyncMock(),
+            ),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_questions_come_from_the_snapshot(self):
+        teacher = await self.server.sio.manager.connect("eio-teacher", "/")
+        await self.server.teacher_create_session(teacher, {"topic_id": 1})
+        self.load.assert_awaited_once_with(1)
+        session_id = next(iter(self.store.data))
+        session = await SessionManager.get_session(session_id)
+        self.assertIs(session["questions"], SNAPSHOT["questions"])
+        self.assertEqual(sorted(session["question_queue"]), [1, 2, 3])
+        await SessionManager.add_student(session_id, "student", "S")
+
+        # Starting and advancing never go back to the topic (SimpleTestCase also refuses DB queries)
+        await self.server.teacher_start_session(teacher, {"session_id": session_id})
+        self.addCleanup(self.server.question_scheduler.cancel, session_id)
+        first = (await SessionManager.get_session(session_id))["current_question"]
+        self.gate.set()
+        await self.server.teacher_next_question(teacher, {"session_id": session_id})
+        second = (await SessionManager.get_session(session_id))["current_question"]
+        self.assertNotIn(second, (None, first))
+        self.load.assert_awaited_once()
+
+    async def test_cached_snapshot_skips_the_worker_thread(self):
+        from quizzes.cache import topic_cache
+
+        with mock.patch.object(topic_cache, "peek", return_value=SNAPSHOT), \
+                mock.patch("asyncio.to_thread") as to_thread:
+            self.assertIs(await self.load_topic_snapshot(1), SNAPSHOT)
+        to_thread.assert_not_called()
+
+
+class AnswerCountTests(ServerTestMixin, SimpleTestCase):
+    """session:answer_count is coalesced per session, and close sends the final count at once."""
+
+    def setUp(self):
+        super().setUp()
+        self.gate.set()
+        self.emit = mock.AsyncMock()
+        for patcher in [
+            mock.patch.object(self.server.sio, "emit", self.emit),
+            mock.patch.object(self.server, "answer_counts", Throttle(0.05, self.server.flush_answer_count)),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def counts(self):
+        return [
+            call.args[1]["answered"] for call in self.emit.await_args_list
+            if call.args[0] == "session:answer_count"
+        ]
+
+    async def answer(self, session_id, *sids):
+        for sid in sids:
+            await self.server.student_answer(sid, {"session_id": session_id, "option_id": 1})
+
+    async def test_counts_are_coalesced(self):
+        session = await SessionManager.create_session(1, "teacher", 30, [1, 2], SNAPSHOT["questions"])
+        session_id = session["session_id"]
+        for i in range(5):
+            await SessionManager.add_student(session_id, f"s{i}", f"S{i}")
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+        await self.server.send_question(session_id, await SessionManager.pop_next_question(session_id))
+        self.addCleanup(self.server.question_scheduler.cancel, session_id)
+
+        # The first answers go out on the next loop iteration, together
+        await self.answer(session_id, "s0", "s1")
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.counts(), [2])
+
+        # Later ones wait for the interval and carry the latest count
+        await self.answer(session_id, "s2", "s3")
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.counts(), [2])
+        await asyncio.sleep(0.06)
+        self.assertEqual(self.counts(), [2, 4])
+
+        # Closing drops the pending update and sends the final count itself
+        await self.answer(session_id, "s4")  # the last answer closes the question
+        self.assertEqual(self.counts(), [2, 4, 5])
+        self.assertNotIn(session_id, self.server.answer_counts._pending)
+        await asyncio.sleep(0.06)
+        self.assertEqual(self.counts(), [2, 4, 5])
+
+
+class StudentRankingTests(ServerTestMixin, SimpleTestCase):
+    """Students get the top K and their own neighbourhood; the teacher gets the full board."""
+
+    def setUp(self):
+        super().setUp()
+        self.sent: dict[str, list[tuple[str, dict]]] = {}  # event -> [(sid, payload)]
+        self.emit = mock.AsyncMock()
+
+        async def emit_each(event, items):
+            self.sent.setdefault(event, []).extend(items)
+
+        for patcher in [
+            mock.patch.object(self.server, "emit_each", emit_each),
+            mock.patch.object(self.server.sio, "emit", self.emit),
+            mock.patch.object(self.server.persistence_queue, "submit", mock.AsyncMock()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def teacher_payload(self, event):
+        return next(call.args[1] for call in self.emit.await_args_list if call.args[0] == event)
+
+    async def closed_session(self, size=15, correct=7):
+        session = await SessionManager.create_session(1, "teacher", 30, [1, 2], SNAPSHOT["questions"])
+        session_id = session["session_id"]
+        for i in range(size):
+            await SessionManager.add_student(session_id, f"s{i}", f"S{i}")
+        await SessionManager.set_stage(session_id, SessionManager.STAGE_RUNNING)
+        await self.server.send_question(session_id, await SessionManager.pop_next_question(session_id))
+        self.addCleanup(self.server.question_scheduler.cancel, session_id)
+        for i in range(size):
+            await SessionManager.record_answer(session_id, f"s{i}", 1 if i < correct else 2)
+        await self.server.close_question(session_id)
+        return session_id
+
+    async def test_answer_result_ranking(self):
+        await self.closed_session()
+        board = self.teacher_payload("session:ranking")["players"]
+        self.assertEqual(len(board), 15)
+        self.assertEqual([entry["position"] for entry in board], [1] * 7 + [2] * 8)
+
+        rows = {entry["name"]: i for i, entry in enumerate(board)}
+        for sid, payload in self.sent["answer_result"]:
+            ranking = payload["ranking"]
+            i = rows["S" + sid[1:]]
+            self.assertEqual(ranking["top"], board[:RankingManager.TOP_K])
+            self.assertEqual(ranking["total"], 15)
+            self.assertEqual(ranking["position"], board[i]["position"])
+            self.assertEqual(ranking["above"], board[i - 1] if i > 0 else None)
+            self.assertEqual(ranking["below"], board[i + 1] if i < 14 else None)
+
+    async def test_quiz_finished_is_capped_for_students(self):
+        session_id = await self.closed_session(size=15, correct=12)
+        await self.server.finish_session(session_id)
+
+        teacher = self.teacher_payload("quiz_finished")
+        self.assertEqual(len(teacher["scoreboard"]), 15)
+        self.assertEqual(len(teacher["winners"]), 12)
+
+        for sid, payload in self.sent["quiz_finished"]:
+            self.assertEqual(payload["scoreboard"], teacher["scoreboard"][:RankingManager.TOP_K])
+            self.assertEqual(len(payload["winners"]), RankingManager.TOP_K)
+            self.assertEqual(payload["winners_total"], 12)
+            self.assertEqual(payload["ranking"]["position"], 1 if int(sid[1:]) < 12 else 2)
+
+    async def test_scoreboard_pages(self):
+        session_id = await self.closed_session()
+        session = await SessionManager.get_session(session_id)
+        board = self.teacher_payload("session:ranking")["players"]
+
+        page = RankingManager.build_scoreboard_page(session["students"], session["leaderboard"], 10, 10)
+        self.assertEqual((page["total"], page["offset"], page["players"]), (15, 10, board[10:]))
+        page = RankingManager.build_scoreboard_page(session["students"], session["leaderboard"], 0, 1000)
+        self.assertEqual(page["limit"], RankingManager.MAX_PAGE_SIZE)
+
+
+class LoggingLifecycleTests(SimpleTestCase):
+    """The log writer thread runs between the ASGI startup and shutdown, not from import."""
+
+    def setUp(self):
+        from . import server
+
+        self.server = server
+        for patcher in [
+            mock.patch.multiple(server.persistence_queue, start=mock.AsyncMock(), stop=mock.AsyncMock()),
+            mock.patch.multiple(server.session_reaper, start=mock.Mock(), stop=mock.AsyncMock()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_started_and_stopped_with_the_server(self):
+        from .utils import logs
+
+        self.assertIsNone(logs._listener)  # importing the server started nothing
+        await self.server.startup()
+        self.addCleanup(logs.stop_logging)
+        self.assertTrue(logs._listener._thread.is_alive())
+
+        await self.server.shutdown()
+        self.assertIsNone(logs._listener)
+
+    async def test_queue_can_be_turned_off(self):
+        from .utils import logs
+
+        with mock.patch.object(self.server, "LOG_QUEUE", False):
+            await self.server.startup()
+        self.assertIsNone(logs._listener)
+
+
+class MetricsTests(SimpleTestCase):
+    """Metrics render in the Prometheus text format and are served at /metrics."""
+
+    def test_render(self):
+        from .metrics import MetricsRegistry, stats_collector
+
+        registry = MetricsRegistry()
+        registry.counter("c_total", "Counter").inc(2, event='say "hi"')
+        registry.gauge("g", "Gauge", collect=lambda: 1.5)
+        histogram = registry.histogram("h_seconds", "Histogram", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+        registry.add_collector(stats_collector(
+            "cache", lambda: {"hits": 3, "lateness": {"p99": 0.25}, "name": "x"}, "Cache", counters=["hits"]
+        ))
+
+        lines = registry.render().splitlines()
+        for line in [
+            "# TYPE c_total counter",
+            r'c_total{event="say \"hi\""} 2',
+            "g 1.5",
+            'h_seconds_bucket{le="0.1"} 1',
+            'h_seconds_bucket{le="1"} 2',
+            'h_seconds_bucket{le="+Inf"} 3',
+            "h_seconds_sum 5.55",
+            "h_seconds_count 3",
+            "# TYPE cache_hits_total counter",
+            "cache_hits_total 3",
+            "cache_lateness_p99 0.25",
+        ]:
+            self.assertIn(line, lines)
+        self.assertFalse(any(line.startswith("cache_name") for line in lines))
+
+    async def test_endpoint_and_server_metrics(self):
+        from . import metrics, server
+
+        connects = metrics.handler_latency.count(event="connect")
+        sockets = metrics.connected_sockets.value()
+        await server.sio.handlers["/"]["connect"]("sid-1", {})
+        self.assertEqual(metrics.handler_latency.count(event="connect"), connects + 1)
+        self.assertEqual(metrics.connected_sockets.value(), sockets + 1)
+        metrics.connected_sockets.dec()
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await metrics.metrics_app({"type": "http", "path": "/metrics"}, None, send)
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/plain; version=0.0.4; charset=utf-8"), sent[0]["headers"])
+        body = sent[1]["body"].decode()
+        for name in ("livequiz_handler_duration_seconds_count", "livequiz_scheduler_", "livequiz_topic_cache_"):
+            self.assertIn(name, body)
@@ -2,6 +2,19 @@
 Utilities package for Live Quiz Socket.IO Server
 """
 
+from .logs import EventLogger, get_logger
+from .packets import PacketCache
+from .scheduler import DeadlineScheduler
+from .serializers import build_serializer
+from .throttle import Throttle
 from .time import TimeUtils
 
-__all__ = ["TimeUtils"]
+__all__ = [
+    "DeadlineScheduler",
+    "EventLogger",
+    "PacketCache",
+    "Throttle",
+    "TimeUtils",
+    "build_serializer",
+    "get_logger",
+]
@@ -0,0 +1,248 @@
+"""
+Structured logging for Live Quiz Socket.IO Server
+
+Log calls on the event loop only put a tuple on a queue. A QueueListener
+thread turns it into a LogRecord, formats and writes it, so a slow stdout
+or log file never blocks a handler. Frequent events can be sampled per
+event name.
+
+Output keeps the familiar "[TAG] message" lines, or one JSON object per
+line with LIVE_LOG_FORMAT = "json".
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Any, Optional, TextIO
+
+# Parent of every logger created here (and of the Socket.IO/Engine.IO loggers)
+ROOT_LOGGER = "livequiz"
+
+# Events whose calls are kept 1 in N: {event: N}
+_sample_every: dict[str, int] = {}
+_sample_counts: dict[str, int] = {}
+
+_queue: Optional[queue.SimpleQueue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _LoopSafeQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener thread.
+
+    The stock prepare() formats the message on the calling thread (the
+    event loop). Records here never leave the process, so they can be
+    queued as they are. Arguments must not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _make_record(item: tuple) -> logging.LogRecord:
+    """Build the LogRecord for an EventLogger queue item."""
+    name, level, msg, args, exc_info, tag, event, fields, created = item
+    record = logging.LogRecord(name, level, "", 0, msg, args, exc_info)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    record.tag = tag
+    record.event = event
+    record.fields = fields
+    return record
+
+
+class _EventQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that also accepts EventLogger tuples.
+
+    EventLogger puts (logger name, level, msg, args, exc_info, tag, event,
+    fields, created) on the queue and the LogRecord is built here, off the
+    event loop. Records from standard loggers pass through unchanged.
+    """
+
+    def prepare(self, item: Any) -> logging.LogRecord:
+        if isinstance(item, logging.LogRecord):
+            return item
+        return _make_record(item)
+
+
+class _BatchingStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler for the listener thread that flushes once per batch.
+
+    The stream is only flushed when the queue has been drained, so a burst
+    of records costs one write system call instead of one per line.
+    """
+
+    def __init__(self, stream: TextIO, log_queue: queue.SimpleQueue):
+        super().__init__(stream)
+        self.log_queue = log_queue
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if self.log_queue.empty():
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class TextFormatter(logging.Formatter):
+    """Formats records as "[TAG] message key=value ..."."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"[{getattr(record, 'tag', record.name)}] {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "tag": getattr(record, "tag", record.name),
+            "event": getattr(record, "event", None),
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class EventLogger:
+    """
+    Logger for one log tag ("TEACHER", "CLOSE_QUESTION", ...).
+
+    Messages use %-style arguments, formatted only if the record is written.
+    `event` names the call for sampling and JSON output (defaults to the
+    tag); extra keyword arguments are attached as structured fields.
+
+    Example:
+        log = get_logger("STUDENT")
+        log.info("Answer from %s: %s", sid, data, event="student.answer")
+    """
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.logger = logging.getLogger(f"{ROOT_LOGGER}.{tag.lower()}")
+
+    def _log(self, level: int, msg: str, args: tuple, event: Optional[str], exc_info: bool, fields: dict) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        event = event or self.tag
+        every = _sample_every.get(event)
+        if every is not None:
+            count = _sample_counts.get(event, 0)
+            _sample_counts[event] = count + 1
+            if count % every:
+                return
+        item = (
+            self.logger.name, level, msg, args,
+            sys.exc_info() if exc_info else None,
+            self.tag, event, fields, time.time(),
+        )
+        if _queue is not None:
+            # Skips the logging machinery: the listener builds the record
+            _queue.put(item)
+        else:
+            self.logger.handle(_make_record(item))
+
+    def debug(self, msg: str, *args: Any, event: Optional[str] = None, **fields: Any) -> None:
+        self._log(logging.DEBUG, msg, args, event, False, fields)
+
+    def info(self, msg: str, *args: Any, event: Optional[str] = None, **fields: Any) -> None:
+        self._log(logging.INFO, msg, args, event, False, fields)
+
+    def warning(self, msg: str, *args: Any, event: Optional[str] = None, **fields: Any) -> None:
+        self._log(logging.WARNING, msg, args, event, False, fields)
+
+    def error(self, msg: str, *args: Any, event: Optional[str] = None, **fields: Any) -> None:
+        self._log(logging.ERROR, msg, args, event, False, fields)
+
+    def exception(self, msg: str, *args: Any, event: Optional[str] = None, **fields: Any) -> None:
+        """Log an error with the current exception's traceback."""
+        self._log(logging.ERROR, msg, args, event, True, fields)
+
+
+def get_logger(tag: str) -> EventLogger:
+    """Get the logger for a log tag."""
+    return EventLogger(tag)
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "text",
+    sampling: Optional[dict[str, int]] = None,
+    stream: Optional[TextIO] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Route every "livequiz" logger through a queue to a background writer.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level: Minimum level name ("DEBUG", "INFO", ...)
+        fmt: "text" for "[TAG] message" lines, "json" for JSON lines
+        sampling: {event: N} keeps 1 in N calls of each listed event
+        stream: Output stream (stdout by default)
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener, _queue
+
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unsupported log format: {fmt} (expected text or json)")
+
+    stop_logging()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    output = _BatchingStreamHandler(stream or sys.stdout, log_queue)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.addHandler(_LoopSafeQueueHandler(log_queue))
+    root.setLevel(level.upper())
+    root.propagate = False
+
+    _sample_every.clear()
+    _sample_counts.clear()
+    for event, every in (sampling or {}).items():
+        if every > 1:
+            _sample_every[event] = int(every)
+
+    _queue = log_queue
+    _listener = _EventQueueListener(log_queue, output)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """
+    Write out queued records and stop the background writer.
+
+    Later records go to the standard logging configuration again.
+    """
+    global _listener, _queue
+    _queue = None
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        if isinstance(handler, _LoopSafeQueueHandler):
+            root.removeHandler(handler)
+    root.propagate = True
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
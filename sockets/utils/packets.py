@@ -0,0 +1,152 @@
+"""
+Pre-encoded packet cache for Live Quiz Socket.IO Server
+
+Encodes identical broadcasts (the same question shown in many rooms) once
+and reuses the ready-to-send packets.
+"""
+
+import asyncio
+from collections import OrderedDict
+from importlib.metadata import version
+from typing import Any, Callable, Hashable, Union
+
+from engineio import packet as eio_packet
+from socketio import packet
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+
+def require_socketio_internals(target: Any, names: tuple[str, ...], used_by: str) -> None:
+    """
+    Fail at startup if python-socketio lacks private methods we rely on.
+
+    They are not part of the public API, so requirements.txt caps the
+    python-socketio version at the newest one tested.
+
+    Args:
+        target: Server instance or class expected to have the methods
+        names: Method names
+        used_by: What needs them, for the error message
+
+    Raises:
+        RuntimeError: If any method is missing
+    """
+    missing = [name for name in names if not callable(getattr(target, name, None))]
+    if missing:
+        raise RuntimeError(
+            f"{used_by} needs {', '.join(missing)}, which python-socketio "
+            f"{version('python-socketio')} does not provide; install the version "
+            "range pinned in requirements.txt"
+        )
+
+
+class PacketCache:
+    """
+    LRU of encoded Socket.IO event packets.
+
+    Each entry remembers the source data it was built from (e.g. a question
+    from a session's snapshot) and is only reused while the caller passes
+    the same, or an equal, source. A topic edit produces a new snapshot, so
+    stale packets are replaced on the next lookup without explicit
+    invalidation.
+
+    Packets are encoded with the server's packet_class, so a custom
+    serializer applies to cached packets too. Sending goes through the
+    server's private _send_eio_packet, the method python-socketio's own
+    room emits use; its presence is checked here.
+    """
+
+    def __init__(self, server: Any, namespace: str = "/", max_entries: int = 1024):
+        require_socketio_internals(server, ("_send_eio_packet",), "PacketCache")
+        self.server = server
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Any, list[eio_packet.Packet]]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        key: Hashable,
+        source: Any,
+        event: str,
+        build: Callable[[], Any],
+    ) -> list[eio_packet.Packet]:
+        """
+        Return the encoded packets for an event, encoding them on a miss.
+
+        Args:
+            key: Cache key (e.g. (question_id, time_limit))
+            source: Data the payload is built from; a different source
+                under the same key replaces the entry
+            event: Event name
+            build: Function returning the payload
+
+        Returns:
+            Engine.IO packets ready for _send_eio_packet
+        """
+        entry = self._entries.get(key)
+        if entry is not None and (entry[0] is source or entry[0] == source):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        pkt = self.server.packet_class(
+            packet.EVENT, namespace=self.namespace, data=[event, build()]
+        )
+        encoded = pkt.encode()
+        if not isinstance(encoded, list):
+            encoded = [encoded]
+        packets = [eio_packet.Packet(eio_packet.MESSAGE, p) for p in encoded]
+
+        self._entries[key] = (source, packets)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return packets
+
+    async def emit(
+        self,
+        key: Hashable,
+        source: Any,
+        event: str,
+        build: Callable[[], Any],
+        room: Union[str, list[str]],
+    ) -> None:
+        """
+        Send a cached event to every socket in a room (or list of rooms).
+
+        Pub/sub managers (Redis) have to publish the payload itself to reach
+        other nodes, so they fall back to a regular emit.
+
+        Args:
+            key: Cache key
+            source: Data the payload is built from
+            event: Event name
+            build: Function returning the payload
+            room: Room name or list of room names (recipients deduplicated)
+        """
+        if isinstance(self.server.manager, AsyncPubSubManager):
+            await self.server.emit(event, build(), room=room, namespace=self.namespace)
+            return
+
+        packets = self.get(key, source, event, build)
+        count_emit = getattr(self.server, "count_emit", None)
+        if count_emit is not None:
+            count_emit(event)
+        tasks = [
+            asyncio.create_task(self.server._send_eio_packet(eio_sid, p))
+            for _, eio_sid in self.server.manager.get_participants(self.namespace, room)
+            for p in packets
+        ]
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters for monitoring."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,251 @@
+"""
+Deadline scheduler for Live Quiz Socket.IO Server
+
+Drives every question deadline from a single asyncio task instead of one
+sleeping task per session.
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from .logs import get_logger
+
+log = get_logger("TIMER")
+
+
+@dataclass
+class _Timer:
+    """A scheduled deadline. `seq` identifies its live heap entry."""
+    key: str
+    when: float  # loop.time() of the deadline
+    seq: int
+    callback: Callable[[str], Awaitable[None]]
+    remaining: Optional[float] = None  # set while paused
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of deadlines keyed by an ID (the session ID for questions).
+
+    Cancelled, paused, extended and replaced timers leave their old heap
+    entry behind; entries
+    whose sequence number no longer matches the live timer are skipped when
+    they reach the top. When a deadline passes, its callback is started in
+    its own task so a slow callback never delays other deadlines. The
+    scheduler holds on to running callback tasks, by key, until they
+    finish, so cancel() also stops a callback that has already started.
+
+    Lateness (how long after its deadline a callback was started) is kept
+    for the last LATENESS_SAMPLES firings and reported by stats(), and
+    passed to `on_lateness` (seconds) if given.
+    """
+
+    LATENESS_SAMPLES = 1024
+
+    def __init__(self, on_lateness: Optional[Callable[[float], None]] = None) -> None:
+        self._timers: dict[str, _Timer] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: dict[str, set[asyncio.Task]] = {}  # key -> callbacks in flight
+        self._lateness: deque[float] = deque(maxlen=self.LATENESS_SAMPLES)
+        self._on_lateness = on_lateness
+        self.fired = 0
+
+    # ------------------------------------------------------------------ API
+
+    def schedule(
+        self,
+        key: str,
+        delay: float,
+        callback: Callable[[str], Awaitable[None]],
+    ) -> None:
+        """
+        Call `callback(key)` after `delay` seconds, replacing any timer for key.
+
+        Must be called from a running event loop.
+
+        Args:
+            key: Timer ID
+            delay: Seconds until the deadline
+            callback: Coroutine function started when the deadline passes
+        """
+        loop = asyncio.get_running_loop()
+        self._push(_Timer(key, loop.time() + delay, 0, callback))
+        self._ensure_running(loop)
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancel a timer, and its callback if the deadline already passed.
+
+        A callback calling cancel() for its own key is not cancelled.
+
+        Returns:
+            True if a timer or a running callback was cancelled
+        """
+        # The heap entry becomes stale and is dropped when it reaches the top
+        cancelled = self._timers.pop(key, None) is not None
+        tasks = self._running.get(key)
+        if tasks:
+            current = asyncio.current_task()
+            for task in tasks:
+                if task is not current and not task.done():
+                    task.cancel()
+                    cancelled = True
+        return cancelled
+
+    def pause(self, key: str) -> Optional[float]:
+        """
+        Stop a timer's clock, keeping the time that was left.
+
+        Returns:
+            Seconds remaining, or None if no running timer for key
+        """
+        timer = self._timers.get(key)
+        if timer is None or timer.remaining is not None:
+            return None
+
+        timer.remaining = max(0.0, timer.when - asyncio.get_running_loop().time())
+        timer.seq = -1  # orphan the heap entry
+        return timer.remaining
+
+    def resume(self, key: str) -> bool:
+        """
+        Restart a paused timer with the time it had left.
+
+        Returns:
+            True if a paused timer was resumed
+        """
+        timer = self._timers.get(key)
+        if timer is None or timer.remaining is None:
+            return False
+
+        loop = asyncio.get_running_loop()
+        timer.when = loop.time() + timer.remaining
+        timer.remaining = None
+        self._push(timer)
+        self._ensure_running(loop)
+        return True
+
+    def extend(self, key: str, seconds: float) -> bool:
+        """
+        Move a timer's deadline by `seconds` (negative values shorten it).
+
+        Returns:
+            True if a timer was found
+        """
+        timer = self._timers.get(key)
+        if timer is None:
+            return False
+
+        if timer.remaining is not None:
+            timer.remaining = max(0.0, timer.remaining + seconds)
+        else:
+            timer.when += seconds
+            self._push(timer)
+        return True
+
+    def remaining(self, key: str) -> Optional[float]:
+        """Seconds until a timer fires, or None if there is no timer."""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        if timer.remaining is not None:
+            return timer.remaining
+        return max(0.0, timer.when - asyncio.get_running_loop().time())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._timers
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Scheduler counters and lateness of recent firings in milliseconds.
+
+        Returns:
+            {"active", "paused", "running", "fired", "lateness_ms": {"mean", "p99", "max"}}
+        """
+        samples = sorted(self._lateness)
+        lateness = {"mean": 0.0, "p99": 0.0, "max": 0.0}
+        if samples:
+            lateness = {
+                "mean": sum(samples) / len(samples) * 1000,
+                "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+                "max": samples[-1] * 1000,
+            }
+
+        return {
+            "active": len(self._timers),
+            "paused": sum(1 for timer in self._timers.values() if timer.remaining is not None),
+            "running": sum(len(tasks) for tasks in self._running.values()),
+            "fired": self.fired,
+            "lateness_ms": lateness,
+        }
+
+    # ------------------------------------------------------------ internals
+
+    def _push(self, timer: _Timer) -> None:
+        timer.seq = next(self._seq)
+        self._timers[timer.key] = timer
+        heapq.heappush(self._heap, (timer.when, timer.seq, timer.key))
+        if self._heap[0][1] == timer.seq:
+            # New earliest deadline: let the loop re-arm its sleep
+            self._wakeup.set()
+
+    def _ensure_running(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # (Re)start on this loop; an Event is bound to the loop that first waits on it
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            timeout = None
+
+            while self._heap:
+                when, seq, key = self._heap[0]
+                timer = self._timers.get(key)
+                if timer is None or timer.seq != seq:
+                    heapq.heappop(self._heap)
+                    continue
+
+                now = loop.time()
+                if when > now:
+                    timeout = when - now
+                    break
+
+                heapq.heappop(self._heap)
+                del self._timers[key]
+                self._lateness.append(now - when)
+                if self._on_lateness is not None:
+                    self._on_lateness(now - when)
+                self.fired += 1
+                task = loop.create_task(self._fire(timer))
+                self._running.setdefault(key, set()).add(task)
+                task.add_done_callback(functools.partial(self._finished, key))
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        tasks = self._running.get(key)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del self._running[key]
+
+    @staticmethod
+    async def _fire(timer: _Timer) -> None:
+        try:
+            await timer.callback(timer.key)
+        except Exception as e:
+            log.error("Callback for %s failed: %s", timer.key, e)
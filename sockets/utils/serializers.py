@@ -0,0 +1,36 @@
+"""
+Wire encoding for Live Quiz Socket.IO Server
+
+Selects the Socket.IO packet serializer from settings. Clients have to use
+the matching parser, so the choice is made per deployment.
+"""
+
+from typing import Any
+
+# Supported LIVE_SOCKET_SERIALIZER values
+SERIALIZERS = ("default", "msgpack")
+
+
+def build_serializer(name: str) -> Any:
+    """
+    Resolve a serializer name for socketio.AsyncServer(serializer=...).
+
+    Args:
+        name: "default" (JSON text frames) or "msgpack" (binary frames)
+
+    Returns:
+        The value to pass as the server's `serializer` argument
+    """
+    if name == "default":
+        return "default"
+    if name == "msgpack":
+        try:
+            from socketio.msgpack_packet import MsgPackPacket
+        except ImportError as e:
+            raise RuntimeError(
+                "The msgpack serializer requires the 'msgpack' package (pip install msgpack)"
+            ) from e
+        return MsgPackPacket
+    raise ValueError(
+        f"Unsupported socket serializer: {name} (expected one of {', '.join(SERIALIZERS)})"
+    )
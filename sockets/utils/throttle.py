@@ -0,0 +1,96 @@
+"""
+Per-key throttling for Live Quiz Socket.IO Server
+
+Coalesces bursts of updates (student joins, answers) into at most one
+flush per interval for each session.
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+
+from .logs import get_logger
+
+log = get_logger("THROTTLE")
+
+
+class Throttle:
+    """
+    Run `callback(key)` at most once every `interval` seconds per key.
+
+    touch() marks a key as changed. The first touch after a quiet period
+    flushes on the next loop iteration (so changes made in the same handler
+    are sent together); touches during the following `interval` seconds are
+    folded into one trailing flush. The callback reads the latest state
+    itself, so nothing is lost by coalescing.
+    """
+
+    def __init__(self, interval: float, callback: Callable[[str], Awaitable[None]]):
+        self.interval = interval
+        self.callback = callback
+        self._pending: dict[str, asyncio.TimerHandle] = {}
+        self._last: dict[str, float] = {}  # key -> loop.time() of the last flush
+        self._running: set[asyncio.Task] = set()  # flushes in flight
+
+    def touch(self, key: str) -> None:
+        """
+        Schedule a flush for key unless one is already pending.
+
+        Must be called from a running event loop.
+        """
+        if key in self._pending:
+            return
+        loop = asyncio.get_running_loop()
+        last = self._last.get(key)
+        delay = 0.0 if last is None else max(0.0, last + self.interval - loop.time())
+        self._pending[key] = loop.call_later(delay, self._fire, key)
+
+    async def flush(self, key: str) -> bool:
+        """
+        Run a pending flush for key now.
+
+        Returns:
+            True if a flush was pending
+        """
+        handle = self._pending.pop(key, None)
+        if handle is None:
+            return False
+        handle.cancel()
+        self._last[key] = asyncio.get_running_loop().time()
+        await self._run(key)
+        return True
+
+    def cancel(self, key: str) -> bool:
+        """
+        Drop a pending flush for key without running it.
+
+        Returns:
+            True if a flush was pending
+        """
+        handle = self._pending.pop(key, None)
+        if handle is None:
+            return False
+        handle.cancel()
+        return True
+
+    def discard(self, key: str) -> None:
+        """Forget a key entirely (e.g. when its session is deleted)."""
+        self.cancel(key)
+        self._last.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._pending
+
+    def _fire(self, key: str) -> None:
+        self._pending.pop(key, None)
+        loop = asyncio.get_running_loop()
+        self._last[key] = loop.time()
+        # The loop only keeps weak references to tasks
+        task = loop.create_task(self._run(key))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: str) -> None:
+        try:
+            await self.callback(key)
+        except Exception as e:
+            log.error("Flush for %s failed: %s", key, e)